@@ -3,4 +3,4 @@ from flask import Blueprint
 
 api_bp = Blueprint('api', __name__, url_prefix='/api/v1')
 
-from . import routes, auth, analytics, scraping, health
+from . import routes, auth, analytics, scraping, health, backfill
@@ -7,7 +7,7 @@ from datetime import datetime, timedelta
 from sqlalchemy import func
 from . import api_bp
 from core.extensions import db, cache
-from models import Review  # Import from models package
+from models import Review, ShadowReport  # Import from models package
 from utils.decorators import handle_errors
 import logging
 
@@ -26,10 +26,12 @@ def get_dashboard_analytics():
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days)
     
-    # Get reviews in date range
-    reviews = Review.query.filter(
-        Review.created_at >= start_date
-    ).all()
+    # Get reviews in date range, optionally from one model version
+    query = Review.query.filter(Review.created_at >= start_date)
+    model_version = request.args.get('model_version')
+    if model_version:
+        query = query.filter_by(model_version=model_version)
+    reviews = query.all()
     
     # Calculate statistics
     total_reviews = len(reviews)
@@ -50,6 +52,12 @@ def get_dashboard_analytics():
         if review.source:
             source_counts[review.source] = source_counts.get(review.source, 0) + 1
     
+    # Model version distribution
+    model_version_counts = {}
+    for review in reviews:
+        version = review.model_version or 'unknown'
+        model_version_counts[version] = model_version_counts.get(version, 0) + 1
+    
     # Trend data
     trend_data = []
     for i in range(days):
@@ -81,6 +89,7 @@ def get_dashboard_analytics():
         'sentiment_distribution': sentiment_counts,
         'emotion_distribution': emotion_counts,
         'source_distribution': source_counts,
+        'model_version_distribution': model_version_counts,
         'trend_data': trend_data,
         'satisfaction_score': satisfaction_score,
         'avg_confidence': avg_confidence,
@@ -100,6 +109,7 @@ def get_sentiment_trends():
     """Get detailed sentiment trends"""
     days = request.args.get('days', 30, type=int)
     source = request.args.get('source')
+    model_version = request.args.get('model_version')
     
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days)
@@ -107,6 +117,8 @@ def get_sentiment_trends():
     query = Review.query.filter(Review.created_at >= start_date)
     if source:
         query = query.filter_by(source=source)
+    if model_version:
+        query = query.filter_by(model_version=model_version)
     
     reviews = query.all()
     
@@ -179,7 +191,7 @@ def export_analytics():
         # Header
         writer.writerow([
             'ID', 'Date', 'Text', 'Sentiment', 'Emotion',
-            'Confidence', 'Source'
+            'Confidence', 'Source', 'Model Version'
         ])
         
         # Data
@@ -191,7 +203,8 @@ def export_analytics():
                 review.sentiment,
                 review.emotion,
                 review.confidence,
-                review.source or 'manual'
+                review.source or 'manual',
+                review.model_version or ''
             ])
         
         output.seek(0)
@@ -215,14 +228,18 @@ def export_analytics():
 def compare_sources():
     """Compare sentiment across different sources"""
     days = request.args.get('days', 30, type=int)
+    model_version = request.args.get('model_version')
     
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days)
     
-    reviews = Review.query.filter(
+    query = Review.query.filter(
         Review.created_at >= start_date,
         Review.source.isnot(None)
-    ).all()
+    )
+    if model_version:
+        query = query.filter_by(model_version=model_version)
+    reviews = query.all()
     
     # Group by source
     sources = {}
@@ -263,3 +280,60 @@ def compare_sources():
         'total_sources': len(comparison),
         'date_range': f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
     }), 200
+
+
+@api_bp.route('/analytics/shadow-report', methods=['GET'])
+@jwt_required(optional=True)
+@handle_errors
+def get_shadow_report():
+    """Agreement and latency of shadow-scored candidate models"""
+    days = request.args.get('days', 7, type=int)
+    candidate_version = request.args.get('candidate_version')
+    
+    start_date = datetime.utcnow() - timedelta(days=days)
+    query = ShadowReport.query.filter(ShadowReport.window_end >= start_date)
+    if candidate_version:
+        query = query.filter_by(candidate_version=candidate_version)
+    rows = query.order_by(ShadowReport.window_end).all()
+    
+    # Totals per candidate/primary pair; latencies weighted by texts
+    pairs = {}
+    for row in rows:
+        key = (row.candidate_version, row.primary_version)
+        if key not in pairs:
+            pairs[key] = {
+                'texts': 0, 'sentiment_compared': 0, 'sentiment_agreements': 0,
+                'emotion_compared': 0, 'emotion_agreements': 0,
+                'primary_latency': 0.0, 'candidate_latency': 0.0, 'dropped': 0, 'errors': 0
+            }
+        totals = pairs[key]
+        for field in ('texts', 'sentiment_compared', 'sentiment_agreements',
+                      'emotion_compared', 'emotion_agreements', 'dropped', 'errors'):
+            totals[field] += getattr(row, field) or 0
+        totals['primary_latency'] += (row.primary_latency_ms or 0) * (row.texts or 0)
+        totals['candidate_latency'] += (row.candidate_latency_ms or 0) * (row.texts or 0)
+    
+    summary = []
+    for (candidate, primary), totals in pairs.items():
+        texts = totals['texts']
+        summary.append({
+            'candidate_version': candidate,
+            'primary_version': primary,
+            'texts': texts,
+            'sentiment_agreement': round(
+                totals['sentiment_agreements'] / totals['sentiment_compared'], 4
+            ) if totals['sentiment_compared'] else None,
+            'emotion_agreement': round(
+                totals['emotion_agreements'] / totals['emotion_compared'], 4
+            ) if totals['emotion_compared'] else None,
+            'primary_latency_ms': round(totals['primary_latency'] / texts, 3) if texts else None,
+            'candidate_latency_ms': round(totals['candidate_latency'] / texts, 3) if texts else None,
+            'dropped': totals['dropped'],
+            'errors': totals['errors']
+        })
+    
+    return jsonify({
+        'summary': summary,
+        'windows': [row.to_dict() for row in rows],
+        'days': days
+    }), 200
@@ -0,0 +1,71 @@
+"""
+Re-scoring backfill endpoints (admin only)
+"""
+from flask import request, jsonify
+from flask_jwt_extended import jwt_required
+from . import api_bp
+from config import get_config
+from models.model_registry import ModelRegistry
+from services.backfill import plan_backfill, start_job, cancel_job, job_progress, BackfillConflict
+from tasks.backfill_tasks import start_backfill_task
+from utils.decorators import handle_errors, admin_required
+import logging
+
+logger = logging.getLogger(__name__)
+
+@api_bp.route('/backfill', methods=['POST'])
+@jwt_required()
+@admin_required
+@handle_errors
+def start_backfill():
+    """Re-score stored reviews with a model version (default: the current one)"""
+    data = request.get_json() or {}
+    config = get_config()
+    
+    model_version = data.get('model_version') or ModelRegistry(config.MODEL_REGISTRY_DIR).current_version()
+    job = plan_backfill(
+        model_version,
+        range_size=int(data.get('range_size', config.BACKFILL_RANGE_SIZE)),
+        chunk_size=int(data.get('chunk_size', config.BACKFILL_CHUNK_SIZE)),
+        parallelism=int(data.get('parallelism', config.BACKFILL_PARALLELISM)),
+        write_rate=float(data.get('write_rate', config.BACKFILL_WRITE_RATE))
+    )
+    if job.status != 'completed':
+        start_job(job.id)
+        start_backfill_task.delay(job.id)
+    
+    logger.info(f"Backfill {job.id} requested for model version {model_version}")
+    return jsonify(job_progress(job.id)), 202
+
+
+@api_bp.route('/backfill/<int:job_id>', methods=['GET'])
+@jwt_required()
+@admin_required
+@handle_errors
+def get_backfill_status(job_id):
+    """Progress and ETA of a backfill job"""
+    return jsonify(job_progress(job_id)), 200
+
+
+@api_bp.route('/backfill/<int:job_id>/resume', methods=['POST'])
+@jwt_required()
+@admin_required
+@handle_errors
+def resume_backfill(job_id):
+    """Restart the lanes of a failed or cancelled job, or of one whose lanes died"""
+    try:
+        start_job(job_id)  # Unknown or completed job: 400
+    except BackfillConflict as e:
+        return jsonify({'error': str(e), **job_progress(job_id)}), 409
+    start_backfill_task.delay(job_id)
+    return jsonify(job_progress(job_id)), 202
+
+
+@api_bp.route('/backfill/<int:job_id>/cancel', methods=['POST'])
+@jwt_required()
+@admin_required
+@handle_errors
+def cancel_backfill(job_id):
+    """Stop a job; lanes stop after their current chunk"""
+    cancel_job(job_id)
+    return jsonify(job_progress(job_id)), 200
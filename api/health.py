@@ -20,6 +20,23 @@ def health_check():
     }), 200
 
 
+@api_bp.route('/health/ready', methods=['GET'])
+def readiness_check():
+    """Readiness check - 503 until the models are loaded and warm"""
+    from services.sentiment_service import get_sentiment_service
+    
+    if get_sentiment_service().ready:
+        return jsonify({
+            'status': 'ready',
+            'timestamp': datetime.utcnow().isoformat()
+        }), 200
+    
+    return jsonify({
+        'status': 'warming',
+        'timestamp': datetime.utcnow().isoformat()
+    }), 503
+
+
 @api_bp.route('/health/detailed', methods=['GET'])
 def detailed_health_check():
     """Detailed health check with dependencies"""
@@ -85,6 +102,29 @@ def detailed_health_check():
         }
         logger.warning(f"Celery health check failed: {e}")
     
+    # Check model versions (a failed swap keeps serving the previous version)
+    try:
+        from services.sentiment_service import get_sentiment_service
+        models = get_sentiment_service().models.status()
+        health_status['checks']['models'] = {
+            'status': 'degraded' if models['last_error'] else 'healthy',
+            **models
+        }
+    except Exception as e:
+        health_status['checks']['models'] = {
+            'status': 'degraded',
+            'message': f'Model registry unavailable: {str(e)}'
+        }
+        logger.warning(f"Model health check failed: {e}")
+    
+    # Inference threads of this worker (core/thread_budget.py)
+    from core.thread_budget import get_thread_budget
+    budget = get_thread_budget()
+    health_status['checks']['thread_budget'] = {
+        'status': 'degraded' if budget.get('oversubscribed') else 'healthy',
+        **budget
+    }
+    
     status_code = 200 if health_status['status'] == 'healthy' else 503
     return jsonify(health_status), status_code
 
@@ -94,6 +134,22 @@ def get_app_metrics():
     """Get application metrics"""
     metrics = get_metrics()
     
+    from services.sentiment_service import get_sentiment_service
+    service = get_sentiment_service()
+    metrics['inference']['in_flight'] = service.admission.in_flight
+    metrics['inference']['admission_load'] = service.admission.load
+    if service.shadow:
+        metrics['shadow'] = service.shadow.status()
+    elif service.client:
+        try:
+            daemon = service.client.status()
+        except Exception as e:
+            logger.warning(f"Could not get inference daemon status: {e}")
+        else:
+            metrics['inference']['daemon_queue_depth'] = daemon['queue_depth']
+            if daemon['shadow']:
+                metrics['shadow'] = daemon['shadow']
+    
     # Add database metrics
     try:
         from models import Review, User
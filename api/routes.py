@@ -6,13 +6,15 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from . import api_bp
 from core.extensions import db, cache, limiter
 from models import Review  # Import from models package
-from services.sentiment_service import SentimentService
-from utils.validators import validate_text_input
+from services.sentiment_service import get_sentiment_service
+from models.sentiment_model import OUTPUTS, normalize_outputs
+from services.admission import ServiceOverloaded
+from utils.validators import validate_text_input, validate_latency_budget
 from utils.decorators import handle_errors
 import logging
 
 logger = logging.getLogger(__name__)
-sentiment_service = SentimentService()
+sentiment_service = get_sentiment_service()
 
 @api_bp.route('/analyze', methods=['POST'])
 @limiter.limit("20 per minute")
@@ -30,31 +32,52 @@ def analyze_text():
     text = data.get('text')
     user_id = get_jwt_identity() if get_jwt_identity() else None
     
+    max_latency_ms = data.get('max_latency_ms')
+    is_valid, error = validate_latency_budget(max_latency_ms)
+    if not is_valid:
+        return jsonify({'error': error}), 400
+    
+    # Requested heads; an unknown name raises ValueError (400)
+    outputs = normalize_outputs(data.get('outputs'))
+    compact = bool(data.get('compact', False))
+    backend = sentiment_service.resolve_backend(data.get('backend'))
+    
     # Check cache
-    cache_key = f"sentiment:{hash(text)}"
+    cache_key = sentiment_service.cache_key(text, outputs, compact, backend)
     cached_result = cache.get(cache_key)
     if cached_result:
         logger.info(f"Cache hit for text analysis")
         return jsonify(cached_result)
     
     # Analyze
-    result = sentiment_service.analyze(text)
-    
-    # Save to database
-    review = Review(
-        text=text,
-        sentiment=result['sentiment'],
-        emotion=result['emotion'],
-        confidence=result['confidence'],
-        user_id=user_id
-    )
-    db.session.add(review)
-    db.session.commit()
-    
-    # Cache result
-    cache.set(cache_key, result, timeout=3600)
-    
-    logger.info(f"Text analyzed - Sentiment: {result['sentiment']}, Emotion: {result['emotion']}")
+    try:
+        result = sentiment_service.analyze(
+            text, max_latency_ms=max_latency_ms, outputs=outputs, compact=compact, backend=backend
+        )
+    except ServiceOverloaded as e:
+        logger.warning(f"Analyze request shed: {e}")
+        response = jsonify({'error': 'Service overloaded. Please try again later.'})
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response, 503
+    
+    # Save to database (a review needs both sentiment and emotion)
+    if outputs == OUTPUTS:
+        review = Review(
+            text=text,
+            sentiment=result['sentiment'],
+            emotion=result['emotion'],
+            confidence=result['confidence'],
+            model_version=result.get('model_version'),
+            user_id=user_id
+        )
+        db.session.add(review)
+        db.session.commit()
+    
+    # Cache result (degraded or over-budget answers are not worth keeping)
+    if not (result.get('degraded') or result.get('budget_exceeded')):
+        cache.set(cache_key, result, timeout=3600)
+    
+    logger.info(f"Text analyzed - Sentiment: {result.get('sentiment')}, Emotion: {result.get('emotion')}")
     
     return jsonify(result), 200
 
@@ -11,7 +11,6 @@ They will be added later when requested.
 """
 
 import os
-import re
 import logging
 import hashlib
 from datetime import datetime
@@ -20,6 +19,7 @@ from functools import wraps
 from flask import Flask, render_template, request, jsonify, send_from_directory, session, redirect, url_for
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
+from utils.text_preprocessing import clean_lexicon_text
 
 # Configure logging
 logging.basicConfig(
@@ -100,6 +100,19 @@ class Review(db.Model):
 # LIGHTWEIGHT ML MODEL (Keyword-Based)
 # ============================================================================
 
+# Byte translation for batch tokenizing: keeps [a-z0-9] and the NUL text
+# separator, turns everything else into a space
+BATCH_TOKEN_TABLE = bytes(
+    c if chr(c) in 'abcdefghijklmnopqrstuvwxyz0123456789\0' else ord(' ')
+    for c in range(256)
+)
+
+# Tokens are compared as their first 16 bytes packed into two integers
+BATCH_KEY_BYTES = 16
+
+# Texts scored per vectorized pass; bounds the temporary arrays
+BATCH_CHUNK_SIZE = 65536
+
 class SimpleSentimentAnalyzer:
     """Lightweight sentiment analyzer using keyword-based approach"""
     
@@ -129,16 +142,13 @@ class SimpleSentimentAnalyzer:
             'fear': {'scared', 'afraid', 'worried', 'nervous', 'anxious', 'terrified'},
             'love': {'love', 'adore', 'cherish', 'treasure', 'passionate'}
         }
+        
+        self._batch_lexicon = None
     
     def preprocess_text(self, text):
         """Clean and normalize text"""
-        # Convert to lowercase
-        text = text.lower()
-        # Remove special characters but keep spaces
-        text = re.sub(r'[^a-z0-9\s]', ' ', text)
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-        return text
+        # Lowercase, non-alphanumerics to spaces, collapse whitespace
+        return clean_lexicon_text(text)
     
     def analyze(self, text):
         """Analyze sentiment and emotion of text"""
@@ -185,6 +195,134 @@ class SimpleSentimentAnalyzer:
             'emotion': emotion,
             'confidence': confidence
         }
+    
+    @staticmethod
+    def _tokenize_buffer(buffer):
+        """Token start offsets and packed bytes of a cleaned byte buffer
+        
+        Tokens are runs of bytes other than space and NUL. The first 16
+        bytes of each token are packed into two uint64 rows (shape 2 x n);
+        longer tokens are dropped, since no keyword is that long.
+        """
+        import numpy as np
+        
+        chars = np.frombuffer(buffer, dtype=np.uint8)
+        is_word = ((chars != 32) & (chars != 0)).astype(np.int8)
+        
+        # Word/non-word transitions alternate: token start, token end, ...
+        edges = np.flatnonzero(np.diff(is_word, prepend=0, append=0))
+        starts = edges[0::2]
+        lengths = edges[1::2] - starts
+        
+        fits = lengths <= BATCH_KEY_BYTES
+        starts, lengths = starts[fits], lengths[fits]
+        
+        # Copy the 16 bytes at each token start, mask off what lies past its end
+        padded = np.concatenate([chars, np.zeros(BATCH_KEY_BYTES, dtype=np.uint8)])
+        windows = np.lib.stride_tricks.sliding_window_view(padded, BATCH_KEY_BYTES)[starts]
+        masks = np.where(np.arange(BATCH_KEY_BYTES) < np.arange(BATCH_KEY_BYTES + 1)[:, None], 0xFF, 0)
+        masks = masks.astype(np.uint8)
+        packed = windows.view(np.uint64) & masks.view(np.uint64)[lengths]
+        return starts, packed.T
+    
+    @staticmethod
+    def _token_keys(packed):
+        import numpy as np
+        return packed[0] ^ (packed[1] * np.uint64(0x9E3779B97F4A7C15))
+    
+    def _build_batch_lexicon(self):
+        """Sorted keyword keys, their packed bytes and category membership"""
+        import numpy as np
+        
+        categories = [self.positive_words, self.negative_words, *self.emotion_keywords.values()]
+        vocabulary = sorted(set().union(*categories))
+        if max(map(len, vocabulary)) > BATCH_KEY_BYTES:
+            raise ValueError(f"Keywords longer than {BATCH_KEY_BYTES} characters are not supported")
+        
+        _, packed = self._tokenize_buffer(' '.join(vocabulary).encode('ascii'))
+        keys = self._token_keys(packed)
+        if len(np.unique(keys)) != len(keys):
+            raise ValueError("Keyword keys collide; batch lookup would be ambiguous")
+        order = np.argsort(keys)
+        
+        index = {word: i for i, word in enumerate(vocabulary)}
+        membership = np.zeros((len(vocabulary), len(categories)), dtype=np.int32)
+        for column, words in enumerate(categories):
+            membership[[index[word] for word in words], column] = 1
+        return keys[order], packed[:, order], membership[order]
+    
+    def analyze_batch(self, texts):
+        """Analyze many texts at once, as a columnar BatchResult
+        
+        Each chunk of texts is cleaned and tokenized as one byte buffer
+        with NumPy, turned into a binary sparse document-term matrix over
+        the lexicon vocabulary, and multiplied by the keyword membership
+        matrix to get every positive, negative and emotion count in one
+        product. Needs NumPy and SciPy; ``batch_analyze`` works without.
+        """
+        import numpy as np
+        from scipy import sparse
+        from utils.batch_result import BatchResult
+        
+        if self._batch_lexicon is None:
+            self._batch_lexicon = self._build_batch_lexicon()
+        
+        result = BatchResult(len(texts), ('sentiment', 'emotion'), emotion_labels=tuple(self.emotion_keywords))
+        result.scored[:] = True
+        for offset in range(0, len(texts), BATCH_CHUNK_SIZE):
+            rows = slice(offset, offset + BATCH_CHUNK_SIZE)
+            self._analyze_chunk(texts[rows], result, rows, np, sparse)
+        return result
+    
+    def batch_analyze(self, texts):
+        """Same results as analyze() per text, vectorized when NumPy/SciPy are installed"""
+        try:
+            return self.analyze_batch(texts).to_dicts(compact=True)
+        except ImportError:
+            return [self.analyze(text) for text in texts]
+    
+    def _analyze_chunk(self, texts, result, rows, np, sparse):
+        vocab_keys, vocab_packed, membership = self._batch_lexicon
+        
+        # Same cleaning as preprocess_text(): after lowercasing, anything
+        # outside [a-z0-9] separates tokens. NUL marks text boundaries.
+        joined = '\0'.join((text or '').replace('\0', ' ') for text in texts).lower()
+        buffer = joined.encode('ascii', 'replace').translate(BATCH_TOKEN_TABLE)
+        starts, packed = self._tokenize_buffer(buffer)
+        
+        # Row of a token = number of text boundaries before it
+        boundaries = np.flatnonzero(np.frombuffer(buffer, dtype=np.uint8) == 0)
+        token_rows = np.searchsorted(boundaries, starts)
+        
+        cols = np.searchsorted(vocab_keys, self._token_keys(packed))
+        cols = np.minimum(cols, len(vocab_keys) - 1)
+        known = (vocab_packed[0, cols] == packed[0]) & (vocab_packed[1, cols] == packed[1])
+        
+        matrix = sparse.csr_matrix(
+            (np.ones(known.sum(), dtype=np.int32), (token_rows[known], cols[known])),
+            shape=(len(texts), len(vocab_keys))
+        )
+        # Keywords count once per text, like the set intersection in analyze()
+        matrix.data[:] = 1
+        counts = matrix @ membership
+        
+        # Codes index ('negative', 'neutral', 'positive')
+        diff = counts[:, 0] - counts[:, 1]
+        sentiment_codes = np.sign(diff) + 1
+        confidences = np.where(diff == 0, 0.5, np.minimum(0.95, 0.6 + np.abs(diff) * 0.1))
+        
+        emotion_counts = counts[:, 2:]
+        emotion_codes = np.where(emotion_counts.max(axis=1) > 0, emotion_counts.argmax(axis=1), -1)
+        
+        too_short = np.array([not text or len(text.strip()) < 5 for text in texts], dtype=bool)
+        sentiment_codes[too_short] = 1
+        confidences[too_short] = 0.5
+        emotion_codes[too_short] = -1
+        
+        result.sentiment_codes[rows] = sentiment_codes
+        result.confidences[rows] = confidences
+        result.emotion_codes[rows] = emotion_codes
+        result.emotion_scores[rows] = emotion_counts
 
 # ============================================================================
 # SIMPLE WEB SCRAPER
@@ -521,20 +659,24 @@ def scrape_reviews_endpoint():
         if not reviews_text:
             return jsonify({'error': 'No reviews found at this URL'}), 404
         
-        # Analyze each review
+        # Skip reviews already stored or repeated on the page
+        new_texts = []
+        seen = set()
+        duplicate_count = 0
+        for text in reviews_text:
+            text_hash = generate_text_hash(text)
+            if text_hash in seen or is_duplicate(text):
+                duplicate_count += 1
+                continue
+            seen.add(text_hash)
+            new_texts.append(text)
+        
+        # Analyze the new reviews in one batch
         results = []
         saved_count = 0
-        duplicate_count = 0
         
-        for text in reviews_text:
+        for text, analysis in zip(new_texts, analyzer.batch_analyze(new_texts)):
             try:
-                # Check for duplicate
-                if is_duplicate(text):
-                    duplicate_count += 1
-                    continue
-                
-                analysis = analyzer.analyze(text)
-                
                 # Save to database
                 review = Review(
                     text=text,
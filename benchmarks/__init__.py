@@ -0,0 +1,13 @@
+"""
+Offline analyzer benchmarks
+
+Measures single-text latency, batch throughput, peak RSS and accuracy of
+every analyzer backend on a synthetic and a hand-labeled review corpus,
+and writes a JSON report that can be diffed against earlier runs.
+Runs on a CPU-only machine without network access: transformer targets
+use the local model store and are reported as skipped when it is empty.
+
+    python -m benchmarks --output benchmarks/results/today.json
+    python -m benchmarks --targets fallback simple --latency-texts 100
+    python -m benchmarks compare old.json new.json
+"""
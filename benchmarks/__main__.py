@@ -0,0 +1,78 @@
+"""
+Command line entry point: python -m benchmarks --help
+"""
+import os
+
+# Never reach for the network or a GPU, whatever the environment says
+os.environ['HF_HUB_OFFLINE'] = '1'
+os.environ['TRANSFORMERS_OFFLINE'] = '1'
+os.environ['CUDA_VISIBLE_DEVICES'] = ''
+
+import argparse
+import json
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.runner import DEFAULT_OPTIONS, run_benchmarks, run_target, compare_reports
+from benchmarks.targets import TARGETS
+
+def write_json(data, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+def compare(old_path, new_path):
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    for name, metric, before, after, change in compare_reports(old, new):
+        change = f"{change:+7.1f}%" if change is not None else '     n/a'
+        print(f"{name:<10} {metric:<32} {before:>12} -> {after:>12}  {change}")
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'compare':
+        parser = argparse.ArgumentParser(prog='python -m benchmarks compare',
+                                         description="Compare the metrics of two benchmark reports")
+        parser.add_argument('old')
+        parser.add_argument('new')
+        args = parser.parse_args(sys.argv[2:])
+        compare(args.old, args.new)
+        return
+
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Benchmark the analyzer backends offline")
+    parser.add_argument('--targets', nargs='+', choices=sorted(TARGETS), default=DEFAULT_OPTIONS['targets'])
+    parser.add_argument('--output', default='benchmarks/results/latest.json')
+    parser.add_argument('--seed', type=int, default=DEFAULT_OPTIONS['seed'])
+    parser.add_argument('--latency-texts', type=int, default=DEFAULT_OPTIONS['latency_texts'])
+    parser.add_argument('--throughput-texts', type=int, default=DEFAULT_OPTIONS['throughput_texts'])
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=DEFAULT_OPTIONS['batch_sizes'])
+    parser.add_argument('--accuracy-texts', type=int, default=DEFAULT_OPTIONS['accuracy_texts'])
+    parser.add_argument('--model-cache-dir', default=DEFAULT_OPTIONS['model_cache_dir'])
+    parser.add_argument('--tfidf-model-path', default=DEFAULT_OPTIONS['tfidf_model_path'])
+    parser.add_argument('--student-model-path', default=DEFAULT_OPTIONS['student_model_path'])
+    parser.add_argument('--no-isolate', action='store_true',
+                        help="Run all targets in this process (peak RSS is then cumulative)")
+    # Internal: one target per subprocess
+    parser.add_argument('--run-target', help=argparse.SUPPRESS)
+    parser.add_argument('--options-file', help=argparse.SUPPRESS)
+    parser.add_argument('--result-file', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_target:
+        with open(args.options_file) as f:
+            options = json.load(f)
+        write_json(run_target(args.run_target, options), args.result_file)
+        return
+
+    options = dict(DEFAULT_OPTIONS)
+    options.update({key: getattr(args, key) for key in DEFAULT_OPTIONS if key != 'model_batch_size'})
+    report = run_benchmarks(options, isolate=not args.no_isolate)
+    write_json(report, args.output)
+    print(f"✅ Report written to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Labeled review corpora for the benchmarks
+
+``fixture_corpus`` is a small hand-labeled set of realistic reviews
+(fixtures/labeled_reviews.jsonl). ``synthetic_corpus`` generates any
+number of reviews from labeled phrase banks: every review gets the
+sentiment and emotion of its opening phrase, padded with neutral filler.
+Most reviews are a few dozen words; a long tail of ``long_fraction``
+reviews runs roughly 600-1500 words, past WINDOW_TOKENS, so the overlapping
+window path is measured too. Both are deterministic.
+"""
+import json
+import os
+import random
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), 'fixtures', 'labeled_reviews.jsonl')
+
+# (sentiment, emotion) -> opening phrases
+PHRASES = {
+    ('positive', 'happy'): [
+        "I absolutely love this {item}, it made my week",
+        "So happy with the {item}, what a joy",
+        "We were delighted with the {item} and the friendly staff",
+        "Wonderful {item}, the whole family is thrilled",
+    ],
+    ('positive', 'satisfied'): [
+        "Good {item}, does exactly what it should",
+        "Solid {item} for a fair price, no complaints",
+        "Nice {item}, arrived on time and works fine",
+        "Reliable {item}, I am satisfied with the purchase",
+    ],
+    ('positive', 'surprised'): [
+        "Wow, I did not expect the {item} to be this amazing",
+        "Honestly surprised by how incredible the {item} is",
+        "The {item} blew me away, I was amazed",
+    ],
+    ('negative', 'angry'): [
+        "Terrible {item}, I hate everything about it",
+        "The worst {item} I have ever bought, absolutely furious",
+        "Awful {item} and the support team was rude",
+        "I am angry, the {item} broke and nobody helps",
+    ],
+    ('negative', 'sad'): [
+        "Really disappointed with the {item}, it looked better online",
+        "Sadly the {item} fell apart after a week",
+        "I was unhappy to find the {item} damaged, it was a gift",
+    ],
+    ('negative', 'anxious'): [
+        "I am worried the {item} is not safe, it gets very hot",
+        "Nervous about using the {item} again after it sparked",
+        "Concerned that the {item} keeps disconnecting at night",
+    ],
+    ('neutral', 'neutral'): [
+        "The {item} arrived on Tuesday",
+        "I bought the {item} for the office",
+        "The {item} comes in a box with a manual",
+        "Used the {item} twice so far, will update later",
+    ],
+}
+
+ITEMS = ['blender', 'hotel room', 'phone', 'jacket', 'laptop', 'restaurant', 'headphones',
+         'mattress', 'camera', 'delivery', 'coffee maker', 'car rental', 'backpack', 'printer']
+
+FILLER = [
+    "It came in a cardboard box.",
+    "I ordered it on a Monday.",
+    "The colour is dark grey.",
+    "My partner uses it as well.",
+    "We checked in around noon.",
+    "The instructions were in three languages.",
+    "It is the second one I have owned.",
+    "The store is near the train station.",
+]
+
+
+# Filler sentences of a long review (about 6 words each: 600-1500 words)
+LONG_FILLER = (100, 250)
+
+
+def synthetic_corpus(size, seed=0, max_filler=40, long_fraction=0.02):
+    """``size`` labeled reviews: dicts with text, sentiment and emotion"""
+    rng = random.Random(seed)
+    labels = sorted(PHRASES)
+    reviews = []
+    for _ in range(size):
+        sentiment, emotion = rng.choice(labels)
+        opening = rng.choice(PHRASES[(sentiment, emotion)]).format(item=rng.choice(ITEMS))
+        # Mostly short reviews, with a long tail past the window size
+        if rng.random() < long_fraction:
+            filler_count = rng.randint(*LONG_FILLER)
+        else:
+            filler_count = min(int(rng.expovariate(1 / 4)), max_filler)
+        filler = [rng.choice(FILLER) for _ in range(filler_count)]
+        text = ' '.join([opening + rng.choice(['.', '!', '!!'])] + filler)
+        reviews.append({'text': text, 'sentiment': sentiment, 'emotion': emotion})
+    return reviews
+
+
+def fixture_corpus(path=FIXTURE_PATH):
+    """The hand-labeled fixture reviews"""
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -0,0 +1,217 @@
+"""
+Measurements and the benchmark run
+
+For every target ``run_target`` records:
+
+    load_s               model load and warmup time
+    latency_ms           single-text p50 / p90 / p99 / mean over the synthetic corpus
+    throughput           texts per second of the batch path at each batch size
+    accuracy             sentiment / emotion accuracy and confusion on both corpora
+    rss_mb               RSS before loading and peak RSS of the process
+
+``run_benchmarks`` runs each target in its own subprocess, so peak RSS is
+per target and one target's threads and caches don't skew the next.
+"""
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.corpus import synthetic_corpus, fixture_corpus
+from benchmarks.targets import create_target, TargetUnavailable
+from core.monitoring import get_memory_usage_mb
+
+DEFAULT_OPTIONS = {
+    'targets': ['simple', 'fallback', 'pytorch', 'onnx', 'tfidf', 'student'],
+    'seed': 0,
+    'latency_texts': 300,
+    'throughput_texts': 2000,
+    'batch_sizes': [1, 8, 32, 128],
+    'accuracy_texts': 2000,
+    'model_cache_dir': './models/cache',
+    'model_batch_size': 32,
+    'tfidf_model_path': 'models/sentiment_tfidf_model.npz',
+    'student_model_path': 'models/sentiment_student.npz',
+}
+
+
+def percentile(sorted_values, q):
+    """Linear-interpolated percentile of already sorted values"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def measure_latency(target, texts):
+    """Single-text latency percentiles in milliseconds"""
+    timings = []
+    for text in texts:
+        start = time.perf_counter()
+        target.analyze_one(text)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        'texts': len(timings),
+        'p50': round(percentile(timings, 50), 4),
+        'p90': round(percentile(timings, 90), 4),
+        'p99': round(percentile(timings, 99), 4),
+        'mean': round(sum(timings) / len(timings), 4),
+    }
+
+
+def measure_throughput(target, texts, batch_sizes):
+    """Texts per second of the batch path, per batch size"""
+    throughput = {}
+    for batch_size in batch_sizes:
+        start = time.perf_counter()
+        for offset in range(0, len(texts), batch_size):
+            target.analyze_batch(texts[offset:offset + batch_size])
+        elapsed = time.perf_counter() - start
+        throughput[str(batch_size)] = round(len(texts) / elapsed, 1)
+    return throughput
+
+
+def measure_accuracy(target, reviews, batch_size=128):
+    """Accuracy of each head the target scores, with a gold -> predicted confusion"""
+    texts = [review['text'] for review in reviews]
+    predicted = {'sentiment': [], 'emotion': []}
+    for offset in range(0, len(texts), batch_size):
+        sentiments, emotions = target.analyze_batch(texts[offset:offset + batch_size])
+        predicted['sentiment'].extend(sentiments)
+        predicted['emotion'].extend(emotions or [])
+
+    report = {'texts': len(reviews)}
+    for head in target.outputs:
+        gold = [review[head] for review in reviews]
+        confusion = {}
+        for expected, actual in zip(gold, predicted[head]):
+            row = confusion.setdefault(expected, {})
+            row[actual] = row.get(actual, 0) + 1
+        correct = sum(expected == actual for expected, actual in zip(gold, predicted[head]))
+        report[head] = {'accuracy': round(correct / len(gold), 4), 'confusion': confusion}
+    return report
+
+
+def run_target(name, options):
+    """All measurements for one target in this process"""
+    target = create_target(name, options)
+    rss_before = get_memory_usage_mb()
+
+    start = time.perf_counter()
+    try:
+        target.load()
+    except TargetUnavailable as e:
+        return {'status': 'skipped', 'reason': str(e)}
+    load_s = time.perf_counter() - start
+
+    synthetic = synthetic_corpus(max(options['latency_texts'], options['throughput_texts'],
+                                     options['accuracy_texts']), seed=options['seed'])
+    texts = [review['text'] for review in synthetic]
+    return {
+        'status': 'ok',
+        'outputs': list(target.outputs),
+        'load_s': round(load_s, 3),
+        'latency_ms': measure_latency(target, texts[:options['latency_texts']]),
+        'throughput': measure_throughput(target, texts[:options['throughput_texts']], options['batch_sizes']),
+        'accuracy': {
+            'fixture': measure_accuracy(target, fixture_corpus()),
+            'synthetic': measure_accuracy(target, synthetic[:options['accuracy_texts']]),
+        },
+        'rss_mb': {'before_load': round(rss_before, 1), 'peak': round(peak_rss_mb(), 1)},
+    }
+
+
+def _run_target_subprocess(name, options):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        options_path = os.path.join(tmp_dir, 'options.json')
+        result_path = os.path.join(tmp_dir, 'result.json')
+        with open(options_path, 'w') as f:
+            json.dump(options, f)
+
+        process = subprocess.run(
+            [sys.executable, '-m', 'benchmarks', '--run-target', name,
+             '--options-file', options_path, '--result-file', result_path],
+            capture_output=True, text=True
+        )
+        if process.returncode != 0 or not os.path.exists(result_path):
+            last_line = (process.stderr.strip().splitlines() or ['no output'])[-1]
+            return {'status': 'failed', 'reason': last_line}
+        with open(result_path) as f:
+            return json.load(f)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(options, isolate=True, progress=print):
+    """Benchmark every target in ``options['targets']``, as one JSON-able report"""
+    results = {}
+    for name in options['targets']:
+        progress(f"⏱️  {name}...")
+        results[name] = _run_target_subprocess(name, options) if isolate else run_target(name, options)
+        status = results[name]['status']
+        progress(f"   {status}" + (f": {results[name]['reason']}" if status != 'ok' else ''))
+
+    return {
+        'meta': {
+            'created_at': datetime.utcnow().isoformat(),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'isolated': isolate,
+            'options': options,
+        },
+        'results': results,
+    }
+
+
+def _flatten(value, prefix=''):
+    """{'a': {'b': 1}} -> {'a.b': 1}, numbers only"""
+    flat = {}
+    if isinstance(value, dict):
+        for key, item in value.items():
+            flat.update(_flatten(item, f'{prefix}{key}.'))
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        flat[prefix.rstrip('.')] = value
+    return flat
+
+
+def _metrics(result):
+    """Numeric metrics of one target result; accuracy without the confusion counts"""
+    metrics = _flatten({key: value for key, value in result.items() if key != 'accuracy'})
+    for corpus, report in result.get('accuracy', {}).items():
+        for head in ('sentiment', 'emotion'):
+            if head in report:
+                metrics[f'accuracy.{corpus}.{head}'] = report[head]['accuracy']
+    return metrics
+
+
+def compare_reports(old, new):
+    """(target, metric, old, new, change %) for every numeric metric in both reports"""
+    rows = []
+    for name in sorted(set(old['results']) & set(new['results'])):
+        before, after = _metrics(old['results'][name]), _metrics(new['results'][name])
+        for metric in sorted(set(before) & set(after)):
+            change = (after[metric] - before[metric]) / before[metric] * 100 if before[metric] else None
+            rows.append((name, metric, before[metric], after[metric], change))
+    return rows
@@ -0,0 +1,177 @@
+"""
+The analyzers a benchmark run can measure
+
+Every target exposes ``analyze_one(text)`` (the single-text path callers
+use) and ``analyze_batch(texts)`` (its batch path), both returning
+sentiment and emotion labels. Emotion labels are mapped onto the API's
+categories so accuracy is comparable across targets. A target whose
+model is not available offline raises TargetUnavailable from ``load``
+rather than silently measuring the keyword fallback.
+
+    simple    app_dev.SimpleSentimentAnalyzer (keywords, dev app)
+    fallback  SentimentAnalyzer.fallback_sentiment / fallback_emotion
+    pytorch   transformer pipelines from the local model store
+    onnx      int8 ONNX exports of the same transformers
+    tfidf     exported TF-IDF model (sentiment only)
+    student   distilled hashed n-gram model
+"""
+import os
+from abc import ABC, abstractmethod
+
+from models.sentiment_model import SentimentAnalyzer, EMOTION_MAP
+from models.onnx_backend import OnnxTextClassifier
+from models.tfidf_backend import TfidfSentimentModel
+
+# SimpleSentimentAnalyzer and the raw model labels, onto the API's emotion names
+EMOTION_NAMES = {**EMOTION_MAP, 'fear': 'anxious', 'love': 'satisfied'}
+
+TARGETS = {}
+
+
+class TargetUnavailable(Exception):
+    """The target's model cannot be loaded on this machine"""
+
+
+def register_target(cls):
+    TARGETS[cls.name] = cls
+    return cls
+
+
+def create_target(name, options):
+    if name not in TARGETS:
+        raise ValueError(f"Unknown benchmark target: {name}. Choose from: {', '.join(TARGETS)}")
+    return TARGETS[name](options)
+
+
+def _emotion_names(emotions):
+    return [EMOTION_NAMES.get(emotion, emotion) for emotion in emotions]
+
+
+class Target(ABC):
+    name = None
+    # Heads the target scores; accuracy is only reported for these
+    outputs = ('sentiment', 'emotion')
+
+    def __init__(self, options):
+        self.options = options
+
+    @abstractmethod
+    def load(self):
+        """Load models and warm up; raise TargetUnavailable when the model is missing"""
+
+    def analyze_one(self, text):
+        sentiments, emotions = self.analyze_batch([text])
+        return sentiments[0], emotions[0] if emotions else None
+
+    @abstractmethod
+    def analyze_batch(self, texts):
+        """(sentiments, emotions) label lists; emotions is None for sentiment-only targets"""
+
+
+@register_target
+class SimpleTarget(Target):
+    name = 'simple'
+
+    def load(self):
+        from app_dev import SimpleSentimentAnalyzer
+        self.analyzer = SimpleSentimentAnalyzer()
+        self.analyzer.analyze_batch(['warm up'])  # Builds the batch lexicon
+
+    def analyze_one(self, text):
+        result = self.analyzer.analyze(text)
+        return result['sentiment'], EMOTION_NAMES.get(result['emotion'], result['emotion'])
+
+    def analyze_batch(self, texts):
+        result = self.analyzer.analyze_batch(texts)
+        return result.sentiments.tolist(), _emotion_names(result.emotions.tolist())
+
+
+class AnalyzerTarget(Target):
+    """A models.sentiment_model.SentimentAnalyzer on one backend"""
+    backend = None
+
+    def make_analyzer(self):
+        return SentimentAnalyzer(
+            batch_size=self.options.get('model_batch_size', 32),
+            backend=self.backend,
+            cache_dir=self.options['model_cache_dir'],
+            offline=True,
+            tfidf_model_path=self.options.get('tfidf_model_path'),
+            student_model_path=self.options.get('student_model_path')
+        )
+
+    def check(self):
+        """Raise TargetUnavailable unless the backend's own models loaded"""
+
+    def load(self):
+        self.analyzer = self.make_analyzer()
+        self.check()
+        self.analyze_batch(['warm up'])
+
+    def analyze_batch(self, texts):
+        result = self.analyzer.analyze_batch(texts, outputs=self.outputs)
+        emotions = _emotion_names(result.emotions.tolist()) if 'emotion' in self.outputs else None
+        return result.sentiments.tolist(), emotions
+
+
+@register_target
+class FallbackTarget(AnalyzerTarget):
+    name = 'fallback'
+    backend = 'lexicon'
+
+    def analyze_one(self, text):
+        clean_text = self.analyzer.preprocess_text(text)
+        if not clean_text:
+            return 'neutral', 'neutral'
+        sentiment, _ = self.analyzer.fallback_sentiment(clean_text)
+        emotion, _ = self.analyzer.fallback_emotion(clean_text)
+        return sentiment, emotion
+
+
+@register_target
+class PytorchTarget(AnalyzerTarget):
+    name = 'pytorch'
+    backend = 'pytorch'
+
+    def check(self):
+        if "fallback" in (self.analyzer.sentiment_analyzer, self.analyzer.emotion_classifier):
+            raise TargetUnavailable(
+                "transformer models are not in the local model store (run scripts/fetch_models.py)"
+            )
+
+
+@register_target
+class OnnxTarget(PytorchTarget):
+    name = 'onnx'
+    backend = 'onnx'
+
+    def check(self):
+        super().check()
+        models = (self.analyzer.sentiment_analyzer, self.analyzer.emotion_classifier)
+        if not all(isinstance(model, OnnxTextClassifier) for model in models):
+            raise TargetUnavailable("ONNX export failed; the analyzer fell back to PyTorch")
+
+
+@register_target
+class TfidfTarget(AnalyzerTarget):
+    name = 'tfidf'
+    backend = 'tfidf'
+    outputs = ('sentiment',)
+
+    def check(self):
+        path = self.options.get('tfidf_model_path')
+        if not path or not os.path.exists(path):
+            raise TargetUnavailable(f"no TF-IDF model at {path} (python/train_advanced_model.py)")
+        if not isinstance(self.analyzer.sentiment_analyzer, TfidfSentimentModel):
+            raise TargetUnavailable(f"could not load the TF-IDF model at {path}")
+
+
+@register_target
+class StudentTarget(AnalyzerTarget):
+    name = 'student'
+    backend = 'student'
+
+    def check(self):
+        path = self.options.get('student_model_path')
+        if not path or not os.path.exists(path) or self.analyzer._load_student() is None:
+            raise TargetUnavailable(f"no student model at {path} (python/distill_student_model.py)")
@@ -44,7 +44,87 @@ class Config:
     
     # ML Models
     MODEL_CACHE_DIR = os.getenv('MODEL_CACHE_DIR', './models/cache')
+    # Never contact the Hugging Face hub; models must already be in MODEL_CACHE_DIR
+    MODEL_OFFLINE = os.getenv('MODEL_OFFLINE', 'false').lower() == 'true'
     USE_GPU = os.getenv('USE_GPU', 'false').lower() == 'true'
+    # Load and warm models in the gunicorn master before fork (needs preload_app)
+    WARM_START = os.getenv('WARM_START', 'false').lower() == 'true'
+    INFERENCE_BATCH_SIZE = int(os.getenv('INFERENCE_BATCH_SIZE', 32))
+    INFERENCE_BACKEND = os.getenv('INFERENCE_BACKEND', 'pytorch')  # pytorch, onnx (int8, CPU), student, tfidf or lexicon
+    # Further backends a request may pick with "backend" (models/backends.py)
+    ANALYZER_BACKENDS = [b.strip() for b in os.getenv('ANALYZER_BACKENDS', 'lexicon').split(',') if b.strip()]
+    # Distilled student (.npz, python/distill_student_model.py); serves both
+    # heads when INFERENCE_BACKEND=student
+    STUDENT_MODEL_PATH = os.getenv('STUDENT_MODEL_PATH', 'models/sentiment_student.npz')
+    # Model store names; unset uses the defaults in models/sentiment_model.py
+    SENTIMENT_MODEL_NAME = os.getenv('SENTIMENT_MODEL_NAME') or None
+    EMOTION_MODEL_NAME = os.getenv('EMOTION_MODEL_NAME') or None
+    # Exported TF-IDF model (.npz); the tfidf backend serves its sentiment
+    # head (3-class, with neutral) instead of the transformer
+    TFIDF_MODEL_PATH = os.getenv('TFIDF_MODEL_PATH') or None
+    
+    # Versioned model registry (scripts/model_registry.py). Processes check
+    # its CURRENT pointer this often and hot-swap to a newly activated version
+    MODEL_REGISTRY_DIR = os.getenv('MODEL_REGISTRY_DIR', './models/registry')
+    MODEL_REGISTRY_CHECK_SECONDS = float(os.getenv('MODEL_REGISTRY_CHECK_SECONDS', 30))
+    
+    # Cascade: lexicon first, transformer only when the lexicon margin is low
+    # (requests that include the sentiment head; the margin is a sentiment one)
+    CASCADE_ENABLED = os.getenv('CASCADE_ENABLED', 'false').lower() == 'true'
+    CASCADE_MARGIN_THRESHOLD = float(os.getenv('CASCADE_MARGIN_THRESHOLD', 0.6))
+    
+    # Shadow scoring (services/shadow_scorer.py): a sample of served texts is
+    # re-scored in the background by this registry version and compared in
+    # the shadow_reports table. Unset disables it. The queue drops work when full.
+    # With INFERENCE_MODE=client only the inference daemon shadows
+    SHADOW_MODEL_VERSION = os.getenv('SHADOW_MODEL_VERSION') or None
+    SHADOW_SAMPLE_RATE = float(os.getenv('SHADOW_SAMPLE_RATE', 0.05))
+    SHADOW_QUEUE_SIZE = int(os.getenv('SHADOW_QUEUE_SIZE', 1000))
+    SHADOW_BATCH_SIZE = int(os.getenv('SHADOW_BATCH_SIZE', 32))
+    SHADOW_FLUSH_SECONDS = float(os.getenv('SHADOW_FLUSH_SECONDS', 60))
+    
+    # Re-scoring backfill (services/backfill.py): reviews per claimed range,
+    # per bulk update, lanes, target rows updated per second for the whole
+    # job, and how long a silent running range is kept before it is reclaimed
+    BACKFILL_RANGE_SIZE = int(os.getenv('BACKFILL_RANGE_SIZE', 10000))
+    BACKFILL_CHUNK_SIZE = int(os.getenv('BACKFILL_CHUNK_SIZE', 500))
+    BACKFILL_PARALLELISM = int(os.getenv('BACKFILL_PARALLELISM', 4))
+    BACKFILL_WRITE_RATE = float(os.getenv('BACKFILL_WRITE_RATE', 2000))
+    BACKFILL_LEASE_SECONDS = int(os.getenv('BACKFILL_LEASE_SECONDS', 300))
+    
+    # Admission control, in texts: the larger of the texts this worker has
+    # in flight (analyze and batch_analyze) and those queued for the model
+    # (the local scheduler, or the daemon across all its clients). From the
+    # degrade threshold calls use the rule-based analyzer, from the shed
+    # threshold they are refused (503). Defaults: one and two full batches.
+    ADMISSION_DEGRADE_THRESHOLD = int(os.getenv('ADMISSION_DEGRADE_THRESHOLD', 32))
+    ADMISSION_SHED_THRESHOLD = int(os.getenv('ADMISSION_SHED_THRESHOLD', 64))
+    ADMISSION_RETRY_AFTER = int(os.getenv('ADMISSION_RETRY_AFTER', 5))  # seconds
+    
+    # Shared inference daemon (python -m services.inference_server)
+    INFERENCE_MODE = os.getenv('INFERENCE_MODE', 'local')  # local or client
+    INFERENCE_SOCKET_PATH = os.getenv('INFERENCE_SOCKET_PATH', '/tmp/sentiment-inference.sock')
+    
+    # Inference micro-batching (collects concurrent analyze calls into one batch)
+    # in local mode, or in the inference daemon; clients never batch locally
+    INFERENCE_SCHEDULER_ENABLED = os.getenv('INFERENCE_SCHEDULER_ENABLED', 'false').lower() == 'true'
+    INFERENCE_MAX_WAIT_MS = int(os.getenv('INFERENCE_MAX_WAIT_MS', 10))
+    INFERENCE_MAX_BATCH = int(os.getenv('INFERENCE_MAX_BATCH', 32))
+    INFERENCE_LANE_WEIGHTS = {
+        lane: int(weight) for lane, weight in (
+            item.split(':') for item in os.getenv('INFERENCE_LANE_WEIGHTS', 'interactive:4,bulk:1').split(',')
+        )
+    }
+    
+    # CPU thread budget (core/thread_budget.py): the CPUs a process may use
+    # (affinity mask, capped by the cgroup quota) are split between the
+    # processes running models. 0 processes counts this process's siblings
+    # (gunicorn workers, Celery pool); set the total when several services
+    # share the CPUs, e.g. 6 for 4 gunicorn workers and Celery --concurrency=2
+    INFERENCE_THREAD_BUDGET = os.getenv('INFERENCE_THREAD_BUDGET', 'true').lower() == 'true'
+    INFERENCE_PROCESSES = int(os.getenv('INFERENCE_PROCESSES', 0))
+    INFERENCE_INTEROP_THREADS = int(os.getenv('INFERENCE_INTEROP_THREADS', 1))
+    INFERENCE_PIN_CPUS = os.getenv('INFERENCE_PIN_CPUS', 'false').lower() == 'true'
     
     # Logging
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
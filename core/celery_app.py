@@ -2,9 +2,43 @@
 Celery configuration for async tasks
 """
 from celery import Celery
+from celery.signals import worker_init, worker_process_init
+import logging
+
+logger = logging.getLogger(__name__)
 
 celery = Celery('sentiment_analysis')
 
+# Model preload runs in worker_process_init, which is killed after 4s by default
+celery.conf.worker_proc_alive_timeout = 120
+
+# Pool size of this worker, recorded in the main process before the pool forks
+_pool_size = None
+
+@worker_init.connect
+def record_pool_size(sender=None, **kwargs):
+    global _pool_size
+    _pool_size = getattr(sender, 'concurrency', None)
+
+@worker_process_init.connect
+def preload_sentiment_models(**kwargs):
+    """Load and warm the models once per worker process, before any task runs"""
+    from billiard.process import current_process
+    from core.thread_budget import apply_thread_budget
+    from services.sentiment_service import get_sentiment_service
+    
+    # Share the CPUs with the other pool processes before loading the models
+    apply_thread_budget(
+        processes=_pool_size,
+        worker_index=getattr(current_process(), 'index', None),
+        source='celery'
+    )
+    try:
+        get_sentiment_service().warmup()
+    except Exception as e:
+        # Tasks will load the models lazily instead
+        logger.error(f"Model preload failed: {e}")
+
 def init_celery(app):
     """Initialize Celery with Flask app context"""
     celery.conf.update(
@@ -1,6 +1,7 @@
 """
 Monitoring and metrics
 """
+import threading
 import time
 from functools import wraps
 from flask import request, g
@@ -14,7 +15,9 @@ metrics = {
     'requests_by_endpoint': {},
     'response_times': [],
     'errors_total': 0,
+    'inference': {},
 }
+_inference_lock = threading.Lock()
 
 def track_request():
     """Track request metrics"""
@@ -41,6 +44,11 @@ def track_response(response):
     
     return response
 
+def record_inference_event(name, count=1):
+    """Increment an inference counter (cascade tiers, shedding, budgets...)"""
+    with _inference_lock:
+        metrics['inference'][name] = metrics['inference'].get(name, 0) + count
+
 def get_metrics():
     """Get current metrics"""
     avg_response_time = (
@@ -53,8 +61,25 @@ def get_metrics():
         'errors_total': metrics['errors_total'],
         'avg_response_time_ms': round(avg_response_time * 1000, 2),
         'requests_by_endpoint': metrics['requests_by_endpoint'],
+        'inference': dict(metrics['inference']),
     }
 
+def get_memory_usage_mb():
+    """Resident set size of the current process in MB"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    
+    # Non-Linux: peak RSS is the best we have (KB on Linux, bytes on macOS)
+    import resource
+    import sys
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
 def monitor_performance(func):
     """Decorator to monitor function performance"""
     @wraps(func)
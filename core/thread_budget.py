@@ -0,0 +1,235 @@
+"""
+CPU thread budget for inference
+
+PyTorch and onnxruntime default to one intra-op thread per core in every
+process, so 4 gunicorn workers and 2 Celery pool processes on one host run
+six times as many inference threads as there are cores. The budget splits
+the CPUs this process may use (its affinity mask, capped by the cgroup CPU
+quota) between the processes running models on them, and gives each
+process its share as intra-op threads. Optionally each process is pinned
+to its own slice of the CPUs.
+
+Process entry points apply it before any model loads (gunicorn post_fork,
+Celery worker_process_init, the inference daemon); SentimentService applies
+the auto-detected budget in processes that have none yet. Models loaded
+later pick it up through ``configure_torch`` and ``configure_onnx``.
+"""
+import logging
+import os
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
+
+CGROUP_ROOT = '/sys/fs/cgroup'
+
+# Native thread pools that read their size from the environment when loaded
+THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS')
+
+_budget = None
+_torch_configured = False
+_lock = threading.Lock()
+
+
+def cgroup_cpu_limit(root=CGROUP_ROOT):
+    """CPUs allowed by the cgroup CPU quota (v2 or v1), or None when unlimited"""
+    try:
+        with open(os.path.join(root, 'cpu.max')) as f:
+            quota, period = f.read().split()[:2]
+        if quota == 'max':
+            return None
+        return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open(os.path.join(root, 'cpu', 'cpu.cfs_quota_us')) as f:
+            quota = int(f.read())
+        with open(os.path.join(root, 'cpu', 'cpu.cfs_period_us')) as f:
+            period = int(f.read())
+    except (OSError, ValueError):
+        return None
+    return quota / period if quota > 0 and period > 0 else None
+
+
+def allowed_cpus():
+    """CPU ids this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _cmdline(pid):
+    with open(f'/proc/{pid}/cmdline', 'rb') as f:
+        return f.read()
+
+
+def _parent_pid(pid):
+    with open(f'/proc/{pid}/stat') as f:
+        # The command name may contain spaces; fields after it are fixed
+        return int(f.read().rsplit(')', 1)[1].split()[1])
+
+
+def sibling_processes():
+    """Pids of this process and its siblings running the same command
+    (gunicorn workers, Celery pool processes), from /proc"""
+    pid = os.getpid()
+    try:
+        parent, cmdline = os.getppid(), _cmdline(pid)
+        entries = os.listdir('/proc')
+    except OSError:
+        return [pid]
+
+    siblings = [pid]
+    for entry in entries:
+        if not entry.isdigit() or int(entry) == pid:
+            continue
+        try:
+            if _parent_pid(entry) == parent and _cmdline(entry) == cmdline:
+                siblings.append(int(entry))
+        except (OSError, ValueError, IndexError):
+            continue  # Exited while scanning
+    return sorted(siblings)
+
+
+def plan_thread_budget(cpus, processes, quota=None, interop_threads=1, worker_index=None, pin=False):
+    """Threads (and CPUs, when pinning) for one of ``processes`` processes
+    sharing ``cpus`` under an optional cgroup ``quota``"""
+    processes = max(1, processes)
+    usable = len(cpus)
+    if quota:
+        usable = min(usable, max(1, int(quota)))
+
+    intra_op = max(1, usable // processes)
+    budget = {
+        'cpus': len(cpus),
+        'cgroup_quota': round(quota, 2) if quota else None,
+        'usable_cpus': usable,
+        'processes': processes,
+        'worker_index': worker_index,
+        'intra_op_threads': intra_op,
+        'inter_op_threads': max(1, min(interop_threads, intra_op)),
+        'oversubscribed': processes * intra_op > usable,
+        'pinned_cpus': None,
+    }
+    if pin and worker_index is not None and cpus:
+        start = (worker_index % processes) * intra_op
+        budget['pinned_cpus'] = [cpus[(start + i) % len(cpus)] for i in range(min(intra_op, len(cpus)))]
+    return budget
+
+
+def _pin(cpus):
+    """Pin every thread of this process; sched_setaffinity(0) only moves the caller"""
+    try:
+        threads = [int(tid) for tid in os.listdir('/proc/self/task')]
+    except OSError:
+        threads = [0]
+    for tid in threads:
+        try:
+            os.sched_setaffinity(tid, cpus)
+        except OSError:
+            continue  # Thread exited
+
+
+def apply_thread_budget(config=None, processes=None, worker_index=None, source='auto'):
+    """Compute and apply this process's budget; returns it
+
+    ``processes`` and ``worker_index`` come from the entry point when it knows
+    them (gunicorn and Celery worker counts); INFERENCE_PROCESSES overrides
+    the count, which otherwise falls back to the siblings found in /proc.
+    """
+    global _budget, _torch_configured
+    if config is None:
+        from config import get_config
+        config = get_config()
+
+    if not config.INFERENCE_THREAD_BUDGET:
+        return None
+
+    cpus = allowed_cpus()
+    siblings = None
+    if config.INFERENCE_PROCESSES:
+        processes, source = config.INFERENCE_PROCESSES, 'config'
+    elif not processes:
+        siblings = sibling_processes()
+        processes = len(siblings)
+    if worker_index is None and config.INFERENCE_PIN_CPUS:
+        worker_index = (siblings or sibling_processes()).index(os.getpid())
+
+    budget = plan_thread_budget(
+        cpus, processes,
+        quota=cgroup_cpu_limit(),
+        interop_threads=config.INFERENCE_INTEROP_THREADS,
+        worker_index=worker_index,
+        pin=config.INFERENCE_PIN_CPUS
+    )
+    budget['source'] = source
+    budget['pid'] = os.getpid()
+
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(budget['intra_op_threads'])
+    if budget['pinned_cpus']:
+        _pin(budget['pinned_cpus'])
+
+    with _lock:
+        _budget = budget
+        _torch_configured = False
+    if 'torch' in sys.modules:
+        configure_torch()
+
+    logger.info(
+        f"Inference thread budget: {budget['intra_op_threads']} intra-op / "
+        f"{budget['inter_op_threads']} inter-op threads for {processes} processes "
+        f"on {budget['usable_cpus']} CPUs ({source})"
+    )
+    return budget
+
+
+def ensure_thread_budget(config=None):
+    """Apply the auto-detected budget unless this process already has one"""
+    if _budget is None or _budget['pid'] != os.getpid():
+        return apply_thread_budget(config)
+    return _budget
+
+
+def configure_torch():
+    """Set torch's thread pools to the budget; call before loading a model"""
+    global _torch_configured
+    with _lock:
+        if _budget is None or _torch_configured:
+            return
+        _torch_configured = True
+        budget = _budget
+
+    import torch
+    torch.set_num_threads(budget['intra_op_threads'])
+    try:
+        torch.set_num_interop_threads(budget['inter_op_threads'])
+    except RuntimeError as e:
+        # Only possible before the first parallel op (e.g. not after a
+        # preloading gunicorn master already ran the models)
+        budget['inter_op_error'] = str(e)
+        logger.warning(f"Could not set inter-op threads: {e}")
+
+
+def configure_onnx(options):
+    """Apply the budget to an onnxruntime SessionOptions (fixed per session)"""
+    if _budget is not None:
+        options.intra_op_num_threads = _budget['intra_op_threads']
+        options.inter_op_num_threads = _budget['inter_op_threads']
+    return options
+
+
+def get_thread_budget():
+    """The applied budget plus the thread counts torch actually uses"""
+    if _budget is None or _budget['pid'] != os.getpid():
+        return {'applied': False}
+
+    status = {'applied': True, **_budget}
+    if 'torch' in sys.modules:
+        torch = sys.modules['torch']
+        status['torch'] = {
+            'intra_op_threads': torch.get_num_threads(),
+            'inter_op_threads': torch.get_num_interop_threads(),
+        }
+    return status
@@ -0,0 +1,39 @@
+"""
+Gunicorn configuration
+
+With WARM_START=true the app (and the sentiment models) is loaded once in
+the master before workers are forked, so all workers share the model
+weights copy-on-write and start warm. Otherwise each worker warms its
+models in the background after boot; /api/v1/health/ready returns 503
+until that finishes.
+
+Each worker gets its share of the CPUs as inference threads
+(core/thread_budget.py) right after fork, before it loads any model.
+"""
+import gc
+import os
+
+preload_app = os.getenv('WARM_START', 'false').lower() == 'true'
+
+
+def when_ready(server):
+    if preload_app:
+        # Move everything loaded so far out of the GC's reach so collections
+        # in the workers don't touch (and copy) the shared pages
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    from core.thread_budget import apply_thread_budget
+
+    workers = server.cfg.workers
+    # age counts spawns; a respawned worker may share its pinned CPUs with a live one
+    apply_thread_budget(processes=workers, worker_index=(worker.age - 1) % workers, source='gunicorn')
+
+
+def post_worker_init(worker):
+    from services.sentiment_service import get_sentiment_service
+
+    service = get_sentiment_service()
+    if not service.ready:
+        service.warmup_async()
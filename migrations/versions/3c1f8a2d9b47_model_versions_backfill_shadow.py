@@ -0,0 +1,111 @@
+"""Model versions on reviews, backfill jobs and shadow reports
+
+The schema before this revision was created by db.create_all(); databases
+created that way from the current models already have these tables and
+should be stamped instead (flask db stamp head).
+
+Revision ID: 3c1f8a2d9b47
+Revises: 
+Create Date: 2026-10-18 06:01:38.080592
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1f8a2d9b47'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Model version that scored each review
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('model_version', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_reviews_model_version'), ['model_version'], unique=False)
+
+    op.create_table('backfill_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('model_version', sa.String(length=64), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('min_id', sa.Integer(), nullable=True),
+    sa.Column('max_id', sa.Integer(), nullable=True),
+    sa.Column('total_rows', sa.Integer(), nullable=True),
+    sa.Column('range_size', sa.Integer(), nullable=False),
+    sa.Column('chunk_size', sa.Integer(), nullable=False),
+    sa.Column('parallelism', sa.Integer(), nullable=False),
+    sa.Column('write_rate', sa.Float(), nullable=False),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('backfill_jobs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_backfill_jobs_status'), ['status'], unique=False)
+
+    op.create_table('backfill_ranges',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('start_id', sa.Integer(), nullable=False),
+    sa.Column('end_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('last_id', sa.Integer(), nullable=True),
+    sa.Column('rows_done', sa.Integer(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=True),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['job_id'], ['backfill_jobs.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('backfill_ranges', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_backfill_ranges_job_id'), ['job_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_backfill_ranges_status'), ['status'], unique=False)
+
+    op.create_table('shadow_reports',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('primary_version', sa.String(length=64), nullable=False),
+    sa.Column('candidate_version', sa.String(length=64), nullable=False),
+    sa.Column('texts', sa.Integer(), nullable=True),
+    sa.Column('sentiment_compared', sa.Integer(), nullable=True),
+    sa.Column('sentiment_agreements', sa.Integer(), nullable=True),
+    sa.Column('emotion_compared', sa.Integer(), nullable=True),
+    sa.Column('emotion_agreements', sa.Integer(), nullable=True),
+    sa.Column('primary_latency_ms', sa.Float(), nullable=True),
+    sa.Column('candidate_latency_ms', sa.Float(), nullable=True),
+    sa.Column('dropped', sa.Integer(), nullable=True),
+    sa.Column('errors', sa.Integer(), nullable=True),
+    sa.Column('window_start', sa.DateTime(), nullable=False),
+    sa.Column('window_end', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('shadow_reports', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_shadow_reports_candidate_version'), ['candidate_version'], unique=False)
+        batch_op.create_index(batch_op.f('ix_shadow_reports_primary_version'), ['primary_version'], unique=False)
+        batch_op.create_index(batch_op.f('ix_shadow_reports_window_end'), ['window_end'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('shadow_reports', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_shadow_reports_window_end'))
+        batch_op.drop_index(batch_op.f('ix_shadow_reports_primary_version'))
+        batch_op.drop_index(batch_op.f('ix_shadow_reports_candidate_version'))
+
+    op.drop_table('shadow_reports')
+
+    with op.batch_alter_table('backfill_ranges', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_backfill_ranges_status'))
+        batch_op.drop_index(batch_op.f('ix_backfill_ranges_job_id'))
+
+    op.drop_table('backfill_ranges')
+
+    with op.batch_alter_table('backfill_jobs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_backfill_jobs_status'))
+
+    op.drop_table('backfill_jobs')
+
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_reviews_model_version'))
+        batch_op.drop_column('model_version')
@@ -2,5 +2,7 @@
 from .user import User
 from .review import Review, Analytics
 from .scrape_job import ScrapeJob
+from .shadow_report import ShadowReport
+from .backfill_job import BackfillJob, BackfillRange
 
-__all__ = ['User', 'Review', 'Analytics', 'ScrapeJob']
+__all__ = ['User', 'Review', 'Analytics', 'ScrapeJob', 'ShadowReport', 'BackfillJob', 'BackfillRange']
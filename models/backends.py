@@ -0,0 +1,99 @@
+"""
+Analyzer backend registry
+
+Every backend implements ``analyze_batch(texts, outputs=OUTPUTS)`` and
+returns a columnar BatchResult (utils/batch_result.py); per-text dicts
+are only built at the API edge. Backends are registered by name with a
+factory taking the app config:
+
+    pytorch  - transformer pipelines (the default)
+    onnx     - int8 ONNX exports of the same models
+    student  - distilled hashed n-gram model (STUDENT_MODEL_PATH)
+    tfidf    - exported TF-IDF sentiment model (TFIDF_MODEL_PATH), with the
+               transformer emotion head
+    lexicon  - keyword rules only, no model loaded
+
+INFERENCE_BACKEND is the deployment default; requests may choose any
+backend listed in ANALYZER_BACKENDS.
+"""
+import threading
+
+from models.sentiment_model import SentimentAnalyzer, OUTPUTS, SENTIMENT_MODEL, EMOTION_MODEL
+
+BACKENDS = {}
+
+
+def register_backend(name):
+    """Decorator registering ``factory(config)`` under ``name``"""
+    def decorator(factory):
+        BACKENDS[name] = factory
+        return factory
+    return decorator
+
+
+def create_backend(name, config):
+    """Build the backend registered under ``name``"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown analyzer backend: {name}. Choose from: {', '.join(sorted(BACKENDS))}")
+    return BACKENDS[name](config)
+
+
+def _analyzer_factory(backend):
+    """Factory for a SentimentAnalyzer running on ``backend``"""
+    def factory(config):
+        return SentimentAnalyzer(
+            batch_size=config.INFERENCE_BATCH_SIZE,
+            backend=backend,
+            cache_dir=config.MODEL_CACHE_DIR,
+            offline=config.MODEL_OFFLINE,
+            tfidf_model_path=config.TFIDF_MODEL_PATH if backend == 'tfidf' else None,
+            student_model_path=config.STUDENT_MODEL_PATH,
+            sentiment_model=config.SENTIMENT_MODEL_NAME or SENTIMENT_MODEL,
+            emotion_model=config.EMOTION_MODEL_NAME or EMOTION_MODEL
+        )
+    return factory
+
+
+for _name in ('pytorch', 'onnx', 'student', 'tfidf', 'lexicon'):
+    register_backend(_name)(_analyzer_factory(_name))
+
+
+class BackendPool:
+    """The backends a process serves, each created on first use"""
+
+    def __init__(self, config, default=None, allowed=None):
+        self.config = config
+        self.default = default or config.INFERENCE_BACKEND
+        if allowed is None:
+            allowed = config.ANALYZER_BACKENDS
+        self.allowed = {self.default, *allowed}
+        unknown = self.allowed - set(BACKENDS)
+        if unknown:
+            raise ValueError(f"Unknown analyzer backends: {', '.join(sorted(unknown))}")
+        self._backends = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, name=None):
+        """Validated backend name; None means the deployment default"""
+        if name is None or name == self.default:
+            return self.default
+        if name not in self.allowed:
+            raise ValueError(
+                f"Analyzer backend {name!r} is not enabled. Choose from: {', '.join(sorted(self.allowed))}"
+            )
+        return name
+
+    def get(self, name=None):
+        """The backend instance for ``name``"""
+        name = self.resolve(name)
+        backend = self._backends.get(name)
+        if backend is None:
+            with self._lock:
+                backend = self._backends.get(name)
+                if backend is None:
+                    backend = self._backends[name] = create_backend(name, self.config)
+        return backend
+
+    def batch_analyze(self, texts, backend=None, outputs=OUTPUTS, compact=False):
+        """One result dict per text from the chosen backend"""
+        return self.get(backend).analyze_batch(texts, outputs=outputs).to_dicts(texts, compact)
@@ -0,0 +1,54 @@
+"""
+Backfill job models: re-scoring stored reviews with a model version
+"""
+from datetime import datetime
+from core.extensions import db
+
+class BackfillJob(db.Model):
+    __tablename__ = 'backfill_jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    model_version = db.Column(db.String(64), nullable=False)
+    status = db.Column(db.String(20), default='pending', index=True)  # pending, running, completed, failed, cancelled
+
+    # Plan: reviews with min_id <= id <= max_id, split into primary-key ranges
+    min_id = db.Column(db.Integer, default=0)
+    max_id = db.Column(db.Integer, default=0)
+    total_rows = db.Column(db.Integer, default=0)  # Rows to re-score when planned
+    range_size = db.Column(db.Integer, nullable=False)
+    chunk_size = db.Column(db.Integer, nullable=False)
+    parallelism = db.Column(db.Integer, nullable=False)
+    write_rate = db.Column(db.Float, nullable=False)  # Target rows updated per second, whole job
+    error_message = db.Column(db.Text)
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime)
+    completed_at = db.Column(db.DateTime)
+
+    # Relationships
+    ranges = db.relationship('BackfillRange', backref='job', lazy='dynamic', cascade='all, delete-orphan')
+
+    def __repr__(self):
+        return f'<BackfillJob {self.id} - {self.model_version} {self.status}>'
+
+
+class BackfillRange(db.Model):
+    """One primary-key range of a backfill; ``last_id`` is its checkpoint"""
+    __tablename__ = 'backfill_ranges'
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('backfill_jobs.id'), nullable=False, index=True)
+    start_id = db.Column(db.Integer, nullable=False)  # Inclusive
+    end_id = db.Column(db.Integer, nullable=False)  # Exclusive
+    status = db.Column(db.String(20), default='pending', index=True)  # pending, running, done, failed
+    last_id = db.Column(db.Integer)  # Highest id re-scored and committed
+    rows_done = db.Column(db.Integer, default=0)
+    attempts = db.Column(db.Integer, default=0)
+    error_message = db.Column(db.Text)
+
+    # Refreshed on every committed chunk; a stale running range is reclaimed
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<BackfillRange {self.job_id}:{self.start_id}-{self.end_id} {self.status}>'
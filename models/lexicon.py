@@ -0,0 +1,69 @@
+"""
+Keyword lexicon for the rule-based fallback scorers
+
+All keywords of all categories are matched in a single pass over the
+text, however many categories and keywords there are, and only as whole
+words ("no" does not match inside "know"). Single-word lexicons tokenize
+once and look tokens up in a hash set; lexicons with phrases compile every
+keyword into one word-boundary alternation regex instead.
+"""
+import re
+
+SENTIMENT_KEYWORDS = {
+    'positive': ['good', 'great', 'excellent', 'amazing', 'wonderful', 'fantastic',
+                 'love', 'best', 'perfect', 'awesome', 'beautiful', 'nice', 'happy'],
+    'negative': ['bad', 'terrible', 'awful', 'horrible', 'worst', 'hate', 'poor',
+                 'disappointing', 'waste', 'never', 'not', 'no', 'sad', 'angry'],
+}
+
+EMOTION_KEYWORDS = {
+    'happy': ['happy', 'joy', 'great', 'excellent', 'love', 'wonderful'],
+    'angry': ['angry', 'hate', 'terrible', 'worst', 'awful'],
+    'sad': ['sad', 'disappointed', 'unhappy', 'depressed'],
+    'satisfied': ['satisfied', 'good', 'nice', 'okay', 'fine'],
+    'surprised': ['surprised', 'wow', 'amazing', 'incredible'],
+    'anxious': ['worried', 'anxious', 'nervous', 'concerned'],
+}
+
+
+class Lexicon:
+    """Counts keyword hits for several categories in a single pass"""
+
+    def __init__(self, categories):
+        self.categories = {name: tuple(words) for name, words in categories.items()}
+
+        # A keyword may belong to several categories ('great' is positive and happy)
+        self._owners = {}
+        for name, words in self.categories.items():
+            for word in words:
+                self._owners.setdefault(word.lower(), []).append(name)
+
+        self._keywords = frozenset(self._owners)
+        if all(re.fullmatch(r'\w+', word) for word in self._keywords):
+            self._pattern = re.compile(r'\w+')
+        else:
+            # Longest first, so no keyword is shadowed by a shorter alternative
+            keywords = sorted(self._keywords, key=len, reverse=True)
+            self._pattern = re.compile(r'\b(?:' + '|'.join(map(re.escape, keywords)) + r')\b')
+
+    def count(self, text):
+        """Number of distinct keywords of each category found in text"""
+        return self.count_batch([text])[0]
+
+    def count_batch(self, texts):
+        """``count`` for many texts, in input order"""
+        findall = self._pattern.findall
+        keywords = self._keywords
+        owners = self._owners
+        results = []
+        for text in texts:
+            counts = dict.fromkeys(self.categories, 0)
+            for word in keywords.intersection(findall(text.lower())):
+                for name in owners[word]:
+                    counts[name] += 1
+            results.append(counts)
+        return results
+
+
+# Sentiment and emotion keywords share one automaton
+FALLBACK_LEXICON = Lexicon({**SENTIMENT_KEYWORDS, **EMOTION_KEYWORDS})
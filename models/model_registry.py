@@ -0,0 +1,161 @@
+"""
+Versioned model registry on disk
+
+    MODEL_REGISTRY_DIR/
+        versions/<version>/manifest.json
+        CURRENT                 name of the active version
+
+A manifest pins what the analyzers run for one version:
+
+    {"version": "2026-10-18-sst2", "backend": "pytorch",
+     "sentiment_model": "distilbert-base-uncased-finetuned-sst-2-english",
+     "emotion_model": "j-hartmann/emotion-english-distilroberta-base",
+     "tfidf_model_path": null, "student_model_path": null, "created_at": "..."}
+
+Transformer weights stay in the model store, keyed by model name; .npz
+artifacts may be copied into the version directory (relative paths
+resolve against it). ``activate`` rewrites CURRENT atomically; serving
+processes notice on their next check and swap in the background (see
+services/model_manager.py). Without a CURRENT pointer the ``builtin``
+version is served, built from the app config.
+
+Manage versions with: python scripts/model_registry.py --help
+"""
+import json
+import os
+import re
+import shutil
+from datetime import datetime
+
+BUILTIN_VERSION = 'builtin'
+
+# Manifest keys and the config settings they override
+MANIFEST_SETTINGS = {
+    'backend': 'INFERENCE_BACKEND',
+    'sentiment_model': 'SENTIMENT_MODEL_NAME',
+    'emotion_model': 'EMOTION_MODEL_NAME',
+    'tfidf_model_path': 'TFIDF_MODEL_PATH',
+    'student_model_path': 'STUDENT_MODEL_PATH',
+}
+
+_VERSION_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9._-]{0,63}$')
+
+
+class VersionConfig:
+    """The app config with the settings of one model version overridden
+
+    Every manifest setting is pinned, null included: a version never picks
+    up a model name or artifact path from the environment it runs in.
+    """
+
+    def __init__(self, config, manifest):
+        self._config = config
+        self._overrides = {setting: manifest.get(key) for key, setting in MANIFEST_SETTINGS.items()}
+        self.MODEL_VERSION = manifest['version']
+
+    def __getattr__(self, name):
+        if name in self._overrides:
+            return self._overrides[name]
+        return getattr(self._config, name)
+
+
+class ModelRegistry:
+    """Model versions published under ``root``"""
+
+    def __init__(self, root):
+        self.root = root
+        self.versions_dir = os.path.join(root, 'versions')
+        self.pointer_path = os.path.join(root, 'CURRENT')
+
+    def _version_dir(self, version):
+        if not _VERSION_PATTERN.match(version or ''):
+            raise ValueError(f"Invalid model version name: {version!r}")
+        return os.path.join(self.versions_dir, version)
+
+    def versions(self):
+        """Published version names, oldest first"""
+        if not os.path.isdir(self.versions_dir):
+            return []
+        found = [
+            (self.load_manifest(name).get('created_at', ''), name)
+            for name in os.listdir(self.versions_dir)
+            if os.path.exists(os.path.join(self.versions_dir, name, 'manifest.json'))
+        ]
+        return [name for _, name in sorted(found)]
+
+    def load_manifest(self, version):
+        """Manifest of a published version; relative artifact paths made absolute"""
+        version_dir = self._version_dir(version)
+        path = os.path.join(version_dir, 'manifest.json')
+        if not os.path.exists(path):
+            raise ValueError(f"Unknown model version: {version}")
+        with open(path) as f:
+            manifest = json.load(f)
+
+        for key in ('tfidf_model_path', 'student_model_path'):
+            if manifest.get(key) and not os.path.isabs(manifest[key]):
+                manifest[key] = os.path.join(version_dir, manifest[key])
+        return manifest
+
+    def builtin_manifest(self, config):
+        """The version served without a registry, from the app config"""
+        manifest = {key: getattr(config, setting) for key, setting in MANIFEST_SETTINGS.items()}
+        manifest['version'] = BUILTIN_VERSION
+        return manifest
+
+    def publish(self, version, backend='pytorch', sentiment_model=None, emotion_model=None,
+                tfidf_model_path=None, student_model_path=None):
+        """Write a new version; published versions are immutable
+
+        The .npz artifacts are copied into the version directory, so later
+        retraining into the same path cannot change a published version.
+        """
+        version_dir = self._version_dir(version)
+        if version == BUILTIN_VERSION or os.path.exists(version_dir):
+            raise ValueError(f"Model version {version} already exists")
+
+        manifest = {
+            'version': version,
+            'backend': backend,
+            'sentiment_model': sentiment_model,
+            'emotion_model': emotion_model,
+            'tfidf_model_path': tfidf_model_path,
+            'student_model_path': student_model_path,
+            'created_at': datetime.utcnow().isoformat(),
+        }
+        # Write into a temporary directory and rename, so readers never see half a version
+        tmp_dir = f"{version_dir}.{os.getpid()}.tmp"
+        os.makedirs(tmp_dir)
+        for key in ('tfidf_model_path', 'student_model_path'):
+            if manifest[key]:
+                shutil.copy2(manifest[key], tmp_dir)
+                manifest[key] = os.path.basename(manifest[key])
+        with open(os.path.join(tmp_dir, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.rename(tmp_dir, version_dir)
+        return manifest
+
+    def activate(self, version):
+        """Make ``version`` the one serving processes switch to"""
+        if version != BUILTIN_VERSION:
+            self.load_manifest(version)  # Must exist
+
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.pointer_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(version + '\n')
+        os.replace(tmp_path, self.pointer_path)
+
+    def current_version(self):
+        """Name of the active version"""
+        try:
+            with open(self.pointer_path) as f:
+                return f.read().strip() or BUILTIN_VERSION
+        except FileNotFoundError:
+            return BUILTIN_VERSION
+
+    def version_config(self, config, version):
+        """``config`` with the settings of ``version`` applied"""
+        if version == BUILTIN_VERSION:
+            return VersionConfig(config, self.builtin_manifest(config))
+        return VersionConfig(config, self.load_manifest(version))
@@ -0,0 +1,111 @@
+"""
+Local model store under MODEL_CACHE_DIR
+
+Each model is kept as ``model.safetensors`` plus its config and tokenizer
+files. Weights are loaded memory-mapped straight from that file, so
+processes on the same node share the page cache instead of each holding a
+private copy, and nothing is resolved against the Hugging Face hub when
+the store is populated.
+
+Populate it on a connected machine with: python scripts/fetch_models.py
+"""
+import os
+import shutil
+from contextlib import contextmanager
+
+
+@contextmanager
+def _meta_parameters():
+    """Register module parameters on the meta device while a model is built
+
+    Parameters get no storage and their random init is a no-op, so a
+    model skeleton costs nothing before the mapped weights are assigned.
+    Buffers (position ids and the like, often not saved) stay real.
+    """
+    import torch
+    from torch import nn
+
+    register_parameter = nn.Module.register_parameter
+
+    def register_on_meta(module, name, param):
+        if param is not None:
+            param = nn.Parameter(param.to('meta'), requires_grad=param.requires_grad)
+        register_parameter(module, name, param)
+
+    nn.Module.register_parameter = register_on_meta
+    try:
+        yield
+    finally:
+        nn.Module.register_parameter = register_parameter
+
+
+class ModelStore:
+    def __init__(self, root, offline=False):
+        self.root = os.path.join(root, 'store')
+        self.offline = offline
+
+    def path_for(self, model_name):
+        return os.path.join(self.root, model_name.replace('/', '--'))
+
+    def has(self, model_name):
+        path = self.path_for(model_name)
+        return all(
+            os.path.exists(os.path.join(path, name))
+            for name in ('config.json', 'model.safetensors')
+        )
+
+    def fetch(self, model_name):
+        """Download a model from the hub into the store (safetensors)"""
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+        path = self.path_for(model_name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        print(f"📥 Fetching {model_name} into model store...")
+
+        model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model.save_pretrained(tmp_path, safe_serialization=True)
+        tokenizer.save_pretrained(tmp_path)
+
+        # Another process may have finished first; keep whichever landed
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            os.rename(tmp_path, path)
+        except OSError:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        return path
+
+    def ensure(self, model_name):
+        """Path of a stored model, fetching it first unless offline"""
+        if not self.has(model_name):
+            if self.offline:
+                raise FileNotFoundError(
+                    f"{model_name} is not in the model store at {self.root} (offline mode)"
+                )
+            self.fetch(model_name)
+        return self.path_for(model_name)
+
+    def load(self, model_name):
+        """Load (model, tokenizer) with memory-mapped weights, fully offline"""
+        from safetensors.torch import load_file
+        from transformers import AutoConfig, AutoModelForSequenceClassification, AutoTokenizer
+
+        path = self.ensure(model_name)
+        config = AutoConfig.from_pretrained(path, local_files_only=True)
+        tokenizer = AutoTokenizer.from_pretrained(path, local_files_only=True)
+
+        # Skeleton without weights: nothing is allocated or randomly initialised
+        with _meta_parameters():
+            model = AutoModelForSequenceClassification.from_config(config)
+
+        # load_file maps the file; assign=True makes the mapped tensors the
+        # parameters themselves instead of copying them into fresh buffers
+        state_dict = load_file(os.path.join(path, 'model.safetensors'))
+        model.load_state_dict(state_dict, assign=True, strict=False)
+        model.tie_weights()  # Tied weights are saved once
+
+        missing = [name for name, param in model.named_parameters() if param.is_meta]
+        if missing:
+            raise ValueError(f"{model_name}: weights missing from model.safetensors: {', '.join(missing)}")
+        model.eval()
+        return model, tokenizer
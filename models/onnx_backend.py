@@ -0,0 +1,126 @@
+"""
+ONNX Runtime backend for the transformer classifiers
+
+Each model is exported to ONNX once, dynamically quantized to int8 and
+cached under MODEL_CACHE_DIR. Later processes load the cached graph
+directly, without needing torch.
+
+Requirements (optional):
+pip install onnxruntime onnx
+"""
+import os
+import numpy as np
+
+
+def _model_dir(model_name, cache_dir):
+    return os.path.join(cache_dir, 'onnx', model_name.replace('/', '--'))
+
+
+def export_onnx_model(model_name, cache_dir, quantize=True, source=None):
+    """Export a sequence classification model to ONNX (once) and return its path
+
+    ``source`` is a local directory to export from instead of the hub name.
+    """
+    model_dir = _model_dir(model_name, cache_dir)
+    fp32_path = os.path.join(model_dir, 'model.onnx')
+    int8_path = os.path.join(model_dir, 'model.int8.onnx')
+    target = int8_path if quantize else fp32_path
+
+    if os.path.exists(target):
+        return target
+
+    if not os.path.exists(fp32_path):
+        import torch
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+        print(f"📦 Exporting {model_name} to ONNX (one-time)...")
+        os.makedirs(model_dir, exist_ok=True)
+
+        tokenizer = AutoTokenizer.from_pretrained(source or model_name)
+        model = AutoModelForSequenceClassification.from_pretrained(source or model_name)
+        model.eval()
+        tokenizer.save_pretrained(model_dir)
+        model.config.save_pretrained(model_dir)
+
+        # Write to a per-process temp file so concurrent workers never see a partial graph
+        dummy = tokenizer(["export sample"], return_tensors='pt')
+        tmp_path = f"{fp32_path}.{os.getpid()}.tmp"
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                (dummy['input_ids'], dummy['attention_mask']),
+                tmp_path,
+                input_names=['input_ids', 'attention_mask'],
+                output_names=['logits'],
+                dynamic_axes={
+                    'input_ids': {0: 'batch', 1: 'sequence'},
+                    'attention_mask': {0: 'batch', 1: 'sequence'},
+                    'logits': {0: 'batch'}
+                },
+                opset_version=14,
+                dynamo=False
+            )
+        os.replace(tmp_path, fp32_path)
+
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+
+        tmp_path = f"{int8_path}.{os.getpid()}.tmp"
+        quantize_dynamic(fp32_path, tmp_path, weight_type=QuantType.QInt8)
+        os.replace(tmp_path, int8_path)
+
+    print(f"✅ ONNX model cached at {target}")
+    return target
+
+
+class OnnxTextClassifier:
+    """Text classifier with the same call/return shape as a transformers
+    text-classification pipeline, running on onnxruntime"""
+
+    def __init__(self, model_name, cache_dir, return_all_scores=False, quantize=True, source=None):
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoTokenizer
+        from core.thread_budget import configure_onnx
+
+        model_path = export_onnx_model(model_name, cache_dir, quantize=quantize, source=source)
+        model_dir = os.path.dirname(model_path)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.id2label = AutoConfig.from_pretrained(model_dir).id2label
+        self.return_all_scores = return_all_scores
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        configure_onnx(options)
+        self.session = ort.InferenceSession(model_path, options, providers=['CPUExecutionProvider'])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def _format(self, probs):
+        scores = [{'label': self.id2label[j], 'score': float(p)} for j, p in enumerate(probs)]
+        if self.return_all_scores:
+            return scores
+        return max(scores, key=lambda s: s['score'])
+
+    def __call__(self, texts, batch_size=32, truncation=True, **kwargs):
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+
+        results = []
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=truncation,
+                return_tensors='np'
+            )
+            feeds = {k: v.astype(np.int64) for k, v in encoded.items() if k in self.input_names}
+            logits = self.session.run(None, feeds)[0]
+
+            # Softmax
+            logits = logits - logits.max(axis=1, keepdims=True)
+            probs = np.exp(logits)
+            probs /= probs.sum(axis=1, keepdims=True)
+            results.extend(self._format(row) for row in probs)
+
+        return results[:1] if single else results
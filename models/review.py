@@ -13,6 +13,8 @@ class Review(db.Model):
     emotion = db.Column(db.String(20), nullable=False, index=True)
     confidence = db.Column(db.Float, nullable=False)
     source = db.Column(db.String(50), index=True)
+    # Model version that produced the labels ('lexicon' for rule-based answers)
+    model_version = db.Column(db.String(64), index=True)
     
     # Foreign keys
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
@@ -33,6 +35,7 @@ class Review(db.Model):
             'emotion': self.emotion,
             'confidence': self.confidence,
             'source': self.source,
+            'model_version': self.model_version,
             'created_at': self.created_at.isoformat()
         }
 
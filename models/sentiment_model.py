@@ -1,25 +1,133 @@
-import re
 import numpy as np
+from models.model_store import ModelStore
+from models.lexicon import FALLBACK_LEXICON, EMOTION_KEYWORDS
+from models.tfidf_backend import TfidfSentimentModel
+from models.student_backend import StudentModel
+from utils.text_preprocessing import clean_model_text, preprocess_batch
+from utils.batch_result import BatchResult, NO_EMOTION, encode_labels
+
+# Map model emotion labels to simplified categories
+EMOTION_MAP = {
+    'joy': 'happy',
+    'sadness': 'sad',
+    'anger': 'angry',
+    'fear': 'anxious',
+    'love': 'satisfied',
+    'surprise': 'surprised'
+}
+
+DEFAULT_BATCH_SIZE = 32
+
+# Long texts are scored as overlapping token windows. Windows stay below the
+# 512-token limit with room for special tokens and the emotion model's
+# (RoBERTa) tokenizer, which splits text slightly differently.
+WINDOW_TOKENS = 448
+WINDOW_OVERLAP = 64
+
+# Inference heads a caller can ask for
+OUTPUTS = ('sentiment', 'emotion')
+
+SENTIMENT_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+EMOTION_MODEL = "j-hartmann/emotion-english-distilroberta-base"
+
+
+def normalize_outputs(outputs):
+    """Validate requested heads; accepts a list or comma-separated string"""
+    if outputs is None:
+        return OUTPUTS
+    if isinstance(outputs, str):
+        outputs = [o.strip() for o in outputs.split(',') if o.strip()]
+    
+    unknown = set(outputs) - set(OUTPUTS)
+    if unknown:
+        raise ValueError(f"Unknown outputs: {', '.join(sorted(unknown))}. Choose from: {', '.join(OUTPUTS)}")
+    if not outputs:
+        raise ValueError(f"At least one output is required: {', '.join(OUTPUTS)}")
+    return tuple(o for o in OUTPUTS if o in outputs)
+
+
+def select_outputs(result, outputs=OUTPUTS, compact=False):
+    """Drop the fields of heads that were not requested (and echoes if compact)"""
+    drop = set()
+    if 'sentiment' not in outputs:
+        drop |= {'sentiment', 'confidence'}
+    if 'emotion' not in outputs:
+        drop |= {'emotion', 'all_emotions'}
+    if compact:
+        drop |= {'all_emotions', 'original_text', 'processed_text'}
+    if not drop:
+        return result
+    return {k: v for k, v in result.items() if k not in drop}
+
 
 class SentimentAnalyzer:
-    def __init__(self):
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, backend='pytorch', cache_dir='./models/cache',
+                 offline=False, tfidf_model_path=None, student_model_path=None,
+                 sentiment_model=SENTIMENT_MODEL, emotion_model=EMOTION_MODEL):
         # Lazy loading - models will be loaded only when needed
         self._emotion_classifier = None
         self._sentiment_analyzer = None
+        self.batch_size = batch_size
+        self.backend = backend
+        self.cache_dir = cache_dir
+        self.model_store = ModelStore(cache_dir, offline=offline)
+        self.tfidf_model_path = tfidf_model_path
+        self.student_model_path = student_model_path
+        self.sentiment_model = sentiment_model
+        self.emotion_model = emotion_model
+        self._student = None
         print("✅ Sentiment Analyzer initialized (models will load on first use)")
     
+    def _load_classifier(self, task, model_name, return_all_scores=False):
+        """Build a classifier for the configured backend"""
+        if self.backend == 'onnx':
+            try:
+                from models.onnx_backend import OnnxTextClassifier
+                return OnnxTextClassifier(
+                    model_name, self.cache_dir,
+                    return_all_scores=return_all_scores,
+                    source=self.model_store.ensure(model_name)
+                )
+            except Exception as e:
+                print(f"⚠️ ONNX backend unavailable for {model_name}: {e}")
+                print("Using PyTorch pipeline instead...")
+        
+        from core.thread_budget import configure_torch
+        from transformers import pipeline
+        configure_torch()
+        model, tokenizer = self.model_store.load(model_name)
+        kwargs = {'top_k': None} if return_all_scores else {}
+        return pipeline(task, model=model, tokenizer=tokenizer, device=-1, **kwargs)  # Use CPU
+    
+    def _load_student(self):
+        """The distilled student shared by both heads, or None if unavailable"""
+        if self.backend != 'student':
+            return None
+        if self._student is None:
+            try:
+                self._student = StudentModel(self.student_model_path)
+                print("✅ Student model loaded!")
+            except Exception as e:
+                print(f"⚠️ Could not load student model {self.student_model_path}: {e}")
+                print("Using transformer models instead...")
+                self._student = False
+        return self._student or None
+    
     @property
     def emotion_classifier(self):
         """Lazy load emotion classifier"""
         if self._emotion_classifier is None:
+            if self.backend == 'lexicon':
+                self._emotion_classifier = "fallback"
+                return self._emotion_classifier
             print("📥 Loading emotion detection model (this may take a moment)...")
+            student = self._load_student()
+            if student is not None and 'emotion' in student.heads:
+                self._emotion_classifier = student
+                return self._emotion_classifier
             try:
-                from transformers import pipeline
-                self._emotion_classifier = pipeline(
-                    "text-classification",
-                    model="j-hartmann/emotion-english-distilroberta-base",
-                    return_all_scores=True,
-                    device=-1  # Use CPU
+                self._emotion_classifier = self._load_classifier(
+                    "text-classification", self.emotion_model, return_all_scores=True
                 )
                 print("✅ Emotion model loaded!")
             except Exception as e:
@@ -32,13 +140,25 @@ class SentimentAnalyzer:
     def sentiment_analyzer(self):
         """Lazy load sentiment analyzer"""
         if self._sentiment_analyzer is None:
+            if self.backend == 'lexicon':
+                self._sentiment_analyzer = "fallback"
+                return self._sentiment_analyzer
             print("📥 Loading sentiment analysis model...")
+            student = self._load_student()
+            if student is not None and 'sentiment' in student.heads:
+                self._sentiment_analyzer = student
+                return self._sentiment_analyzer
+            if self.backend == 'tfidf' and self.tfidf_model_path:
+                try:
+                    self._sentiment_analyzer = TfidfSentimentModel(self.tfidf_model_path)
+                    print("✅ TF-IDF sentiment model loaded!")
+                    return self._sentiment_analyzer
+                except Exception as e:
+                    print(f"⚠️ Could not load TF-IDF model {self.tfidf_model_path}: {e}")
+                    print("Using transformer sentiment model instead...")
             try:
-                from transformers import pipeline
-                self._sentiment_analyzer = pipeline(
-                    "sentiment-analysis",
-                    model="distilbert-base-uncased-finetuned-sst-2-english",
-                    device=-1  # Use CPU
+                self._sentiment_analyzer = self._load_classifier(
+                    "sentiment-analysis", self.sentiment_model, return_all_scores=True
                 )
                 print("✅ Sentiment model loaded!")
             except Exception as e:
@@ -48,115 +168,292 @@ class SentimentAnalyzer:
         return self._sentiment_analyzer
     
     def preprocess_text(self, text):
-        # Remove URLs
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-        # Remove special characters
-        text = re.sub(r'[^\w\s]', '', text)
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-        return text.lower()
+        # Strip URLs and punctuation, collapse whitespace, lowercase
+        return clean_model_text(text)
     
-    def fallback_sentiment(self, text):
-        """Simple rule-based sentiment analysis as fallback"""
-        positive_words = ['good', 'great', 'excellent', 'amazing', 'wonderful', 'fantastic', 
-                         'love', 'best', 'perfect', 'awesome', 'beautiful', 'nice', 'happy']
-        negative_words = ['bad', 'terrible', 'awful', 'horrible', 'worst', 'hate', 'poor',
-                         'disappointing', 'waste', 'never', 'not', 'no', 'sad', 'angry']
-        
-        text_lower = text.lower()
-        pos_count = sum(1 for word in positive_words if word in text_lower)
-        neg_count = sum(1 for word in negative_words if word in text_lower)
-        
-        if pos_count > neg_count:
+    @staticmethod
+    def _sentiment_from_counts(counts):
+        if counts['positive'] > counts['negative']:
             return 'positive', 0.7
-        elif neg_count > pos_count:
+        elif counts['negative'] > counts['positive']:
             return 'negative', 0.7
         else:
             return 'neutral', 0.5
     
-    def fallback_emotion(self, text):
-        """Simple rule-based emotion detection as fallback"""
-        text_lower = text.lower()
-        
-        emotions = {
-            'happy': ['happy', 'joy', 'great', 'excellent', 'love', 'wonderful'],
-            'angry': ['angry', 'hate', 'terrible', 'worst', 'awful'],
-            'sad': ['sad', 'disappointed', 'unhappy', 'depressed'],
-            'satisfied': ['satisfied', 'good', 'nice', 'okay', 'fine'],
-            'surprised': ['surprised', 'wow', 'amazing', 'incredible'],
-            'anxious': ['worried', 'anxious', 'nervous', 'concerned']
+    @staticmethod
+    def _emotion_from_counts(counts):
+        scores = {
+            emotion: counts[emotion] / len(keywords)
+            for emotion, keywords in EMOTION_KEYWORDS.items()
         }
-        
-        scores = {}
-        for emotion, keywords in emotions.items():
-            score = sum(1 for word in keywords if word in text_lower)
-            scores[emotion] = score / len(keywords)
-        
         dominant = max(scores, key=scores.get) if any(scores.values()) else 'neutral'
         return dominant, scores
     
-    def analyze(self, text):
-        # Preprocess
+    def fallback_sentiment(self, text):
+        """Simple rule-based sentiment analysis as fallback"""
+        return self._sentiment_from_counts(FALLBACK_LEXICON.count(text))
+    
+    def fallback_emotion(self, text):
+        """Simple rule-based emotion detection as fallback"""
+        return self._emotion_from_counts(FALLBACK_LEXICON.count(text))
+    
+    def _neutral_result(self):
+        return {
+            'sentiment': 'neutral',
+            'emotion': 'neutral',
+            'confidence': 0.0,
+            'all_emotions': {}
+        }
+    
+    def _build_result(self, text, clean_text, sentiment, confidence, dominant_emotion, emotions):
+        return {
+            'sentiment': sentiment,
+            'emotion': dominant_emotion,
+            'confidence': round(confidence, 4),
+            'all_emotions': {k: round(v, 4) for k, v in emotions.items()},
+            'original_text': text,
+            'processed_text': clean_text
+        }
+    
+    def _fallback_result(self, text, clean_text, counts=None):
+        counts = counts or FALLBACK_LEXICON.count(clean_text)
+        sentiment, confidence = self._sentiment_from_counts(counts)
+        dominant_emotion, emotions = self._emotion_from_counts(counts)
+        return self._build_result(text, clean_text, sentiment, confidence, dominant_emotion, emotions)
+    
+    def analyze(self, text, outputs=OUTPUTS, compact=False):
+        return self.batch_analyze([text], outputs=outputs, compact=compact)[0]
+    
+    def fallback_analyze(self, text, outputs=OUTPUTS, compact=False):
+        """Rule-based result only, without touching the models"""
         clean_text = self.preprocess_text(text)
+        if not clean_text:
+            return select_outputs(self._neutral_result(), outputs, compact)
+        return select_outputs(self._fallback_result(text, clean_text), outputs, compact)
+    
+    def fallback_analyze_batch(self, texts, outputs=OUTPUTS, compact=False):
+        """``fallback_analyze`` for many texts, one lexicon pass per text"""
+        clean_texts = preprocess_batch(texts)
+        pending = [i for i, clean_text in enumerate(clean_texts) if clean_text]
+        counts = FALLBACK_LEXICON.count_batch([clean_texts[i] for i in pending])
+        sentiment = self._lexicon_sentiment_columns(counts) if 'sentiment' in outputs else None
+        emotion = self._lexicon_emotion_columns(counts) if 'emotion' in outputs else None
+        return self._collect(len(texts), outputs, clean_texts, pending, sentiment, emotion).to_dicts(texts, compact)
+    
+    def lexicon_analyze(self, text, outputs=OUTPUTS, compact=False):
+        """Rule-based result plus the lexicon margin.
         
+        The margin is |pos - neg| / (pos + neg + 1): 0 when the keywords
+        disagree or are absent, approaching 1 as one side dominates.
+        """
+        clean_text = self.preprocess_text(text)
         if not clean_text:
-            return {
-                'sentiment': 'neutral',
-                'emotion': 'neutral',
-                'confidence': 0.0,
-                'all_emotions': {}
-            }
+            return select_outputs(self._neutral_result(), outputs, compact), 1.0
+        
+        counts = FALLBACK_LEXICON.count(clean_text)
+        pos_count, neg_count = counts['positive'], counts['negative']
+        margin = abs(pos_count - neg_count) / (pos_count + neg_count + 1)
+        sentiment, _ = self._sentiment_from_counts(counts)
+        dominant_emotion, emotions = self._emotion_from_counts(counts)
+        
+        result = self._build_result(
+            text, clean_text, sentiment, 0.5 + margin / 2, dominant_emotion, emotions
+        )
+        return select_outputs(result, outputs, compact), margin
+    
+    def _split_windows(self, texts, classifier):
+        """Split texts into overlapping windows of at most WINDOW_TOKENS tokens.
+        
+        Returns (windows, owners, lengths): the text of each window, the
+        index of the text it came from and its token count. Texts that fit
+        in one window are passed through unchanged.
+        """
+        tokenizer = getattr(classifier, 'tokenizer', None)
+        if tokenizer is None:
+            return list(texts), list(range(len(texts))), [len(t.split()) for t in texts]
+        
+        encoded = tokenizer(texts, add_special_tokens=False, return_offsets_mapping=True)
+        step = WINDOW_TOKENS - WINDOW_OVERLAP
+        windows, owners, lengths = [], [], []
+        
+        for i, (text, offsets) in enumerate(zip(texts, encoded['offset_mapping'])):
+            n = len(offsets)
+            if n <= WINDOW_TOKENS:
+                windows.append(text)
+                owners.append(i)
+                lengths.append(n)
+                continue
+            
+            for start in range(0, n - WINDOW_OVERLAP, step):
+                end = min(start + WINDOW_TOKENS, n)
+                windows.append(text[offsets[start][0]:offsets[end - 1][1]])
+                owners.append(i)
+                lengths.append(end - start)
+        
+        return windows, owners, lengths
+    
+    def _score_windows(self, classifier, windows, owners, lengths, num_texts, batch_size):
+        """Score all windows in shared batches, then average per text.
+        
+        Windows are sorted by token length so each batch is padded only to
+        its own longest window. Scores are averaged per text, weighted by
+        window length.
+        """
+        order = sorted(range(len(windows)), key=lambda j: lengths[j], reverse=True)
+        outputs = classifier([windows[j] for j in order], batch_size=batch_size, truncation=True)
+        
+        totals = [{} for _ in range(num_texts)]
+        weights = [0] * num_texts
+        for j, output in zip(order, outputs):
+            owner, weight = owners[j], max(lengths[j], 1)
+            weights[owner] += weight
+            for e in output:
+                totals[owner][e['label']] = totals[owner].get(e['label'], 0.0) + e['score'] * weight
+        
+        return [
+            {label: score / weights[i] for label, score in total.items()}
+            for i, total in enumerate(totals)
+        ]
+    
+    def _parse_sentiment(self, scores):
+        positive = scores.get('POSITIVE', 0.0)
+        negative = scores.get('NEGATIVE', 0.0)
+        if positive >= negative:
+            return 'positive', positive
+        return 'negative', negative
+    
+    @staticmethod
+    def _lexicon_sentiment_columns(counts):
+        """Columnar ``_sentiment_from_counts``: (codes, labels, confidences)"""
+        positive = np.array([c['positive'] for c in counts])
+        negative = np.array([c['negative'] for c in counts])
+        codes = (np.sign(positive - negative) + 1).astype(np.int16)  # negative, neutral, positive
+        return codes, ('negative', 'neutral', 'positive'), np.where(codes == 1, 0.5, 0.7)
+    
+    @staticmethod
+    def _lexicon_emotion_columns(counts):
+        """Columnar ``_emotion_from_counts``: (codes, labels, names, scores)"""
+        labels = tuple(EMOTION_KEYWORDS)
+        sizes = np.array([len(EMOTION_KEYWORDS[e]) for e in labels])
+        scores = np.array([[c[e] for e in labels] for c in counts], dtype=np.float64).reshape(-1, len(labels)) / sizes
+        codes = np.where(scores.max(axis=1, initial=0) > 0, scores.argmax(axis=1), NO_EMOTION)
+        return codes, labels, labels, scores
+    
+    @staticmethod
+    def _model_sentiment_columns(classes, probs):
+        """(codes, labels, confidences) from a class probability matrix"""
+        class_codes, labels = encode_labels(classes)
+        best = probs.argmax(axis=1)
+        return class_codes[best], labels, probs[np.arange(len(best)), best]
+    
+    @staticmethod
+    def _emotion_score_columns(score_dicts):
+        """(codes, labels, names, scores) from per-text {model label: score}"""
+        labels = tuple(dict.fromkeys(label for scores in score_dicts for label in scores))
+        scores = np.array([[s.get(label, 0.0) for label in labels] for s in score_dicts], dtype=np.float64)
+        names = tuple(EMOTION_MAP.get(label, label) for label in labels)
+        return scores.argmax(axis=1), labels, names, scores
+    
+    @staticmethod
+    def _collect(size, outputs, clean_texts, pending, sentiment=None, emotion=None):
+        """Scatter the columns computed for the ``pending`` texts into a BatchResult"""
+        result = BatchResult(
+            size, outputs,
+            emotion_labels=emotion[1] if emotion else (),
+            emotion_names=emotion[2] if emotion else None,
+            sentiment_labels=sentiment[1] if sentiment else ('negative', 'neutral', 'positive'),
+            processed_texts=clean_texts, decimals=4
+        )
+        rows = np.asarray(pending, dtype=np.intp)
+        result.scored[rows] = True
+        if sentiment:
+            result.sentiment_codes[rows] = sentiment[0]
+            result.confidences[rows] = sentiment[2]
+        if emotion:
+            result.emotion_codes[rows] = emotion[0]
+            result.emotion_scores[rows] = emotion[3]
+        return result
+    
+    def batch_analyze(self, texts, batch_size=None, outputs=OUTPUTS, compact=False):
+        """``analyze_batch`` as one result dict per text (see BatchResult.to_dicts)"""
+        return self.analyze_batch(texts, batch_size, outputs).to_dicts(texts, compact)
+    
+    def analyze_batch(self, texts, batch_size=None, outputs=OUTPUTS):
+        """Analyze many texts with batched forward passes, as a columnar BatchResult.
+        
+        Texts are preprocessed once and split into token windows (long
+        reviews become several overlapping windows). All windows from all
+        texts are sorted by length into padded buckets of ``batch_size``
+        and run through the pipelines, then window scores are merged back
+        into one row per text, in the original order.
+        
+        Only the heads listed in ``outputs`` are run.
+        """
+        batch_size = batch_size or self.batch_size
+        clean_texts = preprocess_batch(texts)
+        pending = [i for i, clean_text in enumerate(clean_texts) if clean_text]
+        if not pending:
+            return self._collect(len(texts), outputs, clean_texts, pending)
         
         try:
-            # Try using ML models
-            if self.sentiment_analyzer == "fallback":
-                sentiment, confidence = self.fallback_sentiment(clean_text)
-            else:
-                sentiment_result = self.sentiment_analyzer(clean_text)[0]
-                sentiment = 'positive' if sentiment_result['label'] == 'POSITIVE' else 'negative'
-                confidence = sentiment_result['score']
+            pending_texts = [clean_texts[i] for i in pending]
+            sentiment_model = self.sentiment_analyzer if 'sentiment' in outputs else None
+            emotion_model = self.emotion_classifier if 'emotion' in outputs else None
+            sentiment, emotion = None, None
             
-            if self.emotion_classifier == "fallback":
-                dominant_emotion, emotions = self.fallback_emotion(clean_text)
-            else:
-                emotion_results = self.emotion_classifier(clean_text)[0]
-                emotions = {e['label']: e['score'] for e in emotion_results}
-                dominant_emotion = max(emotions, key=emotions.get)
-                
-                # Map emotions to simplified categories
-                emotion_map = {
-                    'joy': 'happy',
-                    'sadness': 'sad',
-                    'anger': 'angry',
-                    'fear': 'anxious',
-                    'love': 'satisfied',
-                    'surprise': 'surprised'
-                }
-                dominant_emotion = emotion_map.get(dominant_emotion, dominant_emotion)
+            counts = None
+            if "fallback" in (sentiment_model, emotion_model):
+                counts = FALLBACK_LEXICON.count_batch(pending_texts)
             
-            return {
-                'sentiment': sentiment,
-                'emotion': dominant_emotion,
-                'confidence': round(confidence, 4),
-                'all_emotions': {k: round(v, 4) for k, v in emotions.items()},
-                'original_text': text,
-                'processed_text': clean_text
-            }
+            # Windows are cut with the first requested transformer's tokenizer
+            windows = None
+            transformers = [
+                m for m in (sentiment_model, emotion_model)
+                if m is not None and m != "fallback" and not isinstance(m, (TfidfSentimentModel, StudentModel))
+            ]
+            if transformers:
+                windows = self._split_windows(pending_texts, transformers[0])
             
-        except Exception as e:
-            print(f"Error in analysis: {e}")
-            # Fallback to rule-based
-            sentiment, confidence = self.fallback_sentiment(clean_text)
-            dominant_emotion, emotions = self.fallback_emotion(clean_text)
+            # The student scores raw text, both heads from one featurization
+            student_heads = [
+                head for head, model in (('sentiment', sentiment_model), ('emotion', emotion_model))
+                if isinstance(model, StudentModel)
+            ]
+            student_scores = {}
+            if student_heads:
+                student = sentiment_model if 'sentiment' in student_heads else emotion_model
+                student_scores = student.score_heads([texts[i] for i in pending], student_heads)
+            
+            if sentiment_model == "fallback":
+                sentiment = self._lexicon_sentiment_columns(counts)
+            elif 'sentiment' in student_scores:
+                sentiment = self._model_sentiment_columns(*student_scores['sentiment'])
+            elif isinstance(sentiment_model, TfidfSentimentModel):
+                # Trained on raw text with its own tokenizer; texts are never windowed
+                probs = sentiment_model.predict_proba([texts[i] for i in pending])
+                sentiment = self._model_sentiment_columns(sentiment_model.classes, probs)
+            elif sentiment_model is not None:
+                pairs = [
+                    self._parse_sentiment(scores) for scores in self._score_windows(
+                        sentiment_model, *windows, len(pending_texts), batch_size
+                    )
+                ]
+                codes, labels = encode_labels([label for label, _ in pairs])
+                sentiment = codes, labels, np.array([confidence for _, confidence in pairs])
             
-            return {
-                'sentiment': sentiment,
-                'emotion': dominant_emotion,
-                'confidence': round(confidence, 4),
-                'all_emotions': {k: round(v, 4) for k, v in emotions.items()},
-                'original_text': text,
-                'processed_text': clean_text
-            }
-    
-    def batch_analyze(self, texts):
-        return [self.analyze(text) for text in texts]
+            if emotion_model == "fallback":
+                emotion = self._lexicon_emotion_columns(counts)
+            elif 'emotion' in student_scores:
+                classes, probs = student_scores['emotion']
+                emotion = probs.argmax(axis=1), tuple(classes), tuple(classes), probs
+            elif emotion_model is not None:
+                emotion = self._emotion_score_columns(self._score_windows(
+                    emotion_model, *windows, len(pending_texts), batch_size
+                ))
+        except Exception as e:
+            print(f"Error in batch analysis: {e}")
+            counts = FALLBACK_LEXICON.count_batch([clean_texts[i] for i in pending])
+            sentiment = self._lexicon_sentiment_columns(counts) if 'sentiment' in outputs else None
+            emotion = self._lexicon_emotion_columns(counts) if 'emotion' in outputs else None
+        
+        return self._collect(len(texts), outputs, clean_texts, pending, sentiment, emotion)
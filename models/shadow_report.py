@@ -0,0 +1,55 @@
+"""
+Shadow scoring report model
+"""
+from datetime import datetime
+from core.extensions import db
+
+class ShadowReport(db.Model):
+    """Agreement and latency of a candidate model against the serving one,
+    accumulated over one flush window of sampled traffic"""
+    __tablename__ = 'shadow_reports'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    primary_version = db.Column(db.String(64), nullable=False, index=True)
+    candidate_version = db.Column(db.String(64), nullable=False, index=True)
+    
+    texts = db.Column(db.Integer, default=0)
+    sentiment_compared = db.Column(db.Integer, default=0)
+    sentiment_agreements = db.Column(db.Integer, default=0)
+    emotion_compared = db.Column(db.Integer, default=0)
+    emotion_agreements = db.Column(db.Integer, default=0)
+    # Mean per-text latency; the primary's includes queueing in the request path
+    primary_latency_ms = db.Column(db.Float, default=0.0)
+    candidate_latency_ms = db.Column(db.Float, default=0.0)
+    # Sampled texts dropped because the shadow queue was full, and candidate failures
+    dropped = db.Column(db.Integer, default=0)
+    errors = db.Column(db.Integer, default=0)
+    
+    window_start = db.Column(db.DateTime, nullable=False)
+    window_end = db.Column(db.DateTime, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f'<ShadowReport {self.candidate_version} vs {self.primary_version} - {self.texts} texts>'
+    
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'id': self.id,
+            'primary_version': self.primary_version,
+            'candidate_version': self.candidate_version,
+            'texts': self.texts,
+            'sentiment_agreement': (
+                round(self.sentiment_agreements / self.sentiment_compared, 4)
+                if self.sentiment_compared else None
+            ),
+            'emotion_agreement': (
+                round(self.emotion_agreements / self.emotion_compared, 4)
+                if self.emotion_compared else None
+            ),
+            'primary_latency_ms': self.primary_latency_ms,
+            'candidate_latency_ms': self.candidate_latency_ms,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'window_start': self.window_start.isoformat(),
+            'window_end': self.window_end.isoformat()
+        }
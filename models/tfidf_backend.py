@@ -0,0 +1,197 @@
+"""
+Pickle-free TF-IDF + logistic regression sentiment backend
+
+python/train_advanced_model.py exports the fitted pipeline as a plain
+``.npz`` artifact (vocabulary, idf vector, coefficients and the vectorizer
+settings). This module serves it with NumPy/SciPy sparse math only:
+scikit-learn is not imported and nothing is unpickled. Members are stored
+uncompressed so the arrays are memory-mapped straight from the file.
+
+Unlike the SST-2 transformer, the model has a neutral class.
+"""
+import os
+import re
+import zipfile
+import numpy as np
+from scipy import sparse
+
+# Vectorizer settings the serving code reproduces exactly
+SUPPORTED_VECTORIZER = {
+    'analyzer': 'word',
+    'preprocessor': None,
+    'tokenizer': None,
+    'stop_words': None,
+    'strip_accents': None,
+    'binary': False,
+    'use_idf': True,
+}
+
+
+def export_tfidf_model(pipeline, path):
+    """Write a fitted TfidfVectorizer + LogisticRegression pipeline to ``path`` (.npz)"""
+    vectorizer, classifier = pipeline.steps[0][1], pipeline.steps[-1][1]
+
+    for name, expected in SUPPORTED_VECTORIZER.items():
+        if getattr(vectorizer, name) != expected:
+            raise ValueError(f"Unsupported TfidfVectorizer setting {name}={getattr(vectorizer, name)!r}")
+    if vectorizer.norm not in ('l1', 'l2', None):
+        raise ValueError(f"Unsupported TfidfVectorizer norm {vectorizer.norm!r}")
+
+    # Mirrors LogisticRegression's choice between softmax and one-vs-rest
+    multi_class = getattr(classifier, 'multi_class', 'auto')
+    one_vs_rest = multi_class == 'ovr' or (multi_class == 'auto' and classifier.solver == 'liblinear')
+
+    vocabulary = np.empty(len(vectorizer.vocabulary_), dtype=object)
+    for term, column in vectorizer.vocabulary_.items():
+        vocabulary[column] = term
+
+    arrays = {
+        'vocabulary': vocabulary.astype(str),
+        'idf': vectorizer.idf_.astype(np.float64),
+        'coef': classifier.coef_.astype(np.float64),
+        'intercept': classifier.intercept_.astype(np.float64),
+        'classes': np.asarray(classifier.classes_).astype(str),
+        'ngram_range': np.asarray(vectorizer.ngram_range, dtype=np.int64),
+        'token_pattern': np.asarray(vectorizer.token_pattern),
+        'lowercase': np.asarray(vectorizer.lowercase),
+        'sublinear_tf': np.asarray(vectorizer.sublinear_tf),
+        'norm': np.asarray(vectorizer.norm or ''),
+        'one_vs_rest': np.asarray(one_vs_rest),
+    }
+
+    # Write next to the target and rename, so readers never map a partial file
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_npz_mmap(path):
+    """Load every member of an uncompressed .npz as a read-only memmap"""
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path}: member {info.filename} is compressed and cannot be mapped")
+
+            # Local file header: 30 fixed bytes, then file name and extra field
+            f.seek(info.header_offset + 26)
+            name_length, extra_length = (int(n) for n in np.frombuffer(f.read(4), dtype='<u2'))
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            name = info.filename[:-len('.npy')]
+            if dtype.hasobject:
+                raise ValueError(f"{path}: member {name} holds Python objects")
+            if not shape or 0 in shape:
+                # Scalars and empty arrays are tiny, and mmap rejects empty ranges
+                arrays[name] = np.fromfile(f, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+            else:
+                arrays[name] = np.memmap(
+                    path, dtype=dtype, mode='r', offset=f.tell(), shape=shape,
+                    order='F' if fortran_order else 'C'
+                )
+    return arrays
+
+
+def linear_probabilities(scores, one_vs_rest=False):
+    """Class probabilities from linear decision scores, as sklearn computes them
+
+    A single score column is a binary model (sigmoid). Otherwise scores
+    go through softmax, or normalized sigmoids for one-vs-rest models.
+    """
+    scores = np.array(scores, dtype=np.float64)
+
+    if scores.shape[1] == 1:
+        positive = 1 / (1 + np.exp(-scores[:, 0]))
+        return np.column_stack([1 - positive, positive])
+    if one_vs_rest:
+        probs = 1 / (1 + np.exp(-scores))
+        return probs / probs.sum(axis=1, keepdims=True)
+
+    scores -= scores.max(axis=1, keepdims=True)
+    probs = np.exp(scores)
+    return probs / probs.sum(axis=1, keepdims=True)
+
+
+class TfidfSentimentModel:
+    """Scores texts with an exported TF-IDF + logistic regression model"""
+
+    def __init__(self, path):
+        arrays = load_npz_mmap(path)
+        self.path = path
+        self.idf = arrays['idf']
+        self.coef_t = arrays['coef'].T
+        self.intercept = np.asarray(arrays['intercept'])
+        self.classes = [str(c) for c in arrays['classes']]
+        self.vocabulary = {term: i for i, term in enumerate(arrays['vocabulary'].tolist())}
+        self.min_n, self.max_n = (int(n) for n in arrays['ngram_range'])
+        self.lowercase = bool(arrays['lowercase'])
+        self.sublinear_tf = bool(arrays['sublinear_tf'])
+        self.norm = str(arrays['norm']) or None
+        self.one_vs_rest = bool(arrays['one_vs_rest'])
+        self._token_pattern = re.compile(str(arrays['token_pattern']))
+
+    def _terms(self, text):
+        """Word n-grams of text, as TfidfVectorizer(analyzer='word') builds them"""
+        if self.lowercase:
+            text = text.lower()
+        tokens = self._token_pattern.findall(text)
+        if self.max_n == 1:
+            return tokens
+
+        terms = list(tokens) if self.min_n == 1 else []
+        for n in range(max(self.min_n, 2), min(self.max_n, len(tokens)) + 1):
+            terms.extend(' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return terms
+
+    def transform(self, texts):
+        """TF-IDF matrix (CSR, texts x vocabulary) for a batch of texts"""
+        vocabulary = self.vocabulary
+        indices, indptr = [], [0]
+        for text in texts:
+            indices.extend(vocabulary[t] for t in self._terms(text) if t in vocabulary)
+            indptr.append(len(indices))
+
+        matrix = sparse.csr_matrix(
+            (np.ones(len(indices)), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(texts), len(self.idf))
+        )
+        matrix.sum_duplicates()
+
+        if self.sublinear_tf:
+            np.log(matrix.data, out=matrix.data)
+            matrix.data += 1
+        matrix.data *= self.idf[matrix.indices]
+
+        if self.norm:
+            if self.norm == 'l2':
+                row_norms = np.sqrt(matrix.multiply(matrix).sum(axis=1))
+            else:
+                row_norms = abs(matrix).sum(axis=1)
+            row_norms = np.asarray(row_norms).ravel()
+            row_norms[row_norms == 0] = 1
+            matrix.data /= np.repeat(row_norms, np.diff(matrix.indptr))
+        return matrix
+
+    def predict_proba(self, texts):
+        """Class probabilities, one row per text, columns in ``classes`` order"""
+        scores = self.transform(texts) @ self.coef_t + self.intercept
+        return linear_probabilities(scores, self.one_vs_rest)
+
+    def predict(self, texts):
+        """(label, confidence) per text"""
+        if not texts:
+            return []
+        probs = self.predict_proba(texts)
+        best = probs.argmax(axis=1)
+        return [
+            (self.classes[label], float(confidence))
+            for label, confidence in zip(best, probs[np.arange(len(best)), best])
+        ]
@@ -59,6 +59,12 @@ def create_app(config_name=None):
     def index():
         return render_template('index.html')
     
+    # Warm start: with gunicorn --preload this runs once in the master, and
+    # forked workers share the loaded weights copy-on-write
+    if app.config['WARM_START']:
+        from services.sentiment_service import get_sentiment_service
+        get_sentiment_service().warmup()
+    
     # Create database tables
     with app.app_context():
         from core.extensions import db
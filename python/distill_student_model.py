@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Student Model Distillation Script (OPTIONAL)
+
+Trains a fast student for bulk historical re-scoring from the sentiment
+and emotion labels the transformer models (the teacher) already stored
+in the reviews table. The student is a linear model over hashed word
+n-grams (models/student_backend.py); each row is weighted by the
+teacher's confidence, so uncertain labels count for less. Only rows a
+model version labelled are used: rows without a model_version and rows
+the keyword rules answered (degraded, cascade or budget misses) are
+skipped, and ``--teacher-version`` narrows it to given versions.
+
+Rows are streamed in id order and trained with SGD partial_fit, so the
+table never has to fit in memory. Every ``--holdout-every``-th row is
+held out (up to ``--holdout-max`` rows) and used for the agreement
+report, written next to the model, which compares student and teacher
+labels per head and per class and measures throughput.
+
+Requirements:
+pip install scikit-learn numpy scipy
+
+Serve the result with INFERENCE_BACKEND=student and STUDENT_MODEL_PATH.
+
+Usage:
+  python python/distill_student_model.py --source db
+  python python/distill_student_model.py --source reviews.jsonl --epochs 2
+"""
+
+import os
+import sys
+import csv
+import json
+import argparse
+import logging
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Labels the teacher produces per head
+SENTIMENT_CLASSES = ('negative', 'neutral', 'positive')
+EMOTION_CLASSES = ('angry', 'anxious', 'disgust', 'happy', 'neutral', 'sad', 'satisfied', 'surprised')
+
+# Confidence weights are clipped so no stored label is ignored entirely
+MIN_SAMPLE_WEIGHT = 0.05
+
+# model_version of results from the keyword rules (services/sentiment_service.py)
+RULES_VERSION = 'lexicon'
+
+# Agreement with the teacher the student is expected to reach
+TARGET_AGREEMENT = 0.95
+
+
+def is_teacher_label(model_version, teacher_versions=None):
+    """Whether a row's label came from a model (one of ``teacher_versions``, if given)"""
+    if not model_version or model_version == RULES_VERSION:
+        return False
+    return not teacher_versions or model_version in teacher_versions
+
+
+def iter_teacher_rows(source, chunk_size=10000, database_url=None, teacher_versions=None):
+    """Yield chunks of (id, text, sentiment, emotion, confidence) rows
+
+    ``source`` is a .csv/.jsonl export of the reviews table or 'db'. Files
+    without an id column use the row number; files with a model_version
+    column are filtered like the table.
+    """
+    if source == 'db':
+        yield from _iter_db_rows(chunk_size, database_url, teacher_versions)
+        return
+
+    with open(source, newline='', encoding='utf-8') as f:
+        if source.endswith(('.jsonl', '.ndjson')):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+
+        chunk = []
+        for number, row in enumerate(rows, 1):
+            if 'model_version' in row and not is_teacher_label(row['model_version'], teacher_versions):
+                continue
+            chunk.append((
+                int(row.get('id') or number), row['text'], row['sentiment'],
+                row['emotion'], float(row.get('confidence') or 1.0)
+            ))
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def _iter_db_rows(chunk_size, database_url, teacher_versions=None):
+    """Keyset-paginated reads of model-labelled reviews, ordered by id"""
+    from sqlalchemy import bindparam, create_engine, text as sql
+
+    if database_url is None:
+        from config import get_config
+        database_url = get_config().SQLALCHEMY_DATABASE_URI
+
+    where = "id > :last_id AND model_version IS NOT NULL AND model_version != :rules"
+    params = {'rules': RULES_VERSION, 'limit': chunk_size}
+    if teacher_versions:
+        where += " AND model_version IN :versions"
+        params['versions'] = list(teacher_versions)
+    query = sql(
+        f"SELECT id, text, sentiment, emotion, confidence FROM reviews WHERE {where} ORDER BY id LIMIT :limit"
+    )
+    if teacher_versions:
+        query = query.bindparams(bindparam('versions', expanding=True))
+    engine = create_engine(database_url)
+    last_id = 0
+    try:
+        while True:
+            with engine.connect() as conn:
+                rows = conn.execute(query, {**params, 'last_id': last_id}).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [tuple(row) for row in rows]
+    finally:
+        engine.dispose()
+
+
+def _agreement(student_labels, teacher_labels, confidences, high_confidence):
+    """Agreement overall, on confident teacher labels and per teacher class"""
+    matches = [s == t for s, t in zip(student_labels, teacher_labels)]
+    confident = [m for m, c in zip(matches, confidences) if c >= high_confidence]
+
+    per_class = {}
+    for match, label in zip(matches, teacher_labels):
+        stats = per_class.setdefault(label, {'support': 0, 'agreement': 0})
+        stats['support'] += 1
+        stats['agreement'] += match
+    for stats in per_class.values():
+        stats['agreement'] = round(stats['agreement'] / stats['support'], 4)
+
+    return {
+        'rows': len(matches),
+        'agreement': round(sum(matches) / max(len(matches), 1), 4),
+        'high_confidence_rows': len(confident),
+        'high_confidence_agreement': round(sum(confident) / len(confident), 4) if confident else None,
+        'per_class': dict(sorted(per_class.items())),
+    }
+
+
+def _texts_per_second(score, texts, min_seconds=1.0):
+    """Throughput of ``score(texts)``, repeated until it has run min_seconds"""
+    calls, start = 0, time.perf_counter()
+    while True:
+        score(texts)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return calls * len(texts) / elapsed
+
+
+def _teacher_throughput(texts):
+    """Texts/second of the transformer teacher, or None if it cannot load"""
+    from config import get_config
+    from models.sentiment_model import SentimentAnalyzer
+
+    config = get_config()
+    teacher = SentimentAnalyzer(
+        batch_size=config.INFERENCE_BATCH_SIZE,
+        backend='onnx' if config.INFERENCE_BACKEND == 'onnx' else 'pytorch',
+        cache_dir=config.MODEL_CACHE_DIR,
+        offline=config.MODEL_OFFLINE
+    )
+    if "fallback" in (teacher.sentiment_analyzer, teacher.emotion_classifier):
+        return None
+    return _texts_per_second(teacher.batch_analyze, texts, min_seconds=0)
+
+
+def build_agreement_report(model_path, holdout, high_confidence=0.9, teacher_sample=256):
+    """Compare the exported student with the teacher labels of the holdout rows"""
+    from models.student_backend import StudentModel
+
+    student = StudentModel(model_path)
+    texts = [row[1] or '' for row in holdout]
+    predictions = student.predict_heads(texts)
+    confidences = [row[4] for row in holdout]
+
+    report = {
+        'model_path': model_path,
+        'created_at': datetime.utcnow().isoformat(),
+        'target_agreement': TARGET_AGREEMENT,
+        'heads': {
+            'sentiment': _agreement(
+                [label for label, _ in predictions['sentiment']], [row[2] for row in holdout],
+                confidences, high_confidence
+            ),
+            'emotion': _agreement(
+                [label for label, _ in predictions['emotion']], [row[3] for row in holdout],
+                confidences, high_confidence
+            ),
+        },
+        'high_confidence_threshold': high_confidence,
+        'student_texts_per_second': None,
+        'teacher_texts_per_second': None,
+        'speedup': None,
+    }
+    report['meets_target'] = all(
+        head['agreement'] >= TARGET_AGREEMENT for head in report['heads'].values()
+    )
+
+    if texts:
+        report['student_texts_per_second'] = round(_texts_per_second(student.predict_heads, texts), 1)
+    if texts and teacher_sample:
+        try:
+            teacher_rate = _teacher_throughput(texts[:teacher_sample])
+        except Exception as e:
+            logger.warning(f"! Teacher throughput not measured: {e}")
+            teacher_rate = None
+        if teacher_rate:
+            report['teacher_texts_per_second'] = round(teacher_rate, 1)
+            report['speedup'] = round(report['student_texts_per_second'] / teacher_rate, 1)
+        else:
+            logger.warning("! Teacher models unavailable; throughput comparison skipped")
+    return report
+
+
+def distill_student_model(source, output_path='models/sentiment_student.npz', report_path=None,
+                          chunk_size=10000, epochs=1, n_features=2 ** 20, ngram_max=2,
+                          alpha=1e-6, holdout_every=20, holdout_max=20000,
+                          high_confidence=0.9, teacher_sample=256, database_url=None, teacher_versions=None):
+    """
+    Train the student on stored teacher labels and write the agreement report
+    Both heads share one hashed featurization per chunk. Rows whose label
+    is outside a head's classes are skipped for that head only.
+    """
+    try:
+        from sklearn.linear_model import SGDClassifier
+        import numpy as np
+        from models.student_backend import hash_features, export_student_model
+
+        if n_features & (n_features - 1):
+            raise ValueError(f"--n-features must be a power of two, got {n_features}")
+
+        heads = {
+            'sentiment': (2, np.array(SENTIMENT_CLASSES)),
+            'emotion': (3, np.array(EMOTION_CLASSES)),
+        }
+        classifiers = {head: SGDClassifier(loss='log_loss', alpha=alpha) for head in heads}
+        trained = dict.fromkeys(heads, 0)
+        holdout = []
+
+        logger.info(f"Distilling student from {source} (chunks of {chunk_size:,})...")
+        for epoch in range(epochs):
+            for rows in iter_teacher_rows(source, chunk_size, database_url, teacher_versions):
+                train = []
+                for row in rows:
+                    if row[0] % holdout_every == 0:
+                        if epoch == 0 and len(holdout) < holdout_max:
+                            holdout.append(row)
+                        continue
+                    train.append(row)
+                if not train:
+                    continue
+
+                X = hash_features([row[1] or '' for row in train], n_features, ngram_max)
+                weights = np.clip([row[4] for row in train], MIN_SAMPLE_WEIGHT, 1.0)
+                for head, (column, classes) in heads.items():
+                    keep = np.array([row[column] in classes for row in train])
+                    if not keep.any():
+                        continue
+                    y = np.array([row[column] for row in train])[keep]
+                    classifiers[head].partial_fit(X[keep], y, classes=classes, sample_weight=weights[keep])
+                    trained[head] += int(keep.sum())
+            logger.info(f"  epoch {epoch + 1}: {trained['sentiment']:,} sentiment and "
+                        f"{trained['emotion']:,} emotion rows trained")
+
+        missing = [head for head, rows in trained.items() if not rows]
+        if missing:
+            raise ValueError(f"No training rows with known labels for: {', '.join(missing)}")
+
+        export_student_model(output_path, n_features, ngram_max, {
+            head: (clf.classes_, clf.coef_, clf.intercept_) for head, clf in classifiers.items()
+        })
+        logger.info(f"✓ Student model saved to {output_path}")
+
+        report = build_agreement_report(output_path, holdout, high_confidence, teacher_sample)
+        report['training_rows'] = trained
+        report_path = report_path or os.path.splitext(output_path)[0] + '_report.json'
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+        for head, stats in report['heads'].items():
+            logger.info(f"  {head}: agreement {stats['agreement']:.3f} on {stats['rows']:,} holdout rows, "
+                        f"{stats['high_confidence_agreement']} where teacher >= {high_confidence}")
+        if report['speedup']:
+            logger.info(f"  throughput: {report['student_texts_per_second']:,.0f} texts/s, "
+                        f"{report['speedup']:.0f}x the teacher")
+        if not report['meets_target']:
+            logger.warning(f"! Agreement below the {TARGET_AGREEMENT:.0%} target")
+        logger.info(f"✓ Agreement report saved to {report_path}")
+
+        return True
+
+    except ImportError as e:
+        logger.error(f"Missing dependencies: {e}")
+        logger.error("Install with: pip install scikit-learn")
+        return False
+    except Exception as e:
+        logger.error(f"Distillation failed: {e}")
+        return False
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Distill a fast student model from stored teacher labels")
+    parser.add_argument('--source', default='db',
+                        help="Teacher labels: a .csv/.jsonl export of reviews or 'db' (reviews table)")
+    parser.add_argument('--database-url', help="Defaults to the app's SQLALCHEMY_DATABASE_URI")
+    parser.add_argument('--teacher-version', action='append', dest='teacher_versions',
+                        help="Only learn from rows labelled by this model version (repeatable)")
+    parser.add_argument('--output', default='models/sentiment_student.npz')
+    parser.add_argument('--report', help="Agreement report path (default: next to --output)")
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--epochs', type=int, default=1)
+    parser.add_argument('--n-features', type=int, default=2 ** 20, help="Hashed feature width (power of two)")
+    parser.add_argument('--ngram-max', type=int, default=2)
+    parser.add_argument('--alpha', type=float, default=1e-6, help="SGD regularization strength")
+    parser.add_argument('--holdout-every', type=int, default=20, help="Hold out rows whose id is a multiple of this")
+    parser.add_argument('--holdout-max', type=int, default=20000)
+    parser.add_argument('--high-confidence', type=float, default=0.9)
+    parser.add_argument('--teacher-sample', type=int, default=256,
+                        help="Holdout texts timed through the teacher (0 to skip)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    logger.info("=" * 70)
+    logger.info("STUDENT MODEL DISTILLATION (OPTIONAL)")
+    logger.info("=" * 70)
+
+    success = distill_student_model(
+        args.source,
+        output_path=args.output,
+        report_path=args.report,
+        chunk_size=args.chunk_size,
+        epochs=args.epochs,
+        n_features=args.n_features,
+        ngram_max=args.ngram_max,
+        alpha=args.alpha,
+        holdout_every=args.holdout_every,
+        holdout_max=args.holdout_max,
+        high_confidence=args.high_confidence,
+        teacher_sample=args.teacher_sample,
+        teacher_versions=args.teacher_versions,
+        database_url=args.database_url
+    )
+    if not success:
+        logger.error("Distillation failed! Check the error messages above.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -14,16 +14,52 @@ Requirements:
 pip install transformers torch scikit-learn pandas numpy
 
 Note: This requires significant computational resources and time.
+
+Usage:
+  python python/train_advanced_model.py --model tfidf
+  python python/train_advanced_model.py --model streaming --source reviews.csv
+  python python/train_advanced_model.py --model streaming --source db --resume
+  python python/train_advanced_model.py --model search --source reviews.csv --export-best
 """
 
 import os
+import sys
+import csv
+import json
+import pickle
+import argparse
 import logging
+import math
+import time
+from collections import Counter
 from datetime import datetime
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Sample training data (in production, use real dataset)
+SAMPLE_TRAINING_DATA = [
+    ("This is amazing and wonderful!", "positive"),
+    ("I love this product so much!", "positive"),
+    ("Excellent quality and great service!", "positive"),
+    ("Best purchase I've ever made!", "positive"),
+    ("Absolutely fantastic experience!", "positive"),
+    ("This is terrible and awful!", "negative"),
+    ("I hate this, complete waste of money!", "negative"),
+    ("Worst product ever, very disappointed!", "negative"),
+    ("Poor quality and bad service!", "negative"),
+    ("Horrible experience, would not recommend!", "negative"),
+    ("It's okay, nothing special.", "neutral"),
+    ("Average product, does the job.", "neutral"),
+    ("Neither good nor bad.", "neutral"),
+    ("Standard quality, as expected.", "neutral"),
+    ("Regular experience, nothing remarkable.", "neutral"),
+]
+
+
 def train_tfidf_model():
     """
     Train a TF-IDF + Logistic Regression model (lightweight alternative)
@@ -33,31 +69,11 @@ def train_tfidf_model():
         from sklearn.feature_extraction.text import TfidfVectorizer
         from sklearn.linear_model import LogisticRegression
         from sklearn.pipeline import Pipeline
-        import pickle
         
         logger.info("Training TF-IDF + Logistic Regression model...")
         
-        # Sample training data (in production, use real dataset)
-        training_data = [
-            ("This is amazing and wonderful!", "positive"),
-            ("I love this product so much!", "positive"),
-            ("Excellent quality and great service!", "positive"),
-            ("Best purchase I've ever made!", "positive"),
-            ("Absolutely fantastic experience!", "positive"),
-            ("This is terrible and awful!", "negative"),
-            ("I hate this, complete waste of money!", "negative"),
-            ("Worst product ever, very disappointed!", "negative"),
-            ("Poor quality and bad service!", "negative"),
-            ("Horrible experience, would not recommend!", "negative"),
-            ("It's okay, nothing special.", "neutral"),
-            ("Average product, does the job.", "neutral"),
-            ("Neither good nor bad.", "neutral"),
-            ("Standard quality, as expected.", "neutral"),
-            ("Regular experience, nothing remarkable.", "neutral"),
-        ]
-        
-        texts = [text for text, _ in training_data]
-        labels = [label for _, label in training_data]
+        texts = [text for text, _ in SAMPLE_TRAINING_DATA]
+        labels = [label for _, label in SAMPLE_TRAINING_DATA]
         
         # Create pipeline
         model = Pipeline([
@@ -76,6 +92,11 @@ def train_tfidf_model():
             pickle.dump(model, f)
         
         logger.info(f"✓ Model saved to {model_path}")
+        
+        # Pickle-free artifact for serving (models/tfidf_backend.py)
+        from models.tfidf_backend import export_tfidf_model
+        artifact_path = export_tfidf_model(model, 'models/sentiment_tfidf_model.npz')
+        logger.info(f"✓ Serving artifact exported to {artifact_path} (set TFIDF_MODEL_PATH and INFERENCE_BACKEND=tfidf to use it)")
         logger.info("✓ Training completed successfully!")
         
         # Test model
@@ -101,6 +122,373 @@ def train_tfidf_model():
         return False
 
 
+def iter_labeled_chunks(source, chunk_size=10000, text_column='text', label_column='sentiment',
+                        skip=0, database_url=None):
+    """Yield (texts, labels, position) chunks from a CSV/JSONL file or the reviews table
+
+    ``source`` is a .csv/.jsonl path or 'db'. ``position`` is where the next
+    chunk starts (a row count for files, the last review id for the
+    database) and can be passed back as ``skip`` to resume.
+    """
+    if source == 'db':
+        yield from _iter_db_chunks(chunk_size, text_column, label_column, skip, database_url)
+        return
+
+    with open(source, newline='', encoding='utf-8') as f:
+        if source.endswith(('.jsonl', '.ndjson')):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+
+        texts, labels, position = [], [], 0
+        for row in rows:
+            position += 1
+            if position <= skip:
+                continue
+            texts.append(row[text_column])
+            labels.append(row[label_column])
+            if len(texts) == chunk_size:
+                yield texts, labels, position
+                texts, labels = [], []
+        if texts:
+            yield texts, labels, position
+
+
+def _iter_db_chunks(chunk_size, text_column, label_column, last_id, database_url):
+    """Keyset-paginated reads from the reviews table, ordered by id"""
+    from sqlalchemy import create_engine, text as sql
+
+    if database_url is None:
+        from config import get_config
+        database_url = get_config().SQLALCHEMY_DATABASE_URI
+
+    columns = {'text', 'sentiment', 'emotion', 'source'}
+    if text_column not in columns or label_column not in columns:
+        raise ValueError(f"Review columns must be one of: {', '.join(sorted(columns))}")
+
+    query = sql(
+        f"SELECT id, {text_column}, {label_column} FROM reviews "
+        f"WHERE id > :last_id ORDER BY id LIMIT :limit"
+    )
+    engine = create_engine(database_url)
+    try:
+        while True:
+            with engine.connect() as conn:
+                rows = conn.execute(query, {'last_id': last_id, 'limit': chunk_size}).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [row[1] for row in rows], [row[2] for row in rows], last_id
+    finally:
+        engine.dispose()
+
+
+def _save_checkpoint(path, state):
+    # Write then rename, so an interrupted save never corrupts the last checkpoint
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def train_streaming_model(source, output_path='models/sentiment_sgd_model.pkl',
+                          checkpoint_path='models/checkpoints/sentiment_sgd.ckpt',
+                          chunk_size=10000, epochs=1, checkpoint_every=10, resume=False,
+                          classes=('negative', 'neutral', 'positive'), n_features=2 ** 20,
+                          text_column='text', label_column='sentiment', database_url=None):
+    """
+    Train a hashed-features linear model out of core (constant memory)
+    Streams chunks from ``source``, featurizes them with a stateless
+    HashingVectorizer and updates an SGD logistic regression with
+    partial_fit. Each chunk is scored before it is trained on, which gives
+    a running (progressive validation) accuracy without a holdout set.
+    """
+    try:
+        from sklearn.feature_extraction.text import HashingVectorizer
+        from sklearn.linear_model import SGDClassifier
+        from sklearn.pipeline import Pipeline
+        import numpy as np
+        
+        classes = np.array(sorted(classes))
+        vectorizer = HashingVectorizer(
+            n_features=n_features, ngram_range=(1, 2), alternate_sign=False, norm='l2'
+        )
+        
+        state = {'epoch': 0, 'position': 0, 'rows': 0, 'correct': 0, 'skipped': 0,
+                 'classifier': SGDClassifier(loss='log_loss', alpha=1e-6)}
+        if resume and os.path.exists(checkpoint_path):
+            with open(checkpoint_path, 'rb') as f:
+                state = pickle.load(f)
+            logger.info(f"Resuming from {checkpoint_path}: epoch {state['epoch'] + 1}, "
+                        f"position {state['position']}, {state['rows']:,} rows seen")
+        classifier = state['classifier']
+        
+        logger.info(f"Streaming training from {source} (chunks of {chunk_size:,})...")
+        
+        while state['epoch'] < epochs:
+            chunks = iter_labeled_chunks(
+                source, chunk_size, text_column, label_column,
+                skip=state['position'], database_url=database_url
+            )
+            for number, (texts, labels, position) in enumerate(chunks, 1):
+                keep = [i for i, label in enumerate(labels) if label in classes]
+                state['skipped'] += len(labels) - len(keep)
+                if keep:
+                    X = vectorizer.transform([texts[i] or '' for i in keep])
+                    y = np.array([labels[i] for i in keep])
+                    
+                    if hasattr(classifier, 'coef_'):
+                        state['correct'] += int((classifier.predict(X) == y).sum())
+                        state['rows'] += len(keep)
+                    classifier.partial_fit(X, y, classes=classes)
+                
+                state['position'] = position
+                if number % checkpoint_every == 0:
+                    _save_checkpoint(checkpoint_path, state)
+                    accuracy = state['correct'] / max(state['rows'], 1)
+                    logger.info(f"  epoch {state['epoch'] + 1}: position {position}, "
+                                f"progressive accuracy {accuracy:.3f}")
+            
+            state['epoch'] += 1
+            state['position'] = 0
+            _save_checkpoint(checkpoint_path, state)
+        
+        accuracy = state['correct'] / max(state['rows'], 1)
+        logger.info(f"✓ Trained on {state['rows']:,} scored rows, progressive accuracy {accuracy:.3f}")
+        if state['skipped']:
+            logger.warning(f"! Skipped {state['skipped']:,} rows with labels outside {classes.tolist()}")
+        
+        model = Pipeline([('hashing', vectorizer), ('classifier', classifier)])
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        with open(output_path, 'wb') as f:
+            pickle.dump(model, f)
+        logger.info(f"✓ Model saved to {output_path}")
+        
+        return True
+        
+    except ImportError as e:
+        logger.error(f"Missing dependencies: {e}")
+        logger.error("Install with: pip install scikit-learn")
+        return False
+    except Exception as e:
+        logger.error(f"Training failed: {e}")
+        return False
+
+
+def load_labeled_corpus(source=None, max_rows=None, **kwargs):
+    """All (texts, labels) from ``source`` (see iter_labeled_chunks), or the sample data"""
+    if source is None:
+        return [t for t, _ in SAMPLE_TRAINING_DATA], [l for _, l in SAMPLE_TRAINING_DATA]
+
+    texts, labels = [], []
+    for chunk_texts, chunk_labels, _ in iter_labeled_chunks(source, **kwargs):
+        texts.extend(t or '' for t in chunk_texts)
+        labels.extend(chunk_labels)
+        if max_rows and len(texts) >= max_rows:
+            return texts[:max_rows], labels[:max_rows]
+    return texts, labels
+
+
+def _dataset_key(*columns):
+    """Hash of the train/test split, fed one string at a time (no serialized copy)"""
+    import hashlib
+
+    digest = hashlib.sha256()
+    for column in columns:
+        digest.update(len(column).to_bytes(8, 'little'))
+        for value in column:
+            encoded = str(value).encode('utf-8')
+            digest.update(len(encoded).to_bytes(8, 'little'))
+            digest.update(encoded)
+    return digest.hexdigest()
+
+
+def _cache_labels(train_labels, test_labels, cache_dir, data_key):
+    """Write the split's labels next to the cached matrices, once per dataset"""
+    import numpy as np
+
+    path = os.path.join(cache_dir, f"{data_key[:16]}.labels.npz")
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, train=np.asarray(train_labels, dtype=str), test=np.asarray(test_labels, dtype=str))
+        os.replace(tmp_path, path)
+    return path
+
+
+def _featurize_cached(vectorizer_params, train_texts, test_texts, cache_dir, data_key):
+    """Fit one TfidfVectorizer config and cache its train/test matrices on disk
+
+    Returns (train_path, test_path, vectorize_seconds_per_text). A config is
+    only fitted once per dataset; later searches reuse the cached matrices.
+    """
+    import hashlib
+    from scipy import sparse
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    config_key = hashlib.sha256(
+        json.dumps(vectorizer_params, sort_keys=True).encode() + data_key.encode()
+    ).hexdigest()[:16]
+    base = os.path.join(cache_dir, config_key)
+    meta_path = f"{base}.json"
+
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        return f"{base}.train.npz", f"{base}.test.npz", meta['vectorize_s_per_text']
+
+    vectorizer = TfidfVectorizer(**{**vectorizer_params, 'ngram_range': tuple(vectorizer_params['ngram_range'])})
+    train_matrix = vectorizer.fit_transform(train_texts)
+    start = time.perf_counter()
+    test_matrix = vectorizer.transform(test_texts)
+    per_text = (time.perf_counter() - start) / max(len(test_texts), 1)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    sparse.save_npz(f"{base}.train.npz", train_matrix.tocsr())
+    sparse.save_npz(f"{base}.test.npz", test_matrix.tocsr())
+    # Metadata last: it marks the cache entry as complete
+    with open(meta_path, 'w') as f:
+        json.dump({'params': vectorizer_params, 'vectorize_s_per_text': per_text}, f)
+    return f"{base}.train.npz", f"{base}.test.npz", per_text
+
+
+def _fit_and_score(task):
+    """Process-pool worker: fit one classifier on cached features and score it"""
+    import numpy as np
+    from scipy import sparse
+    from sklearn.linear_model import LogisticRegression
+
+    train_matrix = sparse.load_npz(task['train_path'])
+    test_matrix = sparse.load_npz(task['test_path'])
+    with np.load(task['labels_path']) as labels:
+        train_labels, test_labels = labels['train'], labels['test']
+    classifier = LogisticRegression(max_iter=1000, **task['classifier_params'])
+
+    start = time.perf_counter()
+    classifier.fit(train_matrix, train_labels)
+    fit_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    predictions = classifier.predict(test_matrix)
+    predict_per_text = (time.perf_counter() - start) / max(test_matrix.shape[0], 1)
+
+    return {
+        **task['vectorizer_params'],
+        **task['classifier_params'],
+        'accuracy': float(np.mean(predictions == test_labels)),
+        'latency_us': (task['vectorize_s_per_text'] + predict_per_text) * 1e6,
+        'fit_s': fit_s,
+    }
+
+
+def search_hyperparameters(source=None, max_features=(1000, 10000, 50000), ngram_ranges=((1, 1), (1, 2)),
+                           C_values=(0.1, 1.0, 10.0), test_size=0.2, max_rows=None, workers=None,
+                           cache_dir='models/cache/features', leaderboard_path='models/search_leaderboard.csv',
+                           export_best=False, **source_kwargs):
+    """
+    Grid-search TF-IDF + Logistic Regression settings
+    Each distinct vectorizer config is featurized once (and cached on
+    disk), then every classifier setting is fitted on those matrices in a
+    process pool. Writes a leaderboard of accuracy against per-text
+    scoring latency (vectorize + predict).
+    """
+    try:
+        from concurrent.futures import ProcessPoolExecutor
+        from sklearn.model_selection import train_test_split
+        
+        texts, labels = load_labeled_corpus(source, max_rows, **source_kwargs)
+        logger.info(f"Loaded {len(texts):,} labeled texts")
+        
+        # Stratifying needs two rows per class and a test set holding every class
+        counts = Counter(labels)
+        stratify = labels
+        if min(counts.values()) < 2 or math.ceil(len(labels) * test_size) < len(counts):
+            rare = sorted(label for label, count in counts.items() if count < 2)
+            logger.warning(
+                f"! Too few rows to stratify the split{f' (single-row classes: {rare})' if rare else ''}; "
+                "using a random split"
+            )
+            stratify = None
+        
+        train_texts, test_texts, train_labels, test_labels = train_test_split(
+            texts, labels, test_size=test_size, random_state=42, stratify=stratify
+        )
+        data_key = _dataset_key(train_texts, test_texts, train_labels, test_labels)
+        # Workers get file paths only; matrices and labels are read from the cache
+        labels_path = _cache_labels(train_labels, test_labels, cache_dir, data_key)
+        
+        tasks = []
+        for features in max_features:
+            for ngram_range in ngram_ranges:
+                vectorizer_params = {'max_features': features, 'ngram_range': list(ngram_range)}
+                train_path, test_path, vectorize_s = _featurize_cached(
+                    vectorizer_params, train_texts, test_texts, cache_dir, data_key
+                )
+                logger.info(f"  features ready: {vectorizer_params}")
+                for C in C_values:
+                    tasks.append({
+                        'vectorizer_params': vectorizer_params,
+                        'classifier_params': {'C': C},
+                        'train_path': train_path,
+                        'test_path': test_path,
+                        'labels_path': labels_path,
+                        'vectorize_s_per_text': vectorize_s,
+                    })
+        
+        workers = workers or os.cpu_count()
+        logger.info(f"Fitting {len(tasks)} configurations on {workers} processes...")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_fit_and_score, tasks))
+        
+        results.sort(key=lambda r: (-r['accuracy'], r['latency_us']))
+        columns = ['max_features', 'ngram_range', 'C', 'accuracy', 'latency_us', 'fit_s']
+        
+        os.makedirs(os.path.dirname(leaderboard_path) or '.', exist_ok=True)
+        with open(leaderboard_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, columns, extrasaction='ignore')
+            writer.writeheader()
+            for row in results:
+                writer.writerow({**row, 'ngram_range': '-'.join(map(str, row['ngram_range']))})
+        
+        logger.info("\nLeaderboard (best first):")
+        logger.info(f"  {'max_features':>12} {'ngrams':>6} {'C':>7} {'accuracy':>8} {'latency':>10} {'fit':>7}")
+        for row in results:
+            logger.info(
+                f"  {row['max_features']:>12} {'-'.join(map(str, row['ngram_range'])):>6} {row['C']:>7g} "
+                f"{row['accuracy']:>8.3f} {row['latency_us']:>8.1f}us {row['fit_s']:>6.1f}s"
+            )
+        logger.info(f"✓ Leaderboard saved to {leaderboard_path}")
+        
+        if export_best:
+            _export_best(results[0], texts, labels)
+        
+        return True
+        
+    except ImportError as e:
+        logger.error(f"Missing dependencies: {e}")
+        logger.error("Install with: pip install scikit-learn")
+        return False
+    except Exception as e:
+        logger.error(f"Search failed: {e}")
+        return False
+
+
+def _export_best(best, texts, labels, path='models/sentiment_tfidf_model.npz'):
+    """Refit the winning configuration on all data and export the serving artifact"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+    from models.tfidf_backend import export_tfidf_model
+
+    model = Pipeline([
+        ('tfidf', TfidfVectorizer(max_features=best['max_features'], ngram_range=tuple(best['ngram_range']))),
+        ('classifier', LogisticRegression(max_iter=1000, C=best['C']))
+    ])
+    model.fit(texts, labels)
+    logger.info(f"✓ Best configuration exported to {export_tfidf_model(model, path)}")
+
+
 def train_transformer_model():
     """
     Train a transformer-based model (BERT, RoBERTa, etc.)
@@ -160,38 +548,96 @@ def train_transformer_model():
         return False
 
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Train optional sentiment models")
+    parser.add_argument('--model', choices=['tfidf', 'transformer', 'both', 'streaming', 'search'], default='tfidf',
+                        help="tfidf: sample-data TF-IDF, streaming: out-of-core training on --source, "
+                             "search: TF-IDF hyperparameter search")
+    parser.add_argument('--source',
+                        help="Labeled data for streaming and search: a .csv/.jsonl path or 'db' (reviews table)")
+    parser.add_argument('--text-column', default='text')
+    parser.add_argument('--label-column', default='sentiment')
+    parser.add_argument('--classes', default='negative,neutral,positive',
+                        help="Comma-separated labels; rows with other labels are skipped")
+    parser.add_argument('--database-url', help="Defaults to the app's SQLALCHEMY_DATABASE_URI")
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--epochs', type=int, default=1)
+    parser.add_argument('--n-features', type=int, default=2 ** 20, help="Hashing vectorizer width")
+    parser.add_argument('--output', default='models/sentiment_sgd_model.pkl')
+    parser.add_argument('--checkpoint', default='models/checkpoints/sentiment_sgd.ckpt')
+    parser.add_argument('--checkpoint-every', type=int, default=10, help="Chunks between checkpoints")
+    parser.add_argument('--resume', action='store_true', help="Continue from --checkpoint if it exists")
+    
+    search = parser.add_argument_group('search')
+    search.add_argument('--max-features', default='1000,10000,50000')
+    search.add_argument('--ngram-ranges', default='1-1,1-2')
+    search.add_argument('--C', default='0.1,1,10', help="LogisticRegression inverse regularization")
+    search.add_argument('--max-rows', type=int, help="Use at most this many rows from --source")
+    search.add_argument('--workers', type=int, help="Processes for classifier fits (default: all cores)")
+    search.add_argument('--feature-cache', default='models/cache/features')
+    search.add_argument('--leaderboard', default='models/search_leaderboard.csv')
+    search.add_argument('--export-best', action='store_true',
+                        help="Refit the winner on all data and export models/sentiment_tfidf_model.npz")
+    args = parser.parse_args(argv)
+    
+    if args.model == 'streaming' and not args.source:
+        parser.error("--model streaming requires --source")
+    return args
+
+
+def main(argv=None):
     """Main training function"""
+    args = parse_args(argv)
+    
     logger.info("=" * 70)
     logger.info("ADVANCED ML MODEL TRAINING (OPTIONAL)")
     logger.info("=" * 70)
-    logger.info("")
-    logger.info("This script trains advanced ML models for sentiment analysis.")
-    logger.info("These models are NOT used by default in the development version.")
-    logger.info("")
-    logger.info("Choose a model to train:")
-    logger.info("1. TF-IDF + Logistic Regression (Fast, CPU-friendly)")
-    logger.info("2. Transformer (BERT-based, requires GPU)")
-    logger.info("3. Both")
-    logger.info("")
-    
-    choice = input("Enter choice (1/2/3): ").strip()
     
-    if choice == "1":
+    if args.model == 'tfidf':
         logger.info("\nTraining TF-IDF model...")
         success = train_tfidf_model()
-    elif choice == "2":
+    elif args.model == 'transformer':
         logger.info("\nTraining Transformer model...")
         success = train_transformer_model()
-    elif choice == "3":
+    elif args.model == 'both':
         logger.info("\nTraining both models...")
         success1 = train_tfidf_model()
         logger.info("")
         success2 = train_transformer_model()
         success = success1 and success2
+    elif args.model == 'search':
+        logger.info("\nSearching TF-IDF hyperparameters...")
+        success = search_hyperparameters(
+            args.source,
+            max_features=[int(v) for v in args.max_features.split(',')],
+            ngram_ranges=[tuple(int(n) for n in r.split('-')) for r in args.ngram_ranges.split(',')],
+            C_values=[float(v) for v in args.C.split(',')],
+            max_rows=args.max_rows,
+            workers=args.workers,
+            cache_dir=args.feature_cache,
+            leaderboard_path=args.leaderboard,
+            export_best=args.export_best,
+            chunk_size=args.chunk_size,
+            text_column=args.text_column,
+            label_column=args.label_column,
+            database_url=args.database_url
+        )
     else:
-        logger.error("Invalid choice!")
-        return
+        logger.info("\nTraining streaming model...")
+        success = train_streaming_model(
+            args.source,
+            output_path=args.output,
+            checkpoint_path=args.checkpoint,
+            chunk_size=args.chunk_size,
+            epochs=args.epochs,
+            checkpoint_every=args.checkpoint_every,
+            resume=args.resume,
+            classes=[c.strip() for c in args.classes.split(',') if c.strip()],
+            n_features=args.n_features,
+            text_column=args.text_column,
+            label_column=args.label_column,
+            database_url=args.database_url
+        )
     
     if success:
         logger.info("")
@@ -207,6 +653,7 @@ def main():
     else:
         logger.error("")
         logger.error("Training failed! Check the error messages above.")
+        sys.exit(1)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,114 @@
+"""
+Re-score stored reviews with a model version
+
+    python scripts/backfill_reviews.py start [--model-version V] [--celery]
+    python scripts/backfill_reviews.py status JOB_ID
+    python scripts/backfill_reviews.py resume JOB_ID [--celery]
+    python scripts/backfill_reviews.py cancel JOB_ID
+
+Without --celery the lanes run as threads in this process; with it they
+are queued to the Celery workers. Either way progress is checkpointed in
+the backfill tables, so an interrupted job continues with ``resume``.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import json
+import threading
+import time
+
+from app_production import create_app
+from core.extensions import db
+from models.model_registry import ModelRegistry
+from services.backfill import (
+    plan_backfill, start_job, cancel_job, job_progress, run_next_range, RateLimiter, BackfillConflict
+)
+
+def print_progress(progress):
+    eta = progress['eta_seconds']
+    print(
+        f"Backfill {progress['job_id']} [{progress['status']}] {progress['rows_done']}/"
+        f"{progress['total_rows']} rows ({progress['percent']}%), "
+        f"{progress['rows_per_second']} rows/s, ETA {f'{eta}s' if eta is not None else '-'}"
+    )
+
+def run_inline(app, job_id, report_every=10.0):
+    """Run the job's lanes as threads until no range is left"""
+    job = start_job(job_id)
+
+    def lane():
+        with app.app_context():
+            limiter = RateLimiter(job.write_rate / job.parallelism)
+            while run_next_range(job_id, limiter=limiter):
+                pass
+
+    threads = [threading.Thread(target=lane, name=f'backfill-lane-{i}', daemon=True) for i in range(job.parallelism)]
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        for thread in threads:
+            thread.join(timeout=report_every)
+        print_progress(job_progress(job_id))
+        db.session.remove()  # Fresh reads on the next report
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score stored reviews with a model version")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    start = commands.add_parser('start', help="Plan and run a new backfill")
+    start.add_argument('--model-version', help="Registry version (default: the current one)")
+    start.add_argument('--range-size', type=int)
+    start.add_argument('--chunk-size', type=int)
+    start.add_argument('--parallelism', type=int)
+    start.add_argument('--write-rate', type=float, help="Target rows updated per second, whole job")
+    start.add_argument('--celery', action='store_true', help="Queue the lanes to Celery workers")
+
+    resume = commands.add_parser('resume', help="Continue an interrupted, failed or cancelled job")
+    resume.add_argument('job_id', type=int)
+    resume.add_argument('--celery', action='store_true')
+
+    for name in ('status', 'cancel'):
+        commands.add_parser(name).add_argument('job_id', type=int)
+
+    args = parser.parse_args()
+    app = create_app()
+
+    with app.app_context():
+        config = app.config
+        try:
+            if args.command == 'start':
+                job = plan_backfill(
+                    args.model_version or ModelRegistry(config['MODEL_REGISTRY_DIR']).current_version(),
+                    range_size=args.range_size or config['BACKFILL_RANGE_SIZE'],
+                    chunk_size=args.chunk_size or config['BACKFILL_CHUNK_SIZE'],
+                    parallelism=args.parallelism or config['BACKFILL_PARALLELISM'],
+                    write_rate=args.write_rate or config['BACKFILL_WRITE_RATE']
+                )
+                print(f"✅ Planned backfill {job.id}: {job.total_rows} reviews, model version {job.model_version}")
+                job_id = job.id
+            elif args.command in ('resume', 'status', 'cancel'):
+                job_id = args.job_id
+
+            if args.command == 'cancel':
+                cancel_job(job_id)
+            elif args.command in ('start', 'resume') and job_progress(job_id)['status'] != 'completed':
+                if args.celery:
+                    from tasks.backfill_tasks import start_backfill_task
+                    start_job(job_id)
+                    start_backfill_task.delay(job_id)
+                    print(f"✅ Backfill {job_id} queued to Celery")
+                else:
+                    run_inline(app, job_id)
+
+            progress = job_progress(job_id)
+            print_progress(progress)
+            if args.command == 'status':
+                print(json.dumps(progress, indent=2))
+        except (ValueError, BackfillConflict) as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark SimpleSentimentAnalyzer.analyze_batch against per-text analyze()
+
+Scores synthetic reviews both ways, checks that the labels agree and
+prints throughput for each batch size. The columnar batch result and its
+conversion to per-text dicts (the API edge) are timed separately.
+
+Run with: python scripts/benchmark_batch_analyzer.py [--sizes 10000 1000000]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import random
+import time
+
+from app_dev import SimpleSentimentAnalyzer
+
+FILLER = ['the', 'product', 'was', 'it', 'and', 'very', 'i', 'my', 'this', 'arrived',
+          'quality', 'price', 'shipping', 'would', 'again', 'not', 'really', 'but']
+
+def make_reviews(analyzer, count, seed=0):
+    """Random reviews mixing lexicon words, filler and punctuation"""
+    rng = random.Random(seed)
+    keywords = sorted(set().union(
+        analyzer.positive_words, analyzer.negative_words, *analyzer.emotion_keywords.values()
+    ))
+    words = keywords + FILLER * 4
+    reviews = []
+    for _ in range(count):
+        length = rng.randint(3, 60)
+        tokens = [rng.choice(words) for _ in range(length)]
+        tokens[0] = tokens[0].capitalize()
+        reviews.append(' '.join(tokens) + rng.choice(['.', '!', '?', '!!', '']))
+    return reviews
+
+def benchmark(analyzer, size):
+    texts = make_reviews(analyzer, size)
+    
+    start = time.perf_counter()
+    scalar = [analyzer.analyze(text) for text in texts]
+    scalar_s = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    columns = analyzer.analyze_batch(texts)
+    batch_s = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    batch = columns.to_dicts(compact=True)
+    dicts_s = time.perf_counter() - start
+    
+    if batch != scalar:
+        mismatches = sum(1 for a, b in zip(batch, scalar) if a != b)
+        raise SystemExit(f"❌ {mismatches} of {size} results differ between batch and scalar paths")
+    
+    print(f"{size:>10,} texts | scalar {scalar_s:8.2f}s ({size / scalar_s:>9,.0f}/s) | "
+          f"batch {batch_s:8.2f}s ({size / batch_s:>9,.0f}/s) | {scalar_s / batch_s:.1f}x | "
+          f"to_dicts {dicts_s:6.2f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 1_000_000])
+    args = parser.parse_args()
+    
+    analyzer = SimpleSentimentAnalyzer()
+    analyzer.analyze_batch(['warm up'])  # Build the batch lexicon outside the timings
+    
+    for size in args.sizes:
+        benchmark(analyzer, size)
+    print("✅ Batch and scalar results identical")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""
+Download the sentiment and emotion models into the local model store
+
+Run this on a machine with internet access, then copy MODEL_CACHE_DIR to
+offline workers and set MODEL_OFFLINE=true there.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import get_config
+from models.model_store import ModelStore
+from models.model_registry import ModelRegistry
+from models.sentiment_model import SENTIMENT_MODEL, EMOTION_MODEL
+
+def fetch_models():
+    """Fetch all models used by SentimentAnalyzer and the published model versions"""
+    config = get_config()
+    store = ModelStore(config.MODEL_CACHE_DIR)
+    registry = ModelRegistry(config.MODEL_REGISTRY_DIR)
+    
+    model_names = [SENTIMENT_MODEL, EMOTION_MODEL, config.SENTIMENT_MODEL_NAME, config.EMOTION_MODEL_NAME]
+    for version in registry.versions():
+        manifest = registry.load_manifest(version)
+        model_names += [manifest.get('sentiment_model'), manifest.get('emotion_model')]
+    
+    for model_name in dict.fromkeys(name for name in model_names if name):
+        if store.has(model_name):
+            print(f"✅ {model_name} already in store")
+            continue
+        path = store.fetch(model_name)
+        print(f"✅ {model_name} saved to {path}")
+
+if __name__ == '__main__':
+    fetch_models()
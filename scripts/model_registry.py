@@ -0,0 +1,93 @@
+"""
+Manage the versioned model registry (MODEL_REGISTRY_DIR)
+
+    python scripts/model_registry.py list
+    python scripts/model_registry.py publish 2026-10-18-student --backend student \
+        --student-model-path models/sentiment_student.npz
+    python scripts/model_registry.py activate 2026-10-18-student
+    python scripts/model_registry.py status
+
+Serving processes pick up an activated version within
+MODEL_REGISTRY_CHECK_SECONDS, load and warm it in the background and
+then switch to it. Activate ``builtin`` to go back to the app config.
+Fetch the transformer models of a new version with
+scripts/fetch_models.py before activating it on offline workers.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import json
+
+from config import get_config
+from models.backends import BACKENDS
+from models.model_registry import ModelRegistry, BUILTIN_VERSION
+
+def list_versions(registry):
+    current = registry.current_version()
+    for version in [BUILTIN_VERSION] + registry.versions():
+        marker = '*' if version == current else ' '
+        if version == BUILTIN_VERSION:
+            print(f"{marker} {version:<32} (app config)")
+            continue
+        manifest = registry.load_manifest(version)
+        print(f"{marker} {version:<32} {manifest.get('backend', '')} {manifest.get('created_at', '')}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage model versions")
+    parser.add_argument('--registry-dir', help="Defaults to MODEL_REGISTRY_DIR")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('list', help="List published versions (* = current)")
+
+    publish = commands.add_parser('publish', help="Publish a new version")
+    publish.add_argument('version')
+    publish.add_argument('--backend', default='pytorch', choices=sorted(BACKENDS))
+    publish.add_argument('--sentiment-model', help="Hugging Face sentiment model name")
+    publish.add_argument('--emotion-model', help="Hugging Face emotion model name")
+    publish.add_argument('--tfidf-model-path', help="TF-IDF .npz artifact (copied into the version)")
+    publish.add_argument('--student-model-path', help="Student .npz artifact (copied into the version)")
+    publish.add_argument('--activate', action='store_true', help="Also make it the current version")
+
+    activate = commands.add_parser('activate', help="Switch serving processes to a version")
+    activate.add_argument('version')
+
+    commands.add_parser('status', help="Show the current version's manifest")
+
+    args = parser.parse_args()
+    registry = ModelRegistry(args.registry_dir or get_config().MODEL_REGISTRY_DIR)
+
+    try:
+        if args.command == 'list':
+            list_versions(registry)
+        elif args.command == 'publish':
+            manifest = registry.publish(
+                args.version,
+                backend=args.backend,
+                sentiment_model=args.sentiment_model,
+                emotion_model=args.emotion_model,
+                tfidf_model_path=args.tfidf_model_path,
+                student_model_path=args.student_model_path
+            )
+            print(f"✅ Published {args.version}")
+            print(json.dumps(manifest, indent=2))
+            if args.activate:
+                registry.activate(args.version)
+                print(f"✅ {args.version} is now current")
+        elif args.command == 'activate':
+            registry.activate(args.version)
+            print(f"✅ {args.version} is now current")
+        elif args.command == 'status':
+            version = registry.current_version()
+            if version == BUILTIN_VERSION:
+                manifest = registry.builtin_manifest(get_config())
+            else:
+                manifest = registry.load_manifest(version)
+            print(json.dumps(manifest, indent=2))
+    except (ValueError, OSError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Admission control for inference requests
+
+Counts the texts of analyze and batch_analyze calls that are in flight
+in this process (queued for or running inference). The load is the larger
+of that count and the depth of the inference queue the texts go to: the
+local scheduler's, or the daemon's, which also holds other workers'
+requests. Past the degrade threshold, callers should use the rule-based
+analyzer. Past the shed threshold, new calls are refused. Model work a
+caller gave up on (a missed latency budget) keeps counting until it
+actually finishes.
+"""
+from contextlib import contextmanager
+from core.monitoring import record_inference_event
+import threading
+
+
+class ServiceOverloaded(Exception):
+    """Raised when a request is shed; carries a Retry-After hint in seconds"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Inference overloaded, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    def __init__(self, degrade_threshold, shed_threshold, retry_after=5, queue_depth=None):
+        self.degrade_threshold = degrade_threshold
+        self.shed_threshold = shed_threshold
+        self.retry_after = retry_after
+        # Callable returning the texts waiting in the inference queue
+        self.queue_depth = queue_depth
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    @property
+    def load(self):
+        """Texts ahead of a new call: in flight here or queued for the model"""
+        depth = self.queue_depth() if self.queue_depth else 0
+        return max(self._in_flight, depth)
+
+    @contextmanager
+    def admit(self, count=1):
+        """Admit a call scoring ``count`` texts; yields True if it should run degraded
+
+        Both thresholds apply to the load before the call, so a large
+        batch still runs on the model when the service is idle.
+        """
+        with self._lock:
+            load = self.load
+            if load >= self.shed_threshold:
+                record_inference_event('admission_shed')
+                raise ServiceOverloaded(self.retry_after)
+            self._in_flight += count
+            degraded = load >= self.degrade_threshold
+
+        if degraded:
+            record_inference_event('admission_degraded')
+        try:
+            yield degraded
+        finally:
+            self._release(count)
+
+    def hold_until_done(self, future, count=1):
+        """Count a model call the caller abandoned until its future completes"""
+        with self._lock:
+            self._in_flight += count
+        future.add_done_callback(lambda _: self._release(count))
+
+    def _release(self, count):
+        with self._lock:
+            self._in_flight -= count
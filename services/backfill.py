@@ -0,0 +1,337 @@
+"""
+Re-scoring backfill of the reviews table
+
+A backfill re-scores stored reviews with one model version, so their
+sentiment, emotion and confidence match what that version would serve.
+``plan_backfill`` splits the reviews still on another version into
+primary-key ranges (BackfillRange rows). Workers ("lanes") claim ranges
+one at a time, read them in keyset-ordered chunks, score each chunk with
+the columnar analyzer and bulk-update it. The range checkpoint is written
+in the same transaction as the updates, so a crashed lane resumes after
+the last committed chunk. A range left "running" by a dead worker is
+reclaimed once its lease expires, and already re-scored rows are skipped
+on every read.
+
+Each lane writes at most ``write_rate / parallelism`` rows per second,
+so the whole job stays under the job's target write rate. That only holds
+with at most ``parallelism`` lanes, so a job is not started again while
+any of its leases is live.
+
+Run through Celery (tasks/backfill_tasks.py) or inline with
+scripts/backfill_reviews.py.
+"""
+from datetime import datetime, timedelta
+import logging
+import threading
+import time
+
+from sqlalchemy import bindparam, func, or_, and_, text as sql
+
+from config import get_config
+from core.extensions import db
+from models import Review, BackfillJob, BackfillRange
+from models.backends import BackendPool
+from models.model_registry import ModelRegistry
+
+logger = logging.getLogger(__name__)
+
+_STALE_REVIEWS = "(model_version IS NULL OR model_version != :version)"
+
+_SELECT_CHUNK = sql(
+    "SELECT id, text FROM reviews "
+    f"WHERE id > :last_id AND id < :end_id AND {_STALE_REVIEWS} "
+    "ORDER BY id LIMIT :limit"
+)
+
+_UPDATE_REVIEW = Review.__table__.update().where(
+    Review.__table__.c.id == bindparam('_id')
+).values(
+    sentiment=bindparam('_sentiment'),
+    emotion=bindparam('_emotion'),
+    confidence=bindparam('_confidence'),
+    model_version=bindparam('_model_version')
+)
+
+_analyzers = {}
+_analyzers_lock = threading.Lock()
+
+
+class BackfillCancelled(Exception):
+    """The job was cancelled while a lane was working on it"""
+
+
+class BackfillConflict(Exception):
+    """The job still has live lanes; starting more would exceed its write rate"""
+
+
+class RateLimiter:
+    """Spaces out writes to at most ``rate`` rows per second"""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self._next = time.monotonic()
+
+    def acquire(self, count):
+        """Sleep until ``count`` more rows may be written"""
+        if not self.rate:
+            return
+        now = time.monotonic()
+        start = max(self._next, now)
+        self._next = start + count / self.rate
+        if start > now:
+            time.sleep(start - now)
+
+
+def version_analyzer(version, config=None):
+    """The default analyzer of a registry version, loaded once per process"""
+    from services.sentiment_service import get_sentiment_service
+
+    serving = get_sentiment_service().models.active(check=False)
+    if serving.version == version:
+        return serving.backends.get()
+
+    with _analyzers_lock:
+        if version not in _analyzers:
+            config = config or get_config()
+            version_config = ModelRegistry(config.MODEL_REGISTRY_DIR).version_config(config, version)
+            _analyzers[version] = BackendPool(version_config).get()
+        return _analyzers[version]
+
+
+def plan_backfill(model_version, range_size, chunk_size, parallelism, write_rate):
+    """Create a job and its ranges over the reviews not yet on ``model_version``"""
+    if range_size < 1 or chunk_size < 1 or parallelism < 1 or write_rate <= 0:
+        raise ValueError("range_size, chunk_size, parallelism and write_rate must be positive")
+
+    min_id, max_id, total = db.session.execute(
+        sql(f"SELECT MIN(id), MAX(id), COUNT(*) FROM reviews WHERE {_STALE_REVIEWS}"),
+        {'version': model_version}
+    ).one()
+
+    job = BackfillJob(
+        model_version=model_version,
+        min_id=min_id or 0,
+        max_id=max_id or 0,
+        total_rows=total,
+        range_size=range_size,
+        chunk_size=chunk_size,
+        parallelism=parallelism,
+        write_rate=write_rate
+    )
+    db.session.add(job)
+    db.session.flush()
+
+    if total:
+        db.session.bulk_insert_mappings(BackfillRange, [
+            {'job_id': job.id, 'start_id': start, 'end_id': min(start + range_size, max_id + 1)}
+            for start in range(min_id, max_id + 1, range_size)
+        ])
+    else:
+        job.status = 'completed'
+        job.completed_at = datetime.utcnow()
+    db.session.commit()
+
+    logger.info(f"Planned backfill {job.id}: {total} reviews to re-score with {model_version}")
+    return job
+
+
+def claim_range(job_id, lease_seconds):
+    """Atomically take the next pending (or abandoned) range of a job, or None"""
+    table = BackfillRange.__table__
+    now = datetime.utcnow()
+    stale = now - timedelta(seconds=lease_seconds)
+
+    candidates = db.session.query(table.c.id, table.c.status, table.c.updated_at).filter(
+        table.c.job_id == job_id,
+        or_(table.c.status == 'pending', and_(table.c.status == 'running', table.c.updated_at < stale))
+    ).order_by(table.c.id).limit(16).all()
+
+    for range_id, status, updated_at in candidates:
+        # Compare-and-set: another lane may have claimed it since the read
+        claimed = db.session.execute(
+            table.update().where(
+                table.c.id == range_id, table.c.status == status, table.c.updated_at == updated_at
+            ).values(status='running', updated_at=now, attempts=table.c.attempts + 1)
+        ).rowcount
+        db.session.commit()
+        if claimed:
+            if status == 'running':
+                logger.warning(f"Reclaimed abandoned backfill range {range_id}")
+            return db.session.get(BackfillRange, range_id)
+    return None
+
+
+def process_range(job, backfill_range, analyzer, limiter):
+    """Re-score one claimed range chunk by chunk, checkpointing after each"""
+    last_id = backfill_range.last_id if backfill_range.last_id is not None else backfill_range.start_id - 1
+
+    while True:
+        rows = db.session.execute(_SELECT_CHUNK, {
+            'last_id': last_id, 'end_id': backfill_range.end_id,
+            'version': job.model_version, 'limit': job.chunk_size
+        }).fetchall()
+        if not rows:
+            break
+
+        ids = [row[0] for row in rows]
+        result = analyzer.analyze_batch([row[1] or '' for row in rows])
+        params = [
+            {'_id': review_id, '_sentiment': sentiment, '_emotion': emotion,
+             '_confidence': confidence, '_model_version': job.model_version}
+            for review_id, sentiment, emotion, confidence in zip(
+                ids, result.sentiments.tolist(), result.emotions.tolist(), result.confidences.tolist()
+            )
+        ]
+
+        limiter.acquire(len(params))
+        db.session.execute(_UPDATE_REVIEW, params)
+        last_id = ids[-1]
+        backfill_range.last_id = last_id
+        backfill_range.rows_done = (backfill_range.rows_done or 0) + len(params)
+        backfill_range.updated_at = datetime.utcnow()
+        db.session.commit()  # Updates and checkpoint together
+
+        if db.session.query(BackfillJob.status).filter_by(id=job.id).scalar() == 'cancelled':
+            backfill_range.status = 'pending'
+            db.session.commit()
+            raise BackfillCancelled(f"Backfill {job.id} cancelled")
+
+    backfill_range.status = 'done'
+    backfill_range.updated_at = datetime.utcnow()
+    db.session.commit()
+
+
+def run_next_range(job_id, lease_seconds=None, limiter=None):
+    """Claim and re-score one range; False when the job has no range left to claim"""
+    config = get_config()
+    job = db.session.get(BackfillJob, job_id)
+    if job is None or job.status != 'running':
+        return False
+
+    if lease_seconds is None:
+        lease_seconds = config.BACKFILL_LEASE_SECONDS
+    backfill_range = claim_range(job_id, lease_seconds)
+    if backfill_range is None:
+        finish_job(job_id)
+        return False
+
+    limiter = limiter or RateLimiter(job.write_rate / job.parallelism)
+    try:
+        process_range(job, backfill_range, version_analyzer(job.model_version, config), limiter)
+    except BackfillCancelled:
+        return False
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Backfill range {backfill_range.id} failed: {e}")
+        backfill_range.status = 'failed'
+        backfill_range.error_message = str(e)
+        db.session.commit()
+    return True
+
+
+def finish_job(job_id):
+    """Mark a job completed (or failed) once none of its ranges is left"""
+    job = db.session.get(BackfillJob, job_id)
+    open_ranges = job.ranges.filter(BackfillRange.status.in_(('pending', 'running'))).count()
+    if job.status != 'running' or open_ranges:
+        return job
+
+    failed = job.ranges.filter_by(status='failed').count()
+    job.status = 'failed' if failed else 'completed'
+    if failed:
+        job.error_message = f"{failed} ranges failed; resume the job to retry them"
+    job.completed_at = datetime.utcnow()
+    db.session.commit()
+    logger.info(f"Backfill {job.id} {job.status}")
+    return job
+
+
+def _live_leases(job, lease_seconds):
+    """Open ranges of a job that a lane holds, or was started for, within the lease"""
+    stale = datetime.utcnow() - timedelta(seconds=lease_seconds)
+    # Ranges of a running job are touched when its lanes are queued
+    statuses = ('pending', 'running') if job.status == 'running' else ('running',)
+    return job.ranges.filter(
+        BackfillRange.status.in_(statuses), BackfillRange.updated_at >= stale
+    ).count()
+
+
+def start_job(job_id, lease_seconds=None):
+    """Mark a planned, failed or cancelled job running; failed ranges are retried
+
+    A running job (or a cancelled one whose lanes have not stopped yet) is
+    only restarted once all its leases have expired, i.e. its lanes died.
+    """
+    # Row lock: concurrent resumes check the leases one after the other
+    job = db.session.query(BackfillJob).filter_by(id=job_id).with_for_update().one_or_none()
+    if job is None:
+        raise ValueError(f"Unknown backfill job: {job_id}")
+    if job.status == 'completed':
+        raise ValueError(f"Backfill {job_id} already completed")
+
+    if job.status != 'pending':
+        if lease_seconds is None:
+            lease_seconds = get_config().BACKFILL_LEASE_SECONDS
+        if _live_leases(job, lease_seconds):
+            raise BackfillConflict(
+                f"Backfill {job_id} still has running lanes; wait for them to stop "
+                f"or for their {lease_seconds}s leases to expire"
+            )
+
+    job.ranges.filter(BackfillRange.status.in_(('pending', 'failed'))).update(
+        {'status': 'pending', 'updated_at': datetime.utcnow()}, synchronize_session=False
+    )
+    job.status = 'running'
+    job.error_message = None
+    job.completed_at = None
+    job.started_at = job.started_at or datetime.utcnow()
+    db.session.commit()
+    return job
+
+
+def cancel_job(job_id):
+    """Stop a job; lanes stop after their current chunk"""
+    job = db.session.get(BackfillJob, job_id)
+    if job is None:
+        raise ValueError(f"Unknown backfill job: {job_id}")
+    if job.status in ('pending', 'running'):
+        job.status = 'cancelled'
+        db.session.commit()
+    return job
+
+
+def job_progress(job_id):
+    """Status, row counts, throughput and ETA of a job"""
+    job = db.session.get(BackfillJob, job_id)
+    if job is None:
+        raise ValueError(f"Unknown backfill job: {job_id}")
+
+    ranges = dict(
+        db.session.query(BackfillRange.status, func.count(BackfillRange.id))
+        .filter_by(job_id=job_id).group_by(BackfillRange.status).all()
+    )
+    rows_done = db.session.query(func.coalesce(func.sum(BackfillRange.rows_done), 0)).filter_by(
+        job_id=job_id
+    ).scalar()
+
+    end = job.completed_at or datetime.utcnow()
+    elapsed = (end - job.started_at).total_seconds() if job.started_at else 0
+    rate = rows_done / elapsed if elapsed > 0 else 0
+    remaining = max(job.total_rows - rows_done, 0)
+    eta_seconds = round(remaining / rate) if rate and job.status == 'running' else None
+
+    return {
+        'job_id': job.id,
+        'model_version': job.model_version,
+        'status': job.status,
+        'total_rows': job.total_rows,
+        'rows_done': rows_done,
+        'percent': round(rows_done / job.total_rows * 100, 2) if job.total_rows else 100.0,
+        'ranges': ranges,
+        'rows_per_second': round(rate, 1),
+        'target_rows_per_second': job.write_rate,
+        'eta_seconds': eta_seconds,
+        'error': job.error_message,
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'completed_at': job.completed_at.isoformat() if job.completed_at else None
+    }
@@ -0,0 +1,140 @@
+"""
+Client for the local inference daemon (services/inference_server.py)
+
+Messages are JSON documents framed with a 4-byte big-endian length prefix
+over a Unix domain socket.
+"""
+import json
+import socket
+import struct
+import threading
+import time
+
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+# Seconds a queue depth reported by the daemon is trusted for admission
+QUEUE_DEPTH_MAX_AGE = 2.0
+
+
+class InferenceUnavailable(ConnectionError):
+    """The inference daemon could not be reached"""
+
+
+class InferenceTimeout(TimeoutError):
+    """The inference daemon is up but did not answer in time (busy)"""
+
+
+def send_frame(sock, message):
+    payload = json.dumps(message).encode('utf-8')
+    sock.sendall(struct.pack('>I', len(payload)) + payload)
+
+
+def _recv_exact(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("Connection closed by peer")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def recv_frame(sock):
+    (size,) = struct.unpack('>I', _recv_exact(sock, 4))
+    if size > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame too large: {size} bytes")
+    return json.loads(_recv_exact(sock, size).decode('utf-8'))
+
+
+class InferenceClient:
+    """Sends analyze requests to the inference daemon.
+
+    Each thread keeps its own persistent connection, which is dropped and
+    re-opened on the next call after any socket error. Only a failed
+    connect means the daemon is down (InferenceUnavailable); a slow answer
+    raises InferenceTimeout, and a stale connection is retried once.
+    """
+
+    def __init__(self, socket_path, timeout=60):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+        # Model version the daemon served last; scopes the callers' result cache
+        self.model_version = None
+        # Texts queued on the daemon (from all clients) when it last answered
+        self.queue_depth = 0
+        self._depth_at = None
+
+    def _connection(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self._local.sock = sock
+        return sock
+
+    def _reset(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def _request(self, message):
+        """Send one request frame and return the response frame"""
+        for attempt in range(2):
+            reused = getattr(self._local, 'sock', None) is not None
+            try:
+                sock = self._connection()
+            except socket.timeout as e:
+                raise InferenceTimeout(f"Inference daemon did not accept the connection: {e}") from e
+            except OSError as e:
+                raise InferenceUnavailable(str(e)) from e
+
+            try:
+                send_frame(sock, message)
+                response = recv_frame(sock)
+                break
+            except socket.timeout as e:
+                # The response may still arrive, so the connection can't be reused
+                self._reset()
+                raise InferenceTimeout(f"No response from the inference daemon within {self.timeout}s") from e
+            except (OSError, ValueError) as e:
+                self._reset()
+                if reused and attempt == 0 and isinstance(e, OSError):
+                    continue  # Closed while idle (e.g. daemon restart): retry on a new connection
+                raise RuntimeError(f"Inference daemon error: {e}") from e
+
+        if 'error' in response:
+            raise RuntimeError(f"Inference daemon error: {response['error']}")
+        return response
+
+    def batch_analyze(self, texts, lane='interactive', outputs=None, compact=False, backend=None):
+        """Analyze texts on the daemon, returns one result dict per text"""
+        message = {'texts': list(texts), 'lane': lane, 'compact': compact}
+        if outputs is not None:
+            message['outputs'] = list(outputs)
+        if backend is not None:
+            message['backend'] = backend
+        response = self._request(message)
+        self.model_version = response.get('model_version', self.model_version)
+        self.queue_depth = response.get('queue_depth', 0)
+        self._depth_at = time.monotonic()
+        return response['results']
+
+    def status(self):
+        """The daemon's serving version, queue depth and shadow scoring status"""
+        return self._request({'op': 'status'})['status']
+
+    def recent_queue_depth(self, max_age=QUEUE_DEPTH_MAX_AGE):
+        """The daemon's last reported queue depth, or 0 once it is older than
+        ``max_age`` seconds (a stale depth would keep shedding the very calls
+        that would refresh it)"""
+        if self._depth_at is None or time.monotonic() - self._depth_at > max_age:
+            return 0
+        return self.queue_depth
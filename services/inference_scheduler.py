@@ -0,0 +1,140 @@
+"""
+In-process micro-batching scheduler for model inference
+
+Concurrent callers submit single texts; a background thread collects them
+for up to ``max_wait_ms`` (or until ``max_batch`` texts are waiting), runs
+one batched forward pass and hands each caller its own result.
+"""
+from collections import deque
+from concurrent.futures import Future
+import logging
+import math
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LANE_WEIGHTS = {'interactive': 4, 'bulk': 1}
+
+
+class InferenceScheduler:
+    """Collects texts from many callers into batched inference calls.
+
+    Work is queued in priority lanes. Lanes are served in order of weight,
+    and each batch reserves a share of its slots per lane proportional to
+    the lane weight, so interactive requests go first without starving
+    background work.
+    """
+
+    def __init__(self, batch_fn, max_wait_ms=10, max_batch=32, lane_weights=None):
+        self.batch_fn = batch_fn
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch = max_batch
+        weights = lane_weights or DEFAULT_LANE_WEIGHTS
+        self.lane_weights = dict(sorted(weights.items(), key=lambda kv: kv[1], reverse=True))
+        self._lanes = {lane: deque() for lane in self.lane_weights}
+        self._cond = threading.Condition()
+        self._thread = None
+        self._pid = None
+
+    @property
+    def pending(self):
+        """Number of texts waiting to be scheduled"""
+        return sum(len(q) for q in self._lanes.values())
+
+    def submit(self, text, lane='interactive', **options):
+        """Queue a single text, returns a Future resolving to its result"""
+        return self.submit_many([text], lane, **options)[0]
+
+    def submit_many(self, texts, lane='bulk', **options):
+        """Queue several texts in one lane, returns one Future per text
+
+        ``options`` are passed through to ``batch_fn``; texts with different
+        options share a scheduling round but not a ``batch_fn`` call.
+        """
+        if lane not in self._lanes:
+            raise ValueError(f"Unknown inference lane: {lane}")
+
+        futures = [Future() for _ in texts]
+        now = time.monotonic()
+        key = tuple(sorted(options.items()))
+        with self._cond:
+            self._ensure_worker()
+            self._lanes[lane].extend((now, text, future, key) for text, future in zip(texts, futures))
+            self._cond.notify()
+        return futures
+
+    def _ensure_worker(self):
+        # Threads don't survive fork, so each gunicorn/celery child starts its own
+        if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='inference-scheduler', daemon=True)
+            self._thread.start()
+
+    def _oldest(self):
+        return min(q[0][0] for q in self._lanes.values() if q)
+
+    def _take_batch(self):
+        """Pop up to max_batch items, honouring lane order and weights"""
+        total_weight = sum(self.lane_weights.values())
+        batch = []
+
+        # First pass: every lane gets its weighted share of the batch
+        for lane, weight in self.lane_weights.items():
+            queue = self._lanes[lane]
+            share = math.ceil(self.max_batch * weight / total_weight)
+            while queue and share > 0 and len(batch) < self.max_batch:
+                batch.append(queue.popleft())
+                share -= 1
+
+        # Second pass: unused slots go to lanes in priority order
+        for lane in self.lane_weights:
+            queue = self._lanes[lane]
+            while queue and len(batch) < self.max_batch:
+                batch.append(queue.popleft())
+
+        return batch
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self.pending:
+                    self._cond.wait()
+
+                # Wait for more work until the oldest request's deadline
+                deadline = self._oldest() + self.max_wait
+                while self.pending < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                batch = self._take_batch()
+
+            self._execute(batch)
+
+    def _execute(self, batch):
+        groups = {}
+        for item in batch:
+            groups.setdefault(item[3], []).append(item)
+
+        for key, items in groups.items():
+            texts = [text for _, text, _, _ in items]
+            try:
+                results = list(self.batch_fn(texts, **dict(key)))
+            except Exception as e:
+                logger.error(f"Batched inference failed for {len(texts)} texts: {e}")
+                for _, _, future, _ in items:
+                    future.set_exception(e)
+                continue
+
+            for (_, _, future, _), result in zip(items, results):
+                future.set_result(result)
+
+            # Never leave a caller waiting on a result that won't come
+            if len(results) < len(items):
+                error = RuntimeError(f"Batched inference returned {len(results)} results for {len(items)} texts")
+                logger.error(str(error))
+                for _, _, future, _ in items[len(results):]:
+                    future.set_exception(error)
@@ -0,0 +1,148 @@
+"""
+Local inference daemon
+
+Loads the sentiment and emotion models once per node and serves batched
+analyze requests to web and Celery workers over a Unix domain socket.
+Requests from all connections go through one InferenceScheduler, so
+concurrent callers share forward passes; with INFERENCE_SCHEDULER_ENABLED
+it also waits up to INFERENCE_MAX_WAIT_MS to fill a batch. Model versions published to the
+registry are loaded and swapped in without restarting the daemon.
+
+With SHADOW_MODEL_VERSION set, the daemon is also the one place that
+shadow-scores a candidate model: it samples the results it serves, so
+clients load no candidate and send nothing extra. Reports are written to
+the database the daemon is configured with (DATABASE_URL).
+
+Run with: python -m services.inference_server
+"""
+import logging
+import os
+import socketserver
+import time
+
+from config import get_config
+from core.thread_budget import apply_thread_budget
+from models.sentiment_model import normalize_outputs
+from services.inference_client import send_frame, recv_frame
+from services.inference_scheduler import InferenceScheduler
+from services.model_manager import ModelManager
+from services.shadow_scorer import ShadowScorer, report_app
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceRequestHandler(socketserver.BaseRequestHandler):
+    """Serves framed requests on one client connection until it closes"""
+
+    def handle(self):
+        while True:
+            try:
+                request = recv_frame(self.request)
+            except (ConnectionError, OSError):
+                return
+            except ValueError as e:
+                send_frame(self.request, {'error': str(e)})
+                return
+
+            if request.get('op') == 'status':
+                try:
+                    send_frame(self.request, {'status': self.server.status()})
+                except OSError:
+                    return
+                continue
+
+            try:
+                start = time.perf_counter()
+                model = self.server.models.active()
+                futures = self.server.scheduler.submit_many(
+                    request['texts'],
+                    request.get('lane', 'interactive'),
+                    model=model,
+                    backend=model.backends.resolve(request.get('backend')),
+                    outputs=normalize_outputs(request.get('outputs')),
+                    compact=bool(request.get('compact', False))
+                )
+                results = [f.result() for f in futures]
+                if self.server.shadow and results:
+                    latency_ms = (time.perf_counter() - start) * 1000 / len(results)
+                    self.server.shadow.offer(request['texts'], results, latency_ms)
+                response = {
+                    'results': results,
+                    'model_version': model.version,
+                    # Texts still waiting from all clients; feeds their admission control
+                    'queue_depth': self.server.scheduler.pending
+                }
+            except Exception as e:
+                logger.error(f"Inference request failed: {e}")
+                response = {'error': str(e)}
+
+            try:
+                send_frame(self.request, response)
+            except OSError:
+                return
+
+
+class InferenceServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, scheduler, models, shadow=None):
+        self.scheduler = scheduler
+        self.models = models
+        self.shadow = shadow
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)  # Stale socket from a previous run
+        super().__init__(socket_path, InferenceRequestHandler)
+        os.chmod(socket_path, 0o660)
+
+    def status(self):
+        """Serving version, queue depth and shadow scoring, for clients' metrics"""
+        return {
+            'model_version': self.models.active(check=False).version,
+            'queue_depth': self.scheduler.pending,
+            'shadow': self.shadow.status() if self.shadow else None,
+        }
+
+
+def create_server(config=None):
+    """Load the models and build a server bound to INFERENCE_SOCKET_PATH"""
+    config = config or get_config()
+    # The daemon is the only process running models for its clients
+    apply_thread_budget(config, processes=1, source='daemon')
+    models = ModelManager(config)
+
+    # Load the current version's models up front rather than on the first request
+    models.warm()
+
+    scheduler = InferenceScheduler(
+        models.batch_analyze,
+        max_wait_ms=config.INFERENCE_MAX_WAIT_MS if config.INFERENCE_SCHEDULER_ENABLED else 0,
+        max_batch=config.INFERENCE_MAX_BATCH,
+        lane_weights=config.INFERENCE_LANE_WEIGHTS
+    )
+
+    shadow = None
+    if config.SHADOW_MODEL_VERSION:
+        shadow = ShadowScorer(config, config.SHADOW_MODEL_VERSION, app=report_app(config))
+
+    socket_dir = os.path.dirname(config.INFERENCE_SOCKET_PATH)
+    if socket_dir:
+        os.makedirs(socket_dir, exist_ok=True)
+    return InferenceServer(config.INFERENCE_SOCKET_PATH, scheduler, models, shadow)
+
+
+def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    server = create_server()
+    logger.info(f"Inference daemon listening on {server.server_address}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        os.unlink(server.server_address)
+
+
+if __name__ == '__main__':
+    main()
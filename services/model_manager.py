@@ -0,0 +1,177 @@
+"""
+Hot-swapping of model versions inside a serving process
+
+The manager serves one model version at a time: a BackendPool built from
+that version's manifest. At most every MODEL_REGISTRY_CHECK_SECONDS it
+reads the registry's CURRENT pointer; when it names another version, the
+new pool is built and warmed on a background thread while the old one
+keeps serving, then swapped in with a single reference assignment.
+Callers take the active version once per request and use it throughout,
+so in-flight requests finish on the version they started with.
+"""
+import logging
+import threading
+import time
+
+from models.backends import BackendPool
+from models.model_registry import ModelRegistry
+from models.sentiment_model import OUTPUTS
+
+logger = logging.getLogger(__name__)
+
+WARMUP_TEXTS = [
+    "This product is great, I really love it!",
+    "Terrible service, I am very disappointed.",
+]
+
+
+def version_tag(version, backend, default_backend):
+    """Version recorded on results: "v", or "v:onnx" for a non-default backend"""
+    if backend is None or backend == default_backend:
+        return version
+    return f"{version}:{backend}"
+
+
+class LoadedVersion:
+    """A model version and the backends serving it"""
+
+    def __init__(self, version, backends):
+        self.version = version
+        self.backends = backends
+        self.loaded_at = time.time()
+
+    def result_version(self, backend):
+        return version_tag(self.version, backend, self.backends.default)
+
+
+class ModelManager:
+    """Serves the registry's current model version, swapping without downtime
+
+    With ``preload`` off (processes that send inference to the daemon) a
+    new version is switched to without loading its models; they load
+    lazily if the process ever scores locally.
+    """
+
+    def __init__(self, config, registry=None, warmup_texts=WARMUP_TEXTS, check_interval=None, preload=True):
+        self.config = config
+        self.registry = registry or ModelRegistry(config.MODEL_REGISTRY_DIR)
+        self.warmup_texts = list(warmup_texts)
+        self.preload = preload
+        if check_interval is None:
+            check_interval = config.MODEL_REGISTRY_CHECK_SECONDS
+        self.check_interval = check_interval
+        self._active = None
+        self._loading = None
+        self._last_check = 0.0
+        self._last_error = None
+        self._failed_version = None
+        self._lock = threading.Lock()
+
+    def _build(self, version):
+        version_config = self.registry.version_config(self.config, version)
+        return LoadedVersion(version, BackendPool(version_config))
+
+    def _warm(self, loaded):
+        analyzer = loaded.backends.get()
+        analyzer.sentiment_analyzer
+        analyzer.emotion_classifier
+        if self.warmup_texts:
+            loaded.backends.batch_analyze(self.warmup_texts)
+
+    @property
+    def current_version(self):
+        """The version the registry points at (may still be loading)"""
+        return self.registry.current_version()
+
+    def active(self, check=True):
+        """The version to serve this request with
+
+        The first call loads the current version synchronously; later
+        version changes are picked up in the background.
+        """
+        if self._active is None:
+            with self._lock:
+                if self._active is None:
+                    self._active = self._build(self.current_version)
+                    self._last_check = time.monotonic()
+        elif check:
+            self.check()
+        return self._active
+
+    def warm(self):
+        """Load and warm the active version in the calling thread"""
+        loaded = self.active(check=False)
+        self._warm(loaded)
+        return loaded
+
+    def check(self):
+        """Start loading the registry's current version if it is not being served"""
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+
+        try:
+            version = self.current_version
+        except OSError as e:
+            logger.warning(f"Model registry unreadable: {e}")
+            return
+        # A version that failed to load is retried only once the pointer moves
+        if version not in (self._active.version, self._failed_version):
+            self.swap_to(version)
+
+    def swap_to(self, version, wait=False):
+        """Load, warm and switch to ``version`` on a background thread"""
+        with self._lock:
+            if self._loading is not None and self._loading.is_alive():
+                return self._loading
+            thread = threading.Thread(
+                target=self._load, args=(version,), name=f'model-load-{version}', daemon=True
+            )
+            self._loading = thread
+            thread.start()
+        if wait:
+            thread.join()
+        return thread
+
+    def _load(self, version):
+        start = time.time()
+        logger.info(f"Loading model version {version} in the background...")
+        try:
+            loaded = self._build(version)
+            if self.preload:
+                self._warm(loaded)
+        except Exception as e:
+            self._last_error = f"{version}: {e}"
+            self._failed_version = version
+            logger.error(f"Model version {version} failed to load, keeping {self._active.version}: {e}")
+            return
+
+        previous = self._active
+        self._active = loaded  # Atomic swap; requests holding `previous` finish on it
+        self._last_error = None
+        self._failed_version = None
+        logger.info(
+            f"Model version {version} serving after {time.time() - start:.1f}s "
+            f"(was {previous.version if previous else 'none'})"
+        )
+
+    def batch_analyze(self, texts, model=None, backend=None, outputs=OUTPUTS, compact=False):
+        """Result dicts from ``model`` (default: the active version), tagged with its version"""
+        model = model or self.active()
+        results = model.backends.batch_analyze(texts, backend, outputs=outputs, compact=compact)
+        version = model.result_version(backend)
+        for result in results:
+            result['model_version'] = version
+        return results
+
+    def status(self):
+        """Serving and target versions, for health checks"""
+        active = self._active
+        return {
+            'serving_version': active.version if active else None,
+            'registry_version': self.current_version,
+            'loading': bool(self._loading and self._loading.is_alive()),
+            'loaded_at': active.loaded_at if active else None,
+            'last_error': self._last_error,
+        }
@@ -1,54 +1,360 @@
 """
 Sentiment analysis service with caching and error handling
 """
-from models.sentiment_model import SentimentAnalyzer
+from models.sentiment_model import OUTPUTS, normalize_outputs
+from services.model_manager import ModelManager, WARMUP_TEXTS
+from services.inference_scheduler import InferenceScheduler
+from services.inference_client import InferenceClient, InferenceUnavailable, InferenceTimeout
+from services.admission import AdmissionController, ServiceOverloaded
+from services.shadow_scorer import ShadowScorer
+from config import get_config
 from core.extensions import cache
-from core.monitoring import monitor_performance
+from core.thread_budget import ensure_thread_budget
+from core.monitoring import monitor_performance, get_memory_usage_mb, record_inference_event
+from utils.helpers import hash_text
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Threads running transformer calls for requests with a latency budget
+BUDGET_WORKERS = 8
+
+_service = None
+_service_lock = threading.Lock()
+
+# Model version of results from the keyword rules rather than a model
+RULES_VERSION = 'lexicon'
+
+def result_cache_key(text, outputs=OUTPUTS, compact=False, backend=None, version=None):
+    """Cache key for an analyze result; differs per model version, backend and output selection"""
+    key = f"sentiment:{hash_text(text)}"
+    if version:
+        key += f'@{version}'
+    if backend:
+        key += f':{backend}'
+    if tuple(outputs) != OUTPUTS:
+        key += ':' + '+'.join(outputs)
+    if compact:
+        key += ':compact'
+    return key
+
+def get_sentiment_service():
+    """Per-process SentimentService shared by all callers in this process"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = SentimentService()
+    return _service
+
 class SentimentService:
-    def __init__(self):
-        self.analyzer = SentimentAnalyzer()
+    def __init__(self, batch_size=None):
+        config = get_config()
+        self.batch_size = batch_size
+        
+        # In client mode the daemon batches requests, so no local scheduler
+        self.client = None
+        if config.INFERENCE_MODE == 'client':
+            self.client = InferenceClient(config.INFERENCE_SOCKET_PATH)
+        
+        # Inference threads for this process, unless its entry point set them
+        if not self.client:
+            ensure_thread_budget(config)
+        
+        # Versioned models; clients leave loading to the daemon
+        self.models = ModelManager(config, preload=not self.client)
+        self._daemon_down = False
+        self.ready = False
+        
+        self.admission = AdmissionController(
+            config.ADMISSION_DEGRADE_THRESHOLD,
+            config.ADMISSION_SHED_THRESHOLD,
+            retry_after=config.ADMISSION_RETRY_AFTER,
+            queue_depth=self._queue_depth
+        )
+        
+        self._budget_executor = None
+        
+        # Candidate model scored on sampled traffic, off the request path;
+        # clients leave it to the daemon, which sees all their traffic
+        self.shadow = None
+        if config.SHADOW_MODEL_VERSION and not self.client:
+            self.shadow = ShadowScorer(config, config.SHADOW_MODEL_VERSION)
+        
+        self.cascade_enabled = config.CASCADE_ENABLED
+        self.cascade_threshold = config.CASCADE_MARGIN_THRESHOLD
+        
+        self.scheduler = None
+        if config.INFERENCE_SCHEDULER_ENABLED and not self.client:
+            self.scheduler = InferenceScheduler(
+                self.models.batch_analyze,
+                max_wait_ms=config.INFERENCE_MAX_WAIT_MS,
+                max_batch=config.INFERENCE_MAX_BATCH,
+                lane_weights=config.INFERENCE_LANE_WEIGHTS
+            )
     
-    @monitor_performance
-    def analyze(self, text):
-        """Analyze sentiment with caching"""
+    def _queue_depth(self):
+        """Texts waiting in the queue this process's inference goes to"""
+        if self.client and not self._daemon_down:
+            return self.client.recent_queue_depth()
+        return self.scheduler.pending if self.scheduler else 0
+    
+    def _model(self, model=None):
+        """The model version to serve a request with"""
+        model = model or self.models.active()
+        if self.batch_size:
+            model.backends.get().batch_size = self.batch_size
+        return model
+    
+    @property
+    def backends(self):
+        """Analyzer backends of the active model version"""
+        return self._model().backends
+    
+    @property
+    def analyzer(self):
+        """The default analyzer of the active model version"""
+        return self.backends.get()
+    
+    def resolve_backend(self, backend=None):
+        """Validated backend name; None means the deployment default"""
+        return self.backends.resolve(backend)
+    
+    def cache_key(self, text, outputs=OUTPUTS, compact=False, backend=None, model=None):
+        """Result cache key, scoped to the model version currently serving"""
+        model = self._model(model)
+        version = model.version
+        if self.client and self.client.model_version and not self._daemon_down:
+            version = self.client.model_version  # The daemon may still be on the previous version
+        backend = model.backends.resolve(backend)
+        if backend == model.backends.default:
+            backend = None
+        return result_cache_key(text, outputs, compact, backend, version)
+    
+    def _run_local(self, texts, lane, outputs=OUTPUTS, compact=False, backend=None, model=None):
+        model = self._model(model)
+        if self.scheduler:
+            futures = self.scheduler.submit_many(
+                texts, lane, model=model, backend=backend, outputs=outputs, compact=compact
+            )
+            return [f.result() for f in futures]
+        return self.models.batch_analyze(texts, model, backend, outputs=outputs, compact=compact)
+    
+    def _run_batch(self, texts, lane, outputs=OUTPUTS, compact=False, backend=None, model=None):
+        """Run inference on the daemon if configured, else in-process"""
+        if self.client:
+            try:
+                results = self.client.batch_analyze(texts, lane, outputs=outputs, compact=compact, backend=backend)
+                if self._daemon_down:
+                    logger.info("Inference daemon reachable again")
+                    self._daemon_down = False
+                return results
+            except InferenceTimeout as e:
+                # Busy, not down: loading the models in every worker would
+                # multiply memory, so the caller retries later instead
+                record_inference_event('daemon_timeout')
+                raise ServiceOverloaded(self.admission.retry_after) from e
+            except InferenceUnavailable as e:
+                if not self._daemon_down:
+                    logger.warning(f"Inference daemon unavailable ({e}), using in-process models")
+                    self._daemon_down = True
+        return self._run_local(texts, lane, outputs, compact, backend, model)
+    
+    def _run_cascade(self, texts, lane, outputs=OUTPUTS, compact=False, backend=None, model=None):
+        """Answer confident texts from the lexicon, escalate the rest"""
+        model = self._model(model)
+        analyzer = model.backends.get()
+        results = [None] * len(texts)
+        escalate = []
+        
+        for i, text in enumerate(texts):
+            result, margin = analyzer.lexicon_analyze(text, outputs, compact)
+            if margin >= self.cascade_threshold:
+                result['tier'] = 'lexicon'
+                result['model_version'] = RULES_VERSION
+                results[i] = result
+            else:
+                escalate.append(i)
+        
+        if escalate:
+            escalated = self._run_batch([texts[i] for i in escalate], lane, outputs, compact, backend, model)
+            for i, result in zip(escalate, escalated):
+                result['tier'] = 'transformer'
+                results[i] = result
+        
+        record_inference_event('cascade_lexicon', len(texts) - len(escalate))
+        record_inference_event('cascade_transformer', len(escalate))
+        return results
+    
+    def _infer(self, texts, lane, outputs=OUTPUTS, compact=False, backend=None, model=None):
+        # The lexicon margin measures sentiment only, so emotion-only
+        # requests always go to the model
+        if self.cascade_enabled and 'sentiment' in outputs:
+            return self._run_cascade(texts, lane, outputs, compact, backend, model)
+        return self._run_batch(texts, lane, outputs, compact, backend, model)
+    
+    def _infer_within(self, text, lane, max_latency_ms, outputs=OUTPUTS, compact=False, backend=None, model=None):
+        """Race the model against a deadline, with the lexicon as backstop.
+        
+        The model call runs on a worker thread while the lexicon result is
+        computed here. If the model misses the deadline the lexicon answer
+        is returned: a call still queued is cancelled, one already running
+        finishes in the background and keeps its admission slot until then.
+        """
+        start = time.monotonic()
+        if self._budget_executor is None:
+            self._budget_executor = ThreadPoolExecutor(
+                max_workers=BUDGET_WORKERS, thread_name_prefix='sentiment-budget'
+            )
+        model = self._model(model)
+        future = self._budget_executor.submit(self._infer, [text], lane, outputs, compact, backend, model)
+        
+        lexicon_result, _ = model.backends.get().lexicon_analyze(text, outputs, compact)
+        
+        remaining = max_latency_ms / 1000.0 - (time.monotonic() - start)
         try:
-            result = self.analyzer.analyze(text)
+            result = future.result(timeout=max(remaining, 0))[0]
+            record_inference_event('budget_hit')
             return result
+        except FutureTimeout:
+            record_inference_event('budget_miss')
+            if not future.cancel():
+                self.admission.hold_until_done(future)
+            lexicon_result['tier'] = 'lexicon'
+            lexicon_result['budget_exceeded'] = True
+            lexicon_result['model_version'] = RULES_VERSION
+            return lexicon_result
+    
+    def warmup(self):
+        """Load the models and run a dummy batch so the first real call is fast"""
+        start = time.time()
+        rss_before = get_memory_usage_mb()
+        if self.client:
+            self._run_batch(WARMUP_TEXTS, 'bulk')
+        else:
+            # Bypass the scheduler: warmup may run in a gunicorn master
+            # before fork, where no background threads should be started
+            self._model(self.models.warm())
+        self.ready = True
+        duration = time.time() - start
+        rss_after = get_memory_usage_mb()
+        logger.info(
+            f"Sentiment models loaded and warmed in {duration:.2f}s "
+            f"(RSS {rss_after:.0f} MB, +{rss_after - rss_before:.0f} MB)"
+        )
+        return {'duration_s': round(duration, 2), 'rss_mb': round(rss_after, 1)}
+    
+    def warmup_async(self):
+        """Warm up in a background thread; ``ready`` flips when done"""
+        def run():
+            try:
+                self.warmup()
+            except Exception as e:
+                logger.error(f"Model warmup failed: {e}")
+        
+        thread = threading.Thread(target=run, name='sentiment-warmup', daemon=True)
+        thread.start()
+        return thread
+    
+    @monitor_performance
+    def analyze(self, text, lane='interactive', max_latency_ms=None, outputs=None, compact=False, backend=None):
+        """Analyze sentiment with caching
+        
+        Under load the rule-based analyzer answers instead and the result
+        is tagged ``degraded``; past the hard limit ServiceOverloaded is
+        raised. With ``max_latency_ms``, a lexicon answer tagged
+        ``budget_exceeded`` is returned if the model is not done in time.
+        ``outputs`` limits which heads run; ``compact`` trims the result.
+        ``backend`` picks one of the enabled analyzer backends.
+        """
+        outputs = normalize_outputs(outputs)
+        model = self._model()
+        backend = model.backends.resolve(backend)
+        try:
+            with self.admission.admit() as degraded:
+                if degraded:
+                    result = model.backends.get().fallback_analyze(text, outputs, compact)
+                    result['degraded'] = True
+                    result['model_version'] = RULES_VERSION
+                    return result
+                start = time.perf_counter()
+                if max_latency_ms:
+                    result = self._infer_within(text, lane, max_latency_ms, outputs, compact, backend, model)
+                else:
+                    result = self._infer([text], lane, outputs, compact, backend, model)[0]
+                if self.shadow:
+                    self.shadow.offer([text], [result], (time.perf_counter() - start) * 1000)
+                return result
+        except ServiceOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Sentiment analysis failed: {e}")
             raise
     
     @monitor_performance
-    def batch_analyze(self, texts, use_cache=True):
-        """Batch analyze multiple texts"""
-        results = []
+    def batch_analyze(self, texts, use_cache=True, lane='bulk', outputs=None, compact=False, backend=None):
+        """Batch analyze multiple texts
         
-        for text in texts:
-            try:
-                if use_cache:
-                    cache_key = f"sentiment:{hash(text)}"
-                    cached = cache.get(cache_key)
-                    if cached:
-                        results.append(cached)
-                        continue
-                
-                result = self.analyze(text)
-                
-                if use_cache:
-                    cache.set(cache_key, result, timeout=3600)
-                
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Failed to analyze text: {e}")
-                results.append({
-                    'error': str(e),
-                    'sentiment': 'neutral',
-                    'emotion': 'neutral',
-                    'confidence': 0.0
-                })
+        Cache misses are scored together in one batched pass through the
+        analyzer rather than one forward pass per text. Admission control
+        counts every miss: under load the rule-based analyzer scores them
+        (tagged ``degraded``, not cached), past the hard limit
+        ServiceOverloaded is raised.
+        """
+        outputs = normalize_outputs(outputs)
+        model = self._model()
+        backend = model.backends.resolve(backend)
+        keys = [self.cache_key(text, outputs, compact, backend, model) for text in texts]
+        results = list(cache.get_many(*keys)) if use_cache and texts else [None] * len(texts)
+        misses = [i for i, cached in enumerate(results) if not cached]
+        
+        if not misses:
+            return results
+        
+        miss_texts = [texts[i] for i in misses]
+        try:
+            with self.admission.admit(len(misses)) as degraded:
+                if degraded:
+                    analyzer = model.backends.get()
+                    analyzed = [analyzer.fallback_analyze(text, outputs, compact) for text in miss_texts]
+                    for result in analyzed:
+                        result['degraded'] = True
+                        result['model_version'] = RULES_VERSION
+                else:
+                    start = time.perf_counter()
+                    analyzed = self._infer(miss_texts, lane, outputs, compact, backend, model)
+                    if self.shadow:
+                        latency_ms = (time.perf_counter() - start) * 1000 / len(misses)
+                        self.shadow.offer(miss_texts, analyzed, latency_ms)
+        except ServiceOverloaded:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to analyze batch: {e}")
+            analyzed = [{
+                'error': str(e),
+                'sentiment': 'neutral',
+                'emotion': 'neutral',
+                'confidence': 0.0
+            } for _ in misses]
+        
+        fresh = {}
+        for i, result in zip(misses, analyzed):
+            if 'error' not in result and not result.get('degraded'):
+                fresh[keys[i]] = result
+            results[i] = result
+        
+        if use_cache and fresh:
+            cache.set_many(fresh, timeout=3600)
         
         return results
+    
+    def analyze_columns(self, texts, outputs=None, backend=None):
+        """Columnar in-process analysis for bulk jobs (a BatchResult)
+        
+        Skips the result cache, the scheduler and the daemon, and builds
+        no per-text dicts; read the arrays or call ``to_dicts`` at the edge.
+        """
+        return self._model().backends.get(backend).analyze_batch(texts, outputs=normalize_outputs(outputs))
@@ -0,0 +1,257 @@
+"""
+Shadow scoring of a candidate model version on sampled live traffic
+
+A fraction (SHADOW_SAMPLE_RATE) of the texts the serving model answers
+is handed to ``offer`` together with the served result. Offering is a
+random draw and a non-blocking put on a bounded queue: when the queue is
+full the text is dropped and counted, so the request path never waits
+and memory stays bounded. A background thread scores queued texts in
+batches with the candidate (a registry version, SHADOW_MODEL_VERSION),
+compares labels and latency, and every SHADOW_FLUSH_SECONDS writes the
+accumulated window to the ``shadow_reports`` table.
+
+Only one process per node loads the candidate: with INFERENCE_MODE=client
+the inference daemon shadows the results it serves and web and Celery
+workers build no scorer. In local mode each process shadows its own
+traffic; keep the sample rate low there.
+"""
+from datetime import datetime
+import logging
+import os
+import queue
+import random
+import threading
+import time
+
+from models.backends import BackendPool
+from models.model_registry import ModelRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class ShadowWindow:
+    """Comparison counters for one (primary, candidate) pair over a flush window"""
+
+    def __init__(self, primary_version, candidate_version):
+        self.primary_version = primary_version
+        self.candidate_version = candidate_version
+        self.started_at = datetime.utcnow()
+        self.texts = 0
+        self.sentiment_compared = 0
+        self.sentiment_agreements = 0
+        self.emotion_compared = 0
+        self.emotion_agreements = 0
+        self.primary_latency_ms = 0.0
+        self.candidate_latency_ms = 0.0
+        self.dropped = 0
+        self.errors = 0
+
+    def add(self, primary, candidate, primary_latency_ms, candidate_latency_ms):
+        self.texts += 1
+        self.primary_latency_ms += primary_latency_ms
+        self.candidate_latency_ms += candidate_latency_ms
+        for field in ('sentiment', 'emotion'):
+            if field in primary and field in candidate:
+                setattr(self, f'{field}_compared', getattr(self, f'{field}_compared') + 1)
+                if primary[field] == candidate[field]:
+                    setattr(self, f'{field}_agreements', getattr(self, f'{field}_agreements') + 1)
+
+    def to_row(self):
+        """Column values of the report row for this window"""
+        return {
+            'primary_version': self.primary_version,
+            'candidate_version': self.candidate_version,
+            'texts': self.texts,
+            'sentiment_compared': self.sentiment_compared,
+            'sentiment_agreements': self.sentiment_agreements,
+            'emotion_compared': self.emotion_compared,
+            'emotion_agreements': self.emotion_agreements,
+            'primary_latency_ms': round(self.primary_latency_ms / self.texts, 3) if self.texts else 0.0,
+            'candidate_latency_ms': round(self.candidate_latency_ms / self.texts, 3) if self.texts else 0.0,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'window_start': self.started_at,
+            'window_end': datetime.utcnow(),
+        }
+
+
+def report_app(config):
+    """A bare Flask app bound to the database, for saving reports from a
+    process that runs no web app (the inference daemon)"""
+    from flask import Flask
+    from core.extensions import db
+
+    app = Flask(__name__)
+    app.config.from_object(config)
+    db.init_app(app)
+    return app
+
+
+def save_report(app, rows):
+    """Insert report rows into the shadow_reports table"""
+    from core.extensions import db
+    from models import ShadowReport
+
+    with app.app_context():
+        db.session.add_all([ShadowReport(**row) for row in rows])
+        db.session.commit()
+
+
+class ShadowScorer:
+    """Scores sampled texts with a candidate model off the request path
+
+    ``report_fn(rows)`` receives the window rows on every flush; by
+    default they are saved with ``app``, or the Flask app captured on the
+    first ``offer`` made inside an app context.
+    """
+
+    def __init__(self, config, candidate_version, registry=None, sample_rate=None,
+                 queue_size=None, batch_size=None, flush_seconds=None, report_fn=None, app=None):
+        self.config = config
+        self.candidate_version = candidate_version
+        self.registry = registry or ModelRegistry(config.MODEL_REGISTRY_DIR)
+        self.sample_rate = config.SHADOW_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.batch_size = batch_size or config.SHADOW_BATCH_SIZE
+        self.flush_seconds = config.SHADOW_FLUSH_SECONDS if flush_seconds is None else flush_seconds
+        self.report_fn = report_fn
+        self._queue = queue.Queue(maxsize=queue_size or config.SHADOW_QUEUE_SIZE)
+        self._candidate = None
+        self._windows = {}
+        self._dropped = 0
+        self._app = app
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def offer(self, texts, results, latency_ms):
+        """Queue a sample of served results for shadow scoring; never blocks
+
+        ``latency_ms`` is the serving model's per-text latency.
+        """
+        if not self.sample_rate:
+            return
+        for text, result in zip(texts, results):
+            if random.random() >= self.sample_rate:
+                continue
+            if 'error' in result or result.get('model_version') in (None, 'lexicon'):
+                continue  # Rule-based answers say nothing about the serving model
+            self._ensure_worker()
+            primary = {
+                key: result[key] for key in ('sentiment', 'emotion', 'model_version') if key in result
+            }
+            try:
+                self._queue.put_nowait((text, primary, latency_ms))
+            except queue.Full:
+                with self._lock:
+                    self._dropped += 1
+
+    def _ensure_worker(self):
+        # Threads don't survive fork, so each gunicorn/celery child starts its own
+        if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                    if self._app is None and self.report_fn is None:
+                        from flask import current_app, has_app_context
+                        if has_app_context():
+                            self._app = current_app._get_current_object()
+                    self._pid = os.getpid()
+                    self._thread = threading.Thread(target=self._run, name='shadow-scorer', daemon=True)
+                    self._thread.start()
+
+    @property
+    def candidate(self):
+        """BackendPool of the candidate version, loaded on first use"""
+        if self._candidate is None:
+            version_config = self.registry.version_config(self.config, self.candidate_version)
+            self._candidate = BackendPool(version_config)
+        return self._candidate
+
+    def _take_batch(self, timeout):
+        try:
+            batch = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            remaining = self.flush_seconds - (time.monotonic() - self._last_flush)
+            batch = self._take_batch(max(remaining, 0.01))
+            if batch:
+                self.score(batch)
+            if time.monotonic() - self._last_flush >= self.flush_seconds:
+                self.flush()
+
+    def _window(self, primary_version):
+        window = self._windows.get(primary_version)
+        if window is None:
+            window = self._windows[primary_version] = ShadowWindow(primary_version, self.candidate_version)
+        return window
+
+    def score(self, batch):
+        """Score (text, primary result, primary latency) items with the candidate"""
+        texts = [text for text, _, _ in batch]
+        start = time.perf_counter()
+        try:
+            candidate_results = self.candidate.batch_analyze(texts, compact=True)
+        except Exception as e:
+            logger.warning(f"Shadow scoring with {self.candidate_version} failed: {e}")
+            with self._lock:
+                for _, primary, _ in batch:
+                    self._window(primary['model_version']).errors += 1
+            return
+        candidate_latency_ms = (time.perf_counter() - start) * 1000 / len(texts)
+
+        with self._lock:
+            for (_, primary, primary_latency_ms), candidate in zip(batch, candidate_results):
+                self._window(primary['model_version']).add(
+                    primary, candidate, primary_latency_ms, candidate_latency_ms
+                )
+
+    def flush(self):
+        """Report the accumulated windows and start new ones"""
+        with self._lock:
+            windows, self._windows = self._windows, {}
+            dropped, self._dropped = self._dropped, 0
+            self._last_flush = time.monotonic()
+        if dropped:
+            window = next(iter(windows.values()), None) or ShadowWindow('unknown', self.candidate_version)
+            window.dropped += dropped
+            windows.setdefault(window.primary_version, window)
+        if not windows:
+            return []
+
+        rows = [window.to_row() for window in windows.values()]
+        try:
+            if self.report_fn:
+                self.report_fn(rows)
+            elif self._app is not None:
+                save_report(self._app, rows)
+            else:
+                logger.info(f"Shadow report (no app to save it with): {rows}")
+        except Exception as e:
+            logger.warning(f"Could not save shadow report: {e}")
+        return rows
+
+    def status(self):
+        """Queue depth and the counters of the current window (JSON-ready)"""
+        with self._lock:
+            windows = [window.to_row() for window in self._windows.values()]
+            status = {
+                'candidate_version': self.candidate_version,
+                'sample_rate': self.sample_rate,
+                'queued': self._queue.qsize(),
+                'queue_size': self._queue.maxsize,
+                'dropped': self._dropped,
+                'windows': windows,
+            }
+        for row in windows:
+            row['window_start'] = row['window_start'].isoformat()
+            row['window_end'] = row['window_end'].isoformat()
+        return status
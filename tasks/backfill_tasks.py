@@ -0,0 +1,42 @@
+"""
+Celery tasks re-scoring stored reviews (services/backfill.py)
+
+``start_backfill_task`` fans a job out into ``parallelism`` lanes; callers
+mark the job running with ``start_job`` first, which refuses a job whose
+lanes are still alive, so a job never runs more lanes than that. A lane
+task re-scores one primary-key range and then re-queues itself, so tasks
+stay short and lanes spread over all workers. Lane tasks are acknowledged
+late: if a worker dies mid-range, the message is redelivered and the
+range resumes from its checkpoint once its lease expires.
+"""
+from core.celery_app import celery
+from core.extensions import db
+from models import BackfillJob
+from services.backfill import run_next_range
+import logging
+
+logger = logging.getLogger(__name__)
+
+@celery.task
+def start_backfill_task(job_id):
+    """
+    Queue ``parallelism`` lanes for a job ``start_job`` has marked running
+    """
+    job = db.session.get(BackfillJob, job_id)
+    if job is None or job.status != 'running':
+        return {'job_id': job_id, 'lanes': 0}
+
+    for _ in range(job.parallelism):
+        backfill_lane_task.delay(job_id)
+
+    logger.info(f"Backfill {job_id} started on {job.parallelism} lanes")
+    return {'job_id': job_id, 'lanes': job.parallelism}
+
+
+@celery.task(acks_late=True, reject_on_worker_lost=True)
+def backfill_lane_task(job_id):
+    """
+    Re-score the next range of a job, then queue the lane again
+    """
+    if run_next_range(job_id):
+        backfill_lane_task.delay(job_id)
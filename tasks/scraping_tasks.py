@@ -5,7 +5,7 @@ from core.celery_app import celery
 from core.extensions import db
 from models import Review, ScrapeJob
 from services.scraper_service import ScraperService
-from services.sentiment_service import SentimentService
+from services.sentiment_service import get_sentiment_service
 from datetime import datetime
 import logging
 
@@ -35,7 +35,7 @@ def scrape_reviews_task(self, source, url, max_reviews=100, user_id=None):
         
         # Initialize services
         scraper = ScraperService()
-        sentiment_service = SentimentService()
+        sentiment_service = get_sentiment_service()
         
         # Scrape reviews
         reviews_text = scraper.scrape_with_retry(source, url, max_reviews)
@@ -57,6 +57,7 @@ def scrape_reviews_task(self, source, url, max_reviews=100, user_id=None):
                     sentiment=result['sentiment'],
                     emotion=result['emotion'],
                     confidence=result['confidence'],
+                    model_version=result.get('model_version'),
                     source=source,
                     user_id=user_id,
                     scrape_job_id=job.id
@@ -1,6 +1,7 @@
 """
 Pytest configuration and fixtures
 """
+from types import SimpleNamespace
 import pytest
 from app_production import create_app
 from core.extensions import db as _db
@@ -52,3 +53,19 @@ def auth_headers(client, sample_user):
     })
     token = response.json['access_token']
     return {'Authorization': f'Bearer {token}'}
+
+@pytest.fixture
+def make_config():
+    """Factory for a lightweight app config (lexicon backend, no Flask app); pass overrides as kwargs"""
+    def factory(**overrides):
+        settings = dict(
+            INFERENCE_BACKEND='lexicon', ANALYZER_BACKENDS=[], INFERENCE_BATCH_SIZE=8,
+            MODEL_CACHE_DIR='./models/cache', MODEL_OFFLINE=True,
+            TFIDF_MODEL_PATH=None, STUDENT_MODEL_PATH=None,
+            SENTIMENT_MODEL_NAME=None, EMOTION_MODEL_NAME=None,
+            MODEL_REGISTRY_DIR='./models/registry', MODEL_REGISTRY_CHECK_SECONDS=0,
+            SHADOW_SAMPLE_RATE=1.0, SHADOW_QUEUE_SIZE=10, SHADOW_BATCH_SIZE=4, SHADOW_FLUSH_SECONDS=60
+        )
+        settings.update(overrides)
+        return SimpleNamespace(**settings)
+    return factory
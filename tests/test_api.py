@@ -9,6 +9,41 @@ def test_health_check(client):
     assert response.status_code == 200
     assert response.json['status'] == 'healthy'
 
+def test_readiness_check(client):
+    """Readiness is 503 until the models are warm"""
+    from services.sentiment_service import get_sentiment_service
+    
+    service = get_sentiment_service()
+    service.ready = False
+    response = client.get('/api/v1/health/ready')
+    assert response.status_code == 503
+    assert response.json['status'] == 'warming'
+    
+    service.ready = True
+    response = client.get('/api/v1/health/ready')
+    assert response.status_code == 200
+    assert response.json['status'] == 'ready'
+
+def test_batch_analyze_is_admitted_per_text(client):
+    """Batches degrade to the rules under load and are refused past the hard limit"""
+    from services.admission import ServiceOverloaded
+    from services.sentiment_service import get_sentiment_service
+    
+    service = get_sentiment_service()
+    admission = service.admission
+    queue_depth = admission.queue_depth
+    try:
+        admission.queue_depth = lambda: admission.degrade_threshold
+        results = service.batch_analyze(['I love it', 'This is awful'], use_cache=False)
+        assert all(r['degraded'] and r['model_version'] == 'lexicon' for r in results)
+        
+        admission.queue_depth = lambda: admission.shed_threshold
+        with pytest.raises(ServiceOverloaded):
+            service.batch_analyze(['Another text'], use_cache=False)
+    finally:
+        admission.queue_depth = queue_depth
+    assert admission.in_flight == 0
+
 def test_register_user(client):
     """Test user registration"""
     response = client.post('/api/v1/auth/register', json={
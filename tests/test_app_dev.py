@@ -0,0 +1,24 @@
+"""
+Development app analyzer tests
+"""
+import pytest
+from app_dev import SimpleSentimentAnalyzer
+
+def test_analyze_batch_matches_analyze():
+    """Vectorized batch scoring gives the same result as analyze() per text"""
+    pytest.importorskip('scipy')
+    analyzer = SimpleSentimentAnalyzer()
+    texts = [
+        'Excellent product, I love it and would recommend it!',
+        'Terrible. Broken on arrival, a waste of money; so frustrated',
+        'ok',
+        '',
+        'Happy? Sad? Surprised... amazed, shocked and a bit worried',
+        'LOVE love lovely loves',
+        'outstanding' * 3 + ' good',
+    ]
+    assert analyzer.batch_analyze(texts) == [analyzer.analyze(text) for text in texts]
+    
+    result = analyzer.analyze_batch(texts)
+    assert result.sentiments.tolist() == [analyzer.analyze(text)['sentiment'] for text in texts]
+    assert result.emotion_scores.shape == (len(texts), len(analyzer.emotion_keywords))
@@ -0,0 +1,47 @@
+"""
+Analyzer backend registry and columnar result tests
+"""
+import numpy as np
+import pytest
+from models.backends import BackendPool, create_backend
+from models.sentiment_model import SentimentAnalyzer
+
+def test_lexicon_backend_is_columnar(make_config):
+    """analyze_batch returns arrays; dicts match the rule-based analyzer"""
+    backend = create_backend('lexicon', make_config())
+    texts = ['Great product, I love it', '', 'Terrible, I hate it and I am angry']
+    result = backend.analyze_batch(texts)
+
+    assert len(result) == 3
+    assert result.sentiments.tolist() == ['positive', 'neutral', 'negative']
+    assert result.emotions.tolist() == ['happy', 'neutral', 'angry']
+    assert result.scored.tolist() == [True, False, True]
+    assert isinstance(result.confidences, np.ndarray)
+    assert result.to_dicts(texts) == SentimentAnalyzer().fallback_analyze_batch(texts)
+
+def test_pool_resolves_enabled_backends_only(make_config):
+    """Requests may only pick the default or an enabled backend"""
+    pool = BackendPool(make_config(ANALYZER_BACKENDS=['student']))
+
+    assert pool.resolve(None) == 'lexicon'
+    assert pool.resolve('student') == 'student'
+    assert pool.get() is pool.get('lexicon')
+    with pytest.raises(ValueError):
+        pool.resolve('onnx')
+    with pytest.raises(ValueError):
+        create_backend('toxicity', make_config())
+
+def test_pool_dicts_honour_outputs_and_compact(make_config):
+    """Per-text dicts are built at the edge with the requested fields"""
+    pool = BackendPool(make_config())
+    result = pool.batch_analyze(['Great, I love it'], outputs=('emotion',), compact=True)
+
+    assert result == [{'emotion': 'happy'}]
+
+def test_tfidf_model_only_serves_the_tfidf_backend(tmp_path, make_config):
+    """TFIDF_MODEL_PATH configures the tfidf backend without touching the others"""
+    config = make_config(TFIDF_MODEL_PATH=str(tmp_path / 'model.npz'))
+
+    assert create_backend('tfidf', config).tfidf_model_path == config.TFIDF_MODEL_PATH
+    assert create_backend('pytorch', config).tfidf_model_path is None
+    assert BackendPool(make_config(ANALYZER_BACKENDS=['tfidf'])).resolve('tfidf') == 'tfidf'
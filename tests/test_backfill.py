@@ -0,0 +1,86 @@
+"""
+Re-scoring backfill tests
+"""
+import pytest
+from models import Review, BackfillRange
+from models.sentiment_model import SentimentAnalyzer
+from services.backfill import (
+    plan_backfill, start_job, claim_range, process_range, finish_job, job_progress, RateLimiter,
+    BackfillConflict
+)
+
+@pytest.fixture
+def empty_reviews(db):
+    """The db fixture with an empty reviews table: a backfill scans all of it"""
+    Review.query.delete()
+    db.session.commit()
+    return db
+
+def _add_reviews(db, texts, model_version=None):
+    for text in texts:
+        db.session.add(Review(
+            text=text, sentiment='neutral', emotion='neutral', confidence=0.0, model_version=model_version
+        ))
+    db.session.commit()
+
+def test_backfill_rescores_ranges_with_checkpoints(empty_reviews):
+    """Ranges are claimed once, re-scored in chunks and checkpointed"""
+    db = empty_reviews
+    _add_reviews(db, ['I love it', 'I hate it, terrible', 'Great, happy'] * 3)
+    _add_reviews(db, ['Already current'], model_version='v2')
+    
+    job = plan_backfill('v2', range_size=4, chunk_size=2, parallelism=2, write_rate=1000)
+    assert job.total_rows == 9
+    start_job(job.id)
+    
+    first = claim_range(job.id, lease_seconds=300)
+    second = claim_range(job.id, lease_seconds=300)
+    assert first.id != second.id
+    
+    analyzer = SentimentAnalyzer(backend='lexicon')
+    process_range(job, first, analyzer, RateLimiter(None))
+    assert first.status == 'done'
+    assert first.last_id is not None
+    
+    # The second lane "crashed": its range is reclaimed once the lease is over
+    assert claim_range(job.id, lease_seconds=0) is not None
+    while True:
+        backfill_range = claim_range(job.id, lease_seconds=0)
+        if backfill_range is None:
+            break
+        process_range(job, backfill_range, analyzer, RateLimiter(None))
+    
+    assert finish_job(job.id).status == 'completed'
+    progress = job_progress(job.id)
+    assert progress['rows_done'] == 9 and progress['percent'] == 100.0
+    
+    review = Review.query.filter_by(text='I love it').first()
+    assert (review.sentiment, review.emotion, review.model_version) == ('positive', 'happy', 'v2')
+    assert BackfillRange.query.filter_by(job_id=job.id, status='done').count() == job.ranges.count()
+
+def test_resuming_a_running_job_keeps_its_lanes_and_write_rate(empty_reviews, monkeypatch):
+    """A job with live lanes is not started again; once their leases expire it is"""
+    from tasks import backfill_tasks
+    lanes = []
+    monkeypatch.setattr(backfill_tasks.backfill_lane_task, 'delay', lanes.append)
+    
+    db = empty_reviews
+    _add_reviews(db, ['I love it', 'I hate it'] * 4)
+    job = plan_backfill('v2', range_size=2, chunk_size=2, parallelism=2, write_rate=100)
+    start_job(job.id)
+    backfill_tasks.start_backfill_task(job.id)
+    assert len(lanes) == 2
+    
+    # Queued lanes hold the job before they claim a range and while they work on one
+    for _ in range(2):
+        with pytest.raises(BackfillConflict):
+            start_job(job.id, lease_seconds=300)
+        claim_range(job.id, lease_seconds=300)
+    assert len(lanes) == 2
+    assert job.status == 'running'
+    assert len(lanes) * job.write_rate / job.parallelism <= 100  # Per-lane limiter rate
+    
+    # The lanes died: the job restarts on a fresh set of lanes
+    start_job(job.id, lease_seconds=0)
+    backfill_tasks.start_backfill_task(job.id)
+    assert len(lanes) == 4
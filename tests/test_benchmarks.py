@@ -0,0 +1,62 @@
+"""
+Benchmark suite tests
+"""
+import pytest
+from benchmarks.corpus import synthetic_corpus, fixture_corpus, PHRASES
+from benchmarks.runner import DEFAULT_OPTIONS, run_target, compare_reports, percentile
+from benchmarks.targets import Target
+
+def _options(**overrides):
+    options = dict(DEFAULT_OPTIONS, latency_texts=20, throughput_texts=40, accuracy_texts=40, batch_sizes=[1, 16])
+    options.update(overrides)
+    return options
+
+def test_corpora_are_labeled_and_deterministic():
+    """The synthetic corpus is reproducible per seed; fixture labels use the API's names"""
+    assert synthetic_corpus(50, seed=1) == synthetic_corpus(50, seed=1)
+    assert synthetic_corpus(50, seed=1) != synthetic_corpus(50, seed=2)
+    
+    lengths = [len(r['text'].split()) for r in synthetic_corpus(1000)]
+    assert max(lengths) >= 600 and sorted(lengths)[500] < 100
+    
+    labels = set(PHRASES)
+    assert all((r['sentiment'], r['emotion']) in labels for r in synthetic_corpus(200))
+    assert all((r['sentiment'], r['emotion']) in labels for r in fixture_corpus())
+
+def test_run_target_reports_every_measurement():
+    """A target run has latency percentiles, throughput per batch size, accuracy and RSS"""
+    result = run_target('fallback', _options())
+    
+    assert result['status'] == 'ok'
+    latency = result['latency_ms']
+    assert latency['texts'] == 20 and latency['p50'] <= latency['p99']
+    assert set(result['throughput']) == {'1', '16'}
+    assert 0 <= result['accuracy']['fixture']['sentiment']['accuracy'] <= 1
+    assert result['accuracy']['synthetic']['texts'] == 40
+    assert result['rss_mb']['peak'] > 0
+
+def test_missing_models_are_skipped_not_faked(tmp_path):
+    """Targets without their model report skipped instead of measuring the fallback"""
+    result = run_target('student', _options(student_model_path=str(tmp_path / 'missing.npz')))
+    assert result['status'] == 'skipped'
+
+def test_compare_reports_diffs_metrics():
+    old = {'results': {'fallback': {'status': 'ok', 'throughput': {'8': 100.0},
+                                    'accuracy': {'fixture': {'sentiment': {'accuracy': 0.5}}}}}}
+    new = {'results': {'fallback': {'status': 'ok', 'throughput': {'8': 150.0},
+                                    'accuracy': {'fixture': {'sentiment': {'accuracy': 0.6}}}}}}
+    rows = {metric: change for _, metric, _, _, change in compare_reports(old, new)}
+    
+    assert rows['throughput.8'] == 50.0
+    assert round(rows['accuracy.fixture.sentiment'], 1) == 20.0
+    assert percentile([1.0, 2.0, 3.0], 50) == 2.0
+
+def test_incomplete_target_fails_when_built():
+    """A target missing analyze_batch is rejected before any measurement runs"""
+    class Incomplete(Target):
+        name = 'incomplete'
+        def load(self):
+            pass
+    
+    with pytest.raises(TypeError):
+        Incomplete(_options())
@@ -0,0 +1,75 @@
+"""
+Model registry and hot-swap tests
+"""
+import pytest
+from models.model_registry import ModelRegistry, BUILTIN_VERSION
+from services.model_manager import ModelManager
+
+def test_publish_and_activate(tmp_path):
+    """Activating a version moves the pointer; published versions are immutable"""
+    registry = ModelRegistry(str(tmp_path))
+    assert registry.current_version() == BUILTIN_VERSION
+    
+    artifact = tmp_path / 'student.npz'
+    artifact.write_bytes(b'weights')
+    registry.publish('v1', backend='student', student_model_path=str(artifact))
+    registry.activate('v1')
+    
+    assert registry.versions() == ['v1']
+    assert registry.current_version() == 'v1'
+    manifest = registry.load_manifest('v1')
+    assert manifest['student_model_path'] == str(tmp_path / 'versions' / 'v1' / 'student.npz')
+    
+    with pytest.raises(ValueError):
+        registry.publish('v1')
+    with pytest.raises(ValueError):
+        registry.activate('missing')
+    with pytest.raises(ValueError):
+        registry.publish('../escape')
+
+def test_version_config_overrides_manifest_settings(tmp_path, make_config):
+    """A version's manifest overrides the app config, other settings pass through"""
+    registry = ModelRegistry(str(tmp_path))
+    registry.publish('v2', backend='onnx', sentiment_model='org/sentiment-v2')
+    
+    # Settings the version left unset stay unset whatever the environment says
+    config = registry.version_config(
+        make_config(EMOTION_MODEL_NAME='org/emotion-env', TFIDF_MODEL_PATH='/env/tfidf.npz'), 'v2'
+    )
+    assert config.INFERENCE_BACKEND == 'onnx'
+    assert config.SENTIMENT_MODEL_NAME == 'org/sentiment-v2'
+    assert config.EMOTION_MODEL_NAME is None
+    assert config.TFIDF_MODEL_PATH is None
+    assert config.INFERENCE_BATCH_SIZE == 8
+    assert config.MODEL_VERSION == 'v2'
+
+def test_manager_swaps_versions_without_dropping_requests(tmp_path, make_config):
+    """Results are tagged with their version; a held version keeps working after a swap"""
+    registry = ModelRegistry(str(tmp_path))
+    manager = ModelManager(make_config(), registry)
+    
+    old = manager.active()
+    assert old.version == BUILTIN_VERSION
+    
+    registry.publish('v1', backend='lexicon')
+    registry.activate('v1')
+    manager.active()  # Notices the pointer and loads v1 in the background
+    manager._loading.join(timeout=10)
+    
+    assert manager.active().version == 'v1'
+    assert manager.batch_analyze(['I love it'])[0]['model_version'] == 'v1'
+    assert manager.batch_analyze(['I love it'], model=old)[0]['model_version'] == BUILTIN_VERSION
+    assert manager.status()['serving_version'] == 'v1'
+
+def test_manager_keeps_serving_when_a_version_fails(tmp_path, make_config):
+    """A version that cannot load leaves the previous one in place"""
+    registry = ModelRegistry(str(tmp_path))
+    manager = ModelManager(make_config(), registry)
+    manager.active()
+    
+    registry.publish('broken', backend='lexicon', student_model_path=None)
+    (tmp_path / 'versions' / 'broken' / 'manifest.json').write_text('{"version": "broken", "backend": "nope"}')
+    manager.swap_to('broken', wait=True)
+    
+    assert manager.active(check=False).version == BUILTIN_VERSION
+    assert manager.status()['last_error'].startswith('broken')
@@ -0,0 +1,100 @@
+"""
+Sentiment analyzer tests
+"""
+import pytest
+from models.lexicon import FALLBACK_LEXICON
+from models.sentiment_model import SentimentAnalyzer, normalize_outputs
+
+@pytest.fixture
+def analyzer():
+    """Analyzer that uses the rule-based path (no model download)"""
+    analyzer = SentimentAnalyzer()
+    analyzer._sentiment_analyzer = "fallback"
+    analyzer._emotion_classifier = "fallback"
+    return analyzer
+
+def test_batch_analyze_preserves_order(analyzer):
+    """Batched results come back in input order"""
+    texts = [
+        'This is terrible, the worst purchase',
+        '!!!',
+        'Great product, I love it and it is excellent value',
+        'ok',
+    ]
+    results = analyzer.batch_analyze(texts, batch_size=2)
+    
+    assert len(results) == len(texts)
+    assert results[0]['sentiment'] == 'negative'
+    assert results[1]['confidence'] == 0.0
+    assert results[2]['sentiment'] == 'positive'
+    assert results[2]['original_text'] == texts[2]
+
+def test_batch_analyze_matches_single(analyzer):
+    """Batched path gives the same result as analyze()"""
+    texts = ['I am so happy with this', 'Awful service, very angry']
+    assert analyzer.batch_analyze(texts) == [analyzer.analyze(t) for t in texts]
+
+def test_lexicon_margin(analyzer):
+    """Clear-cut texts get a high margin, mixed ones a low margin"""
+    clear, clear_margin = analyzer.lexicon_analyze('Great product, excellent value, I love it')
+    mixed, mixed_margin = analyzer.lexicon_analyze('Great screen but terrible battery')
+    
+    assert clear['sentiment'] == 'positive'
+    assert clear_margin > 0.6
+    assert mixed_margin < 0.6
+
+def test_selected_outputs_and_compact(analyzer):
+    """Only the requested heads are returned; compact drops the extras"""
+    result = analyzer.analyze('Great product, I love it', outputs=('sentiment',), compact=True)
+    
+    assert result['sentiment'] == 'positive'
+    assert 'emotion' not in result
+    assert 'processed_text' not in result
+    with pytest.raises(ValueError):
+        normalize_outputs('sentiment,toxicity')
+
+def test_lexicon_matches_whole_words_only():
+    """Keywords inside longer words do not count"""
+    counts = FALLBACK_LEXICON.count('I know this is nothing special')
+    assert counts['negative'] == 0
+    
+    assert FALLBACK_LEXICON.count_batch(['not good', 'ok']) == [
+        FALLBACK_LEXICON.count('not good'), FALLBACK_LEXICON.count('ok')
+    ]
+
+def test_fallback_batch_matches_single(analyzer):
+    """Batch fallback gives the same result as fallback_analyze()"""
+    texts = ['Great, I love it', '', 'Worst thing ever, I hate it']
+    assert analyzer.fallback_analyze_batch(texts) == [analyzer.fallback_analyze(t) for t in texts]
+
+def _mapped_ranges(path):
+    ranges = []
+    with open('/proc/self/maps') as f:
+        for line in f:
+            if line.rstrip().endswith(path):
+                low, high = (int(x, 16) for x in line.split()[0].split('-'))
+                ranges.append((low, high))
+    return ranges
+
+def test_model_store_parameters_are_file_backed(tmp_path):
+    """Stored weights become the parameters in place: mapped, not copied or re-initialised"""
+    pytest.importorskip('torch')
+    transformers = pytest.importorskip('transformers')
+    from models.model_store import ModelStore
+    
+    vocab = tmp_path / 'vocab.txt'
+    vocab.write_text('\n'.join(['[PAD]', '[UNK]', '[CLS]', '[SEP]', '[MASK]', 'good', 'bad']))
+    config = transformers.DistilBertConfig(vocab_size=7, dim=32, hidden_dim=64, n_layers=1, n_heads=2)
+    store = ModelStore(str(tmp_path), offline=True)
+    path = store.path_for('org/tiny')
+    transformers.DistilBertForSequenceClassification(config).save_pretrained(path, safe_serialization=True)
+    transformers.BertTokenizerFast(str(vocab)).save_pretrained(path)
+    
+    model, tokenizer = store.load('org/tiny')
+    assert model(**tokenizer('good', return_tensors='pt')).logits.shape == (1, 2)
+    
+    weights = str(tmp_path / 'store' / 'org--tiny' / 'model.safetensors')
+    ranges = _mapped_ranges(weights)
+    params = list(model.parameters())
+    assert ranges and not any(t.is_meta for t in [*params, *model.buffers()])
+    assert all(any(low <= p.data_ptr() < high for low, high in ranges) for p in params)
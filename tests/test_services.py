@@ -0,0 +1,265 @@
+"""
+Inference service tests
+"""
+from concurrent.futures import Future
+from types import SimpleNamespace
+import os
+import socket
+import threading
+import time
+import pytest
+from models.model_registry import ModelRegistry
+from core import thread_budget
+from services.admission import AdmissionController, ServiceOverloaded
+from services.inference_client import (
+    InferenceClient, InferenceUnavailable, InferenceTimeout, send_frame, recv_frame
+)
+from services.inference_scheduler import InferenceScheduler
+from services.inference_server import InferenceServer
+from services.shadow_scorer import ShadowScorer
+
+def test_scheduler_returns_results_in_order():
+    """Each caller gets the result for its own text"""
+    scheduler = InferenceScheduler(lambda texts: [t.upper() for t in texts], max_wait_ms=5, max_batch=4)
+    futures = scheduler.submit_many(['a', 'b', 'c', 'd', 'e'], lane='bulk')
+    futures.append(scheduler.submit('f'))
+    
+    assert [f.result(timeout=5) for f in futures] == ['A', 'B', 'C', 'D', 'E', 'F']
+
+def test_scheduler_groups_by_options():
+    """Texts submitted with different options go to separate batch calls"""
+    calls = []
+    def batch_fn(texts, suffix=''):
+        calls.append(list(texts))
+        return [t + suffix for t in texts]
+    
+    scheduler = InferenceScheduler(batch_fn, max_wait_ms=20, max_batch=8)
+    plain = scheduler.submit_many(['a', 'b'], lane='bulk')
+    marked = scheduler.submit_many(['c'], lane='bulk', suffix='!')
+    
+    assert [f.result(timeout=5) for f in plain + marked] == ['a', 'b', 'c!']
+    assert ['c'] in calls
+
+def test_scheduler_fails_futures_on_short_results():
+    """Callers left without a result by a short batch_fn get an error instead of hanging"""
+    scheduler = InferenceScheduler(lambda texts: texts[:1], max_wait_ms=20, max_batch=4)
+    futures = scheduler.submit_many(['a', 'b', 'c'], lane='bulk')
+    
+    assert futures[0].result(timeout=5) == 'a'
+    for future in futures[1:]:
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
+
+def test_scheduler_rejects_unknown_lane():
+    """Unknown lanes are a caller error"""
+    scheduler = InferenceScheduler(lambda texts: texts)
+    with pytest.raises(ValueError):
+        scheduler.submit('text', lane='missing')
+
+def test_admission_degrades_then_sheds():
+    """Requests past the thresholds are degraded, then refused"""
+    admission = AdmissionController(degrade_threshold=1, shed_threshold=2, retry_after=3)
+    
+    with admission.admit() as first:
+        with admission.admit() as second:
+            assert first is False
+            assert second is True
+            with pytest.raises(ServiceOverloaded) as exc:
+                with admission.admit():
+                    pass
+            assert exc.value.retry_after == 3
+    
+    assert admission.in_flight == 0
+
+def test_admission_counts_abandoned_work_until_done():
+    """A model call left running after a missed budget still takes a slot"""
+    admission = AdmissionController(degrade_threshold=1, shed_threshold=2)
+    abandoned = Future()
+    abandoned.set_running_or_notify_cancel()
+    admission.hold_until_done(abandoned)
+    
+    with admission.admit() as degraded:
+        assert degraded is True
+        with pytest.raises(ServiceOverloaded):
+            with admission.admit():
+                pass
+    
+    abandoned.set_result([])
+    assert admission.in_flight == 0
+
+def test_admission_counts_texts_and_queue_depth():
+    """Batches count every text, and texts queued for the model count as load"""
+    depth = [0]
+    admission = AdmissionController(degrade_threshold=4, shed_threshold=8, queue_depth=lambda: depth[0])
+    
+    with admission.admit(6) as batch:
+        assert batch is False  # An idle service runs a large batch on the model
+        assert admission.in_flight == 6
+        with admission.admit() as single:
+            assert single is True
+    
+    depth[0] = 5  # Other workers' texts waiting on the daemon
+    with admission.admit() as degraded:
+        assert degraded is True
+    depth[0] = 8
+    with pytest.raises(ServiceOverloaded):
+        with admission.admit():
+            pass
+    assert admission.in_flight == 0
+
+def test_shadow_scorer_reports_agreement(tmp_path, make_config):
+    """Sampled results are re-scored by the candidate and compared"""
+    reports = []
+    scorer = ShadowScorer(make_config(), 'builtin', ModelRegistry(str(tmp_path)), report_fn=reports.extend)
+    served = [
+        {'sentiment': 'positive', 'emotion': 'happy', 'model_version': 'v1'},
+        {'sentiment': 'positive', 'emotion': 'angry', 'model_version': 'v1'},
+        {'sentiment': 'positive', 'emotion': 'neutral', 'model_version': 'lexicon'},
+    ]
+    scorer.offer(['I love it', 'I hate it', 'ok'], served, latency_ms=5.0)
+    
+    deadline = time.monotonic() + 5
+    while sum(window['texts'] for window in scorer.status()['windows']) < 2:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    (row,) = scorer.flush()
+    
+    assert row['primary_version'] == 'v1' and row['texts'] == 2
+    assert row['sentiment_agreements'] == 1 and row['emotion_agreements'] == 2
+    assert row['primary_latency_ms'] == 5.0
+    assert reports == [row]
+
+def test_shadow_queue_drops_when_full(tmp_path, make_config):
+    """A full shadow queue drops sampled texts instead of blocking or growing"""
+    scorer = ShadowScorer(make_config(), 'builtin', ModelRegistry(str(tmp_path)),
+                          queue_size=2, report_fn=lambda rows: None)
+    scorer._ensure_worker = lambda: None  # No worker: nothing drains the queue
+    served = [{'sentiment': 'positive', 'emotion': 'happy', 'model_version': 'v1'}] * 5
+    scorer.offer(['text'] * 5, served, latency_ms=1.0)
+    
+    assert scorer.status()['queued'] == 2
+    assert scorer.flush()[0]['dropped'] == 3
+
+def test_thread_budget_splits_cpus_between_processes():
+    """Each process gets its share of the usable CPUs, capped by the cgroup quota"""
+    cpus = list(range(8))
+    budget = thread_budget.plan_thread_budget(cpus, processes=6, quota=None)
+    assert budget['intra_op_threads'] == 1 and not budget['oversubscribed']
+    
+    assert thread_budget.plan_thread_budget(cpus, processes=2, quota=4.5)['intra_op_threads'] == 2
+    assert thread_budget.plan_thread_budget(cpus, processes=16)['oversubscribed']
+    
+    pinned = [thread_budget.plan_thread_budget(cpus, 4, worker_index=i, pin=True)['pinned_cpus'] for i in range(4)]
+    assert pinned == [[0, 1], [2, 3], [4, 5], [6, 7]]
+
+def test_cgroup_cpu_limit_reads_v2_and_v1(tmp_path):
+    """The quota is read from cpu.max (v2) or the cfs files (v1); unlimited is None"""
+    (tmp_path / 'cpu.max').write_text('250000 100000\n')
+    assert thread_budget.cgroup_cpu_limit(str(tmp_path)) == 2.5
+    (tmp_path / 'cpu.max').write_text('max 100000\n')
+    assert thread_budget.cgroup_cpu_limit(str(tmp_path)) is None
+    
+    v1 = tmp_path / 'v1'
+    (v1 / 'cpu').mkdir(parents=True)
+    (v1 / 'cpu' / 'cpu.cfs_quota_us').write_text('150000')
+    (v1 / 'cpu' / 'cpu.cfs_period_us').write_text('100000')
+    assert thread_budget.cgroup_cpu_limit(str(v1)) == 1.5
+    (v1 / 'cpu' / 'cpu.cfs_quota_us').write_text('-1')
+    assert thread_budget.cgroup_cpu_limit(str(v1)) is None
+
+def test_applied_thread_budget_is_reported(monkeypatch):
+    """The applied budget sizes native thread pools and shows up in the status"""
+    for name in thread_budget.THREAD_ENV_VARS:
+        monkeypatch.setenv(name, '')
+    monkeypatch.setattr(thread_budget, '_budget', None)
+    monkeypatch.setattr(thread_budget, 'allowed_cpus', lambda: [0, 1, 2, 3])
+    monkeypatch.setattr(thread_budget, 'cgroup_cpu_limit', lambda: None)
+    monkeypatch.setattr(thread_budget, 'configure_torch', lambda: None)
+    config = SimpleNamespace(INFERENCE_THREAD_BUDGET=True, INFERENCE_PROCESSES=0,
+                             INFERENCE_INTEROP_THREADS=1, INFERENCE_PIN_CPUS=False)
+    assert thread_budget.get_thread_budget() == {'applied': False}
+    
+    thread_budget.apply_thread_budget(config, processes=2, source='gunicorn')
+    status = thread_budget.get_thread_budget()
+    
+    assert status['applied'] and status['intra_op_threads'] == 2 and status['source'] == 'gunicorn'
+    assert all(os.environ[name] == '2' for name in thread_budget.THREAD_ENV_VARS)
+
+def _daemon(path, handle):
+    """A one-thread stand-in for the inference daemon calling ``handle(conn)`` per connection"""
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen()
+    def serve():
+        while True:
+            conn, _ = server.accept()
+            handle(conn)
+    threading.Thread(target=serve, daemon=True).start()
+    return server
+
+def test_client_tells_a_busy_daemon_from_a_missing_one(tmp_path):
+    """Only a failed connect is "unavailable"; a slow answer is a timeout"""
+    path = str(tmp_path / 'daemon.sock')
+    with pytest.raises(InferenceUnavailable):
+        InferenceClient(path).batch_analyze(['text'])
+    
+    server = _daemon(path, lambda conn: recv_frame(conn))  # Reads, never answers
+    with pytest.raises(InferenceTimeout):
+        InferenceClient(path, timeout=0.2).batch_analyze(['text'])
+    server.close()
+
+def test_client_retries_a_stale_connection(tmp_path):
+    """A connection closed while idle is replaced once, transparently"""
+    path = str(tmp_path / 'daemon.sock')
+    def answer_once(conn):
+        request = recv_frame(conn)
+        send_frame(conn, {'results': request['texts'], 'model_version': 'v1'})
+        conn.close()
+    server = _daemon(path, answer_once)
+    client = InferenceClient(path, timeout=5)
+    
+    assert client.batch_analyze(['a']) == ['a']
+    assert client.batch_analyze(['b']) == ['b']
+    assert client.model_version == 'v1'
+    server.close()
+
+def test_client_keeps_the_daemon_queue_depth_briefly(tmp_path):
+    """The depth the daemon reports feeds admission until it goes stale"""
+    path = str(tmp_path / 'daemon.sock')
+    def answer(conn):
+        request = recv_frame(conn)
+        send_frame(conn, {'results': request['texts'], 'model_version': 'v1', 'queue_depth': 7})
+    server = _daemon(path, answer)
+    client = InferenceClient(path, timeout=5)
+    assert client.recent_queue_depth() == 0
+    
+    client.batch_analyze(['a'])
+    assert client.recent_queue_depth() == 7
+    client._depth_at -= 60
+    assert client.recent_queue_depth() == 0
+    server.close()
+
+def test_daemon_shadows_the_traffic_it_serves(tmp_path, make_config):
+    """The daemon offers its own results to the one shadow scorer and reports it to clients"""
+    path = str(tmp_path / 'daemon.sock')
+    class Model:  # Hashable: the scheduler groups requests by model
+        version = 'v1'
+        backends = SimpleNamespace(resolve=lambda backend: backend)
+    models = SimpleNamespace(active=lambda check=True: Model)
+    scheduler = InferenceScheduler(
+        lambda texts, **options: [{'sentiment': 'positive', 'model_version': 'v1'} for _ in texts],
+        max_wait_ms=0
+    )
+    shadow = ShadowScorer(make_config(), 'builtin', ModelRegistry(str(tmp_path)), report_fn=lambda rows: None)
+    shadow._ensure_worker = lambda: None  # Keep the offered texts queued
+    server = InferenceServer(path, scheduler, models, shadow)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    
+    client = InferenceClient(path, timeout=5)
+    assert len(client.batch_analyze(['a', 'b'])) == 2
+    status = client.status()
+    
+    assert status['model_version'] == 'v1' and status['queue_depth'] == 0
+    assert status['shadow']['candidate_version'] == 'builtin' and status['shadow']['queued'] == 2
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,67 @@
+"""
+Distilled student backend tests
+"""
+import numpy as np
+import pytest
+from models.student_backend import hash_features, export_student_model, StudentModel
+from models.sentiment_model import SentimentAnalyzer
+
+TRAINING_DATA = [
+    ("This is amazing and wonderful!", "positive", "happy"),
+    ("I love this product so much!", "positive", "happy"),
+    ("Excellent quality and great service!", "positive", "satisfied"),
+    ("This is terrible and awful!", "negative", "angry"),
+    ("I hate this, complete waste of money!", "negative", "angry"),
+    ("Poor quality, I am so sad", "negative", "sad"),
+]
+
+def _train_student(path):
+    pytest.importorskip('sklearn')
+    from sklearn.linear_model import SGDClassifier
+
+    X = hash_features([text for text, _, _ in TRAINING_DATA], 2 ** 12)
+    heads = {}
+    for head, column in (('sentiment', 1), ('emotion', 2)):
+        classifier = SGDClassifier(loss='log_loss', random_state=0, max_iter=50, tol=None)
+        classifier.fit(X, [row[column] for row in TRAINING_DATA])
+        heads[head] = (classifier, (classifier.classes_, classifier.coef_, classifier.intercept_))
+    export_student_model(path, 2 ** 12, 2, {head: arrays for head, (_, arrays) in heads.items()})
+    return {head: classifier for head, (classifier, _) in heads.items()}
+
+def test_hash_features_normalized_and_stable():
+    """Rows are L2-normalized; case and punctuation do not change the features"""
+    X = hash_features(['Good, product!', 'good product', ''], 2 ** 10)
+
+    assert X.shape == (3, 2 ** 10)
+    assert np.allclose(np.sqrt(X.multiply(X).sum(axis=1)).A.ravel(), [1, 1, 0])
+    assert (X[0] != X[1]).nnz == 0 and X[0].nnz == 3
+
+def test_student_matches_sklearn(tmp_path):
+    """Served probabilities match the trained one-vs-rest SGD models"""
+    path = str(tmp_path / 'student.npz')
+    classifiers = _train_student(path)
+    model = StudentModel(path)
+    texts = ['I love it, excellent', 'awful waste', 'unseen words', '']
+
+    X = hash_features(texts, 2 ** 12)
+    for head, classifier in classifiers.items():
+        classes, probs = model.predict_proba(texts, head)
+        assert classes == list(classifier.classes_)
+        assert np.allclose(probs, classifier.predict_proba(X), atol=1e-5)
+
+    results = model.predict_heads(texts)
+    assert results['sentiment'] == model.predict(texts)
+    assert [label for label, _ in results['sentiment']] == list(classifiers['sentiment'].predict(X))
+
+def test_analyzer_student_backend(tmp_path):
+    """INFERENCE_BACKEND=student serves both heads from the student"""
+    path = str(tmp_path / 'student.npz')
+    _train_student(path)
+    analyzer = SentimentAnalyzer(backend='student', student_model_path=path)
+
+    results = analyzer.batch_analyze(['I love this, amazing!', '', 'terrible waste of money'])
+    assert analyzer.sentiment_analyzer is analyzer.emotion_classifier
+    assert results[0]['sentiment'] == 'positive' and results[0]['emotion'] == 'happy'
+    assert results[1]['sentiment'] == 'neutral' and results[1]['confidence'] == 0.0
+    assert results[2]['sentiment'] == 'negative' and results[2]['emotion'] == 'angry'
+    assert set(results[0]['all_emotions']) == {'angry', 'happy', 'sad', 'satisfied'}
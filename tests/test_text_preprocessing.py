@@ -0,0 +1,22 @@
+"""
+Text preprocessing tests
+"""
+import pytest
+from utils.text_preprocessing import clean_model_text, clean_lexicon_text, preprocess_batch
+
+def test_clean_model_text():
+    """URLs and punctuation are removed, whitespace collapsed, lowercased"""
+    text = 'Loved it!!  See https://example.com/r?id=1 or www.shop.io\tNOW'
+    assert clean_model_text(text) == 'loved it see or now'
+
+def test_clean_lexicon_text():
+    """Non-alphanumerics become word breaks"""
+    assert clean_lexicon_text("Well-made, DON'T return") == 'well made don t return'
+
+def test_preprocess_batch_keeps_order():
+    """Batch output lines up with the input, duplicates included"""
+    texts = ['Great!', 'bad...', 'Great!']
+    assert preprocess_batch(texts) == ['great', 'bad', 'great']
+    assert preprocess_batch(texts, mode='lexicon') == [clean_lexicon_text(t) for t in texts]
+    with pytest.raises(ValueError):
+        preprocess_batch(texts, mode='html')
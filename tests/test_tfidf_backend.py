@@ -0,0 +1,52 @@
+"""
+TF-IDF serving backend tests
+"""
+import numpy as np
+import pytest
+from models.tfidf_backend import export_tfidf_model, load_npz_mmap, TfidfSentimentModel
+
+TRAINING_DATA = [
+    ("This is amazing and wonderful!", "positive"),
+    ("I love this product so much!", "positive"),
+    ("Excellent quality and great service!", "positive"),
+    ("This is terrible and awful!", "negative"),
+    ("I hate this, complete waste of money!", "negative"),
+    ("Poor quality and bad service!", "negative"),
+    ("It's okay, nothing special.", "neutral"),
+    ("Average product, does the job.", "neutral"),
+    ("Standard quality, as expected.", "neutral"),
+]
+
+def test_exported_model_matches_sklearn(tmp_path):
+    """The NumPy backend reproduces the sklearn pipeline's probabilities"""
+    pytest.importorskip('sklearn')
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+    
+    pipeline = Pipeline([
+        ('tfidf', TfidfVectorizer(max_features=1000, ngram_range=(1, 2))),
+        ('classifier', LogisticRegression(max_iter=1000))
+    ])
+    pipeline.fit([text for text, _ in TRAINING_DATA], [label for _, label in TRAINING_DATA])
+    
+    model = TfidfSentimentModel(export_tfidf_model(pipeline, str(tmp_path / 'model.npz')))
+    texts = ['Great service, I love it', 'awful waste', 'okay I guess', '', 'unseen words']
+    
+    assert isinstance(model.coef_t.base, np.memmap)
+    assert model.classes == list(pipeline.classes_)
+    assert np.allclose(model.predict_proba(texts), pipeline.predict_proba(texts))
+    assert [label for label, _ in model.predict(texts)] == list(pipeline.predict(texts))
+
+def test_mmap_loads_members_past_64k(tmp_path):
+    """Members whose local header sits past 64 KiB are mapped at the right offset"""
+    path = str(tmp_path / 'large.npz')
+    large = np.arange(20000, dtype=np.float64)  # 160 KB, pushes the next member past 64 KiB
+    small = np.array([3, 1, 2], dtype=np.int32)
+    np.savez(path, large=large, small=small)
+    
+    arrays = load_npz_mmap(path)
+    
+    assert isinstance(arrays['small'], np.memmap)
+    assert np.array_equal(arrays['large'], large)
+    assert np.array_equal(arrays['small'], small)
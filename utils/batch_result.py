@@ -0,0 +1,111 @@
+"""
+Columnar results of a batch analysis
+
+Analyzer backends return one BatchResult per batch rather than a dict per
+text: label codes, confidences and the emotion score matrix are NumPy
+arrays with one entry (row) per text. Bulk consumers read the columns
+directly; ``to_dicts`` builds the per-text JSON shape at the API edge.
+"""
+import numpy as np
+
+SENTIMENT_LABELS = ('negative', 'neutral', 'positive')
+
+# Dominant emotion of texts in which no emotion was detected
+NO_EMOTION = -1
+
+
+def encode_labels(labels, vocabulary=SENTIMENT_LABELS):
+    """(codes, vocabulary) for a sequence of labels; unknown labels extend the vocabulary"""
+    vocabulary = list(vocabulary)
+    index = {label: code for code, label in enumerate(vocabulary)}
+    codes = np.empty(len(labels), dtype=np.int16)
+    for i, label in enumerate(labels):
+        if label not in index:
+            index[label] = len(vocabulary)
+            vocabulary.append(label)
+        codes[i] = index[label]
+    return codes, tuple(vocabulary)
+
+
+class BatchResult:
+    """Analysis of a batch of texts, one array entry per text
+
+    sentiment_codes  int16 (n,), index into ``sentiment_labels``
+    confidences      float64 (n,), confidence of the sentiment
+    emotion_codes    int16 (n,), index into ``emotion_names``, or
+                     NO_EMOTION (reported as 'neutral')
+    emotion_scores   float64 (n, len(emotion_labels)), score per emotion
+    scored           bool (n,), False for texts with nothing to analyze;
+                     those report a neutral result without scores
+    processed_texts  cleaned text per text, or None
+
+    ``emotion_names`` are the reported names of the score columns (model
+    labels may be mapped to simpler categories). Only the heads in
+    ``outputs`` were run; the columns of the other heads are left at
+    their defaults. ``decimals`` rounds confidences and scores in
+    ``to_dicts``.
+    """
+
+    def __init__(self, size, outputs, sentiment_labels=SENTIMENT_LABELS, emotion_labels=(),
+                 emotion_names=None, processed_texts=None, decimals=None):
+        self.outputs = tuple(outputs)
+        self.sentiment_labels = tuple(sentiment_labels)
+        self.emotion_labels = tuple(emotion_labels)
+        self.emotion_names = tuple(emotion_names or emotion_labels)
+        self.processed_texts = processed_texts
+        self.decimals = decimals
+
+        self.sentiment_codes = np.full(size, self.sentiment_labels.index('neutral'), dtype=np.int16)
+        self.confidences = np.zeros(size)
+        self.emotion_codes = np.full(size, NO_EMOTION, dtype=np.int16)
+        self.emotion_scores = np.zeros((size, len(self.emotion_labels)))
+        self.scored = np.zeros(size, dtype=bool)
+
+    def __len__(self):
+        return len(self.scored)
+
+    @property
+    def sentiments(self):
+        """Sentiment label per text"""
+        return np.asarray(self.sentiment_labels, dtype=object)[self.sentiment_codes]
+
+    @property
+    def emotions(self):
+        """Dominant emotion name per text"""
+        names = np.asarray(self.emotion_names + ('neutral',), dtype=object)
+        return names[self.emotion_codes]  # NO_EMOTION (-1) picks the trailing 'neutral'
+
+    def _round(self, values):
+        if self.decimals is None:
+            return values
+        return [round(v, self.decimals) for v in values]
+
+    def to_dicts(self, texts=None, compact=False):
+        """One result dict per text, in the shape the API returns
+
+        ``original_text`` is echoed from ``texts`` when given. ``compact``
+        leaves out ``all_emotions`` and the echoed texts.
+        """
+        n = len(self)
+        scored = self.scored.tolist()
+        columns = {}
+        if 'sentiment' in self.outputs:
+            columns['sentiment'] = self.sentiments.tolist()
+        if 'emotion' in self.outputs:
+            columns['emotion'] = self.emotions.tolist()
+        if 'sentiment' in self.outputs:
+            columns['confidence'] = self._round(self.confidences.tolist())
+        if 'emotion' in self.outputs and not compact:
+            labels = self.emotion_labels
+            columns['all_emotions'] = [
+                dict(zip(labels, self._round(row))) if is_scored else {}
+                for row, is_scored in zip(self.emotion_scores.tolist(), scored)
+            ]
+
+        results = [dict(zip(columns, row)) for row in zip(*columns.values())] or [{} for _ in range(n)]
+        if not compact and texts is not None and self.processed_texts is not None:
+            for result, text, processed, is_scored in zip(results, texts, self.processed_texts, scored):
+                if is_scored:
+                    result['original_text'] = text
+                    result['processed_text'] = processed
+        return results
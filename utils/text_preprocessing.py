@@ -0,0 +1,51 @@
+"""
+Shared text preprocessing for the sentiment analyzers
+
+Patterns are compiled once at import. Each cleaner makes a single regex
+pass followed by whitespace collapsing, and results for repeated strings
+(duplicates, retries, cache hits) come from a bounded LRU memo.
+
+Two cleaning modes are supported:
+    'model'   - strips URLs and punctuation, for the transformer models
+                (SentimentAnalyzer)
+    'lexicon' - replaces everything outside [a-z0-9] with spaces, for the
+                keyword analyzers (SimpleSentimentAnalyzer)
+"""
+from functools import lru_cache
+import re
+
+# Distinct strings remembered per cleaning mode
+PREPROCESS_CACHE_SIZE = 8192
+
+# URLs and punctuation removed together; a URL alternative is tried first
+# at each position, so the result matches stripping URLs, then punctuation
+_MODEL_PATTERN = re.compile(r'http\S+|www\S+|[^\w\s]')
+_LEXICON_PATTERN = re.compile(r'[^a-z0-9\s]')
+
+
+@lru_cache(maxsize=PREPROCESS_CACHE_SIZE)
+def clean_model_text(text):
+    """Text for the models: no URLs or punctuation, single-spaced, lowercase"""
+    return ' '.join(_MODEL_PATTERN.sub('', text).split()).lower()
+
+
+@lru_cache(maxsize=PREPROCESS_CACHE_SIZE)
+def clean_lexicon_text(text):
+    """Text for keyword matching: lowercase [a-z0-9] words, single-spaced"""
+    return ' '.join(_LEXICON_PATTERN.sub(' ', text.lower()).split())
+
+
+_CLEANERS = {
+    'model': clean_model_text,
+    'lexicon': clean_lexicon_text,
+}
+
+
+def preprocess_batch(texts, mode='model'):
+    """Clean many texts, in input order; each distinct text is cleaned once"""
+    if mode not in _CLEANERS:
+        raise ValueError(f"Unknown preprocessing mode: {mode}")
+
+    cleaner = _CLEANERS[mode]
+    cleaned = {text: cleaner(text) for text in dict.fromkeys(texts)}
+    return [cleaned[text] for text in texts]
@@ -57,6 +57,22 @@ def validate_text_input(data):
     
     return True, None
 
+def validate_latency_budget(max_latency_ms):
+    """
+    Validate optional max_latency_ms for analysis
+    Returns: (is_valid, error_message)
+    """
+    if max_latency_ms is None:
+        return True, None
+    
+    if isinstance(max_latency_ms, bool) or not isinstance(max_latency_ms, (int, float)):
+        return False, "max_latency_ms must be a number"
+    
+    if max_latency_ms <= 0:
+        return False, "max_latency_ms must be positive"
+    
+    return True, None
+
 def sanitize_input(text):
     """Sanitize user input"""
     # Remove potential XSS